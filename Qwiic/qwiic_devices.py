@@ -0,0 +1,241 @@
+#-------------------------------------------------------------------------------
+# qwiic_devices.py
+#
+# Finds the Qwiic devices attached to a bus and creates their drivers
+#-------------------------------------------------------------------------------
+#
+# More information on Qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#===============================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#===============================================================================
+
+"""
+qwiic_devices
+=============
+Index of the Qwiic devices on a bus, built from the device_name and
+available_addresses class attributes of the device drivers.
+
+discover() scans the bus once, matches each address that answers to a known
+device class and returns a driver object for every device found, all sharing
+one I2C driver. Where the device has an identity register it is read to
+confirm the match (the OTOS product ID); a device that fails the check is
+left out.
+
+The index - address and device name of each device - is saved to INDEX_FILE,
+in the qwiic data directory (see qwiic_i2c.data_dir), per bus. Later calls, after a restart for example, create the drivers from
+the saved index without probing the bus. Pass rescan=True after changing the
+devices attached. A saved index with no devices is ignored and the bus
+scanned again.
+
+The drivers are created, not started - call begin() on each as usual.
+
+:example:
+
+    >>> devices = qwiic_devices.discover()
+    >>> for device in devices:
+    >>>     device.begin()
+    >>> otos = qwiic_devices.find(devices, QwiicOTOS)
+"""
+
+import sys
+
+try:
+    import json
+except ImportError:
+    import ujson as json
+
+import Qwiic.qwiic_i2c as qwiic_i2c
+from Qwiic.qwiic_i2c.data_dir import dataPath, makeParentDir
+from Qwiic.qwiic_otos import QwiicOTOS
+from Qwiic.qwiic_oled_display import QwiicOledDisplay
+from Qwiic.qwiic_led_stick import QwiicLEDStick
+from Qwiic.qwiic_person_sensor import QwiicPersonSensor
+
+# File the device index is saved to - a fixed location, so it is found
+# whatever the working directory
+INDEX_FILE = dataPath("qwiic_devices.json")
+
+def _isOtos(i2c, address):
+    # The product ID register holds a fixed value
+    return i2c.readByte(address, QwiicOTOS.kRegProductId) == QwiicOTOS.kProductId
+
+# Known devices, in the order they are tried - class, addresses looked at, and
+# a function of (i2c driver, address) returning True if the device at the
+# address is that device, or None where there is nothing to check.
+#
+# The LED Stick address can be changed to almost any address, so only its
+# default address is taken to be an LED Stick.
+DEVICE_CLASSES = [
+    (QwiicOTOS, QwiicOTOS.available_addresses, _isOtos),
+    (QwiicPersonSensor, QwiicPersonSensor.available_addresses, None),
+    (QwiicOledDisplay, QwiicOledDisplay.available_addresses, None),
+    (QwiicLEDStick, QwiicLEDStick.available_addresses[:1], None),
+]
+
+def _identify(i2c, address):
+    # Returns the class of the device at address, or None if not known
+    for cls, addresses, verify in DEVICE_CLASSES:
+        if address not in addresses:
+            continue
+        if verify is None:
+            return cls
+        try:
+            if verify(i2c, address):
+                return cls
+        except Exception:
+            pass
+    return None
+
+def scanIndex(i2c):
+    """
+        Scans the bus and identifies the devices that answer
+
+        :param i2c: The I2C driver of the bus
+
+        :return: list of (address, device name), by address
+        :rtype: list
+    """
+    index = []
+    for address in sorted(i2c.scan()):
+        cls = _identify(i2c, address)
+        if cls is not None:
+            index.append((address, cls.device_name))
+    return index
+
+def scan_index(i2c):
+    return scanIndex(i2c)
+
+def _load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def loadIndex(key, path=INDEX_FILE):
+    """
+        Returns the saved device index of a bus
+
+        :param key: The bus name, as returned by the driver's _tuneKey()
+        :param path: Name of the file the index is saved in
+
+        :return: list of (address, device name), or None if the bus has no
+            saved index
+        :rtype: list
+    """
+    entry = _load(path).get(key)
+    if entry is None:
+        return None
+    return sorted((int(address, 16), entry[address]) for address in entry)
+
+def load_index(key, path=INDEX_FILE):
+    return loadIndex(key, path)
+
+def saveIndex(key, index, path=INDEX_FILE):
+    """
+        Saves the device index of a bus
+
+        :param key: The bus name, as returned by the driver's _tuneKey()
+        :param index: list of (address, device name)
+        :param path: Name of the file the index is saved in
+
+        :return: True if saved, False if the file could not be written (a
+            read-only CircuitPython filesystem, for example)
+        :rtype: bool
+    """
+    saved = _load(path)
+    saved[key] = dict(("0x%02X" % address, name) for address, name in index)
+
+    makeParentDir(path)
+    try:
+        with open(path, "w") as f:
+            json.dump(saved, f)
+    except OSError:
+        return False
+
+    return True
+
+def save_index(key, index, path=INDEX_FILE):
+    return saveIndex(key, index, path)
+
+def discover(i2c_driver=None, rescan=False, save=True, path=INDEX_FILE):
+    """
+        Returns a driver object for every known device on a bus
+
+        :param i2c_driver: The I2C driver of the bus. If not provided, the
+            default driver of the platform is used
+        :param rescan: True to scan the bus even when an index is saved
+        :param save: True to save the index after a scan
+        :param path: Name of the file the index is saved in
+
+        :return: The device driver objects, by address. Devices saved in the
+            index under a name no longer known are left out.
+        :rtype: list
+    """
+    i2c = i2c_driver
+    if i2c is None:
+        i2c = qwiic_i2c.getSharedI2CDriver()
+        if i2c is None:
+            print("Unable to load I2C driver for this platform.")
+            return []
+
+    key = i2c._tuneKey()
+
+    # An empty index is not trusted - the bus may not have been ready
+    index = None if rescan else loadIndex(key, path)
+    if not index:
+        index = scanIndex(i2c)
+        if save:
+            saveIndex(key, index, path)
+
+    classes = dict((cls.device_name, cls) for cls, addresses, verify in DEVICE_CLASSES)
+
+    devices = []
+    for address, name in index:
+        cls = classes.get(name)
+        if cls is not None:
+            devices.append(cls(address=address, i2c_driver=i2c))
+    return devices
+
+def find(devices, cls):
+    """
+        Returns the first device of a class in a list from discover()
+
+        :param devices: The device driver objects
+        :param cls: The device class, QwiicOTOS for example
+
+        :return: The device, or None if there is none of that class
+    """
+    for device in devices:
+        if isinstance(device, cls):
+            return device
+    return None
+
+if __name__ == '__main__':
+
+    # python -m Qwiic.qwiic_devices [--rescan]
+    devices = discover(rescan="--rescan" in sys.argv[1:])
+    if not devices:
+        print("No known Qwiic devices found")
+    for device in devices:
+        print("0x%02X  %s" % (device.address, device.device_name))
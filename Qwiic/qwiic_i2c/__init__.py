@@ -65,26 +65,176 @@ New to qwiic? Take a look at the entire [SparkFun qwiic ecosystem](https://www.s
 # Drivers and driver baseclass
 from .i2c_driver import I2CDriver
 
-# All supported platform module and class names
+import sys
+
+# The platform driver module and class names for each platform, in order of
+# preference. On Linux the smbus2 driver is used when smbus2 is installed,
+# otherwise the /dev/i2c ioctl driver.
 _supported_platforms = {
-	"linux_i2c": "LinuxI2C",
-	"circuitpy_i2c": "CircuitPythonI2C",
-	"micropython_i2c": "MicroPythonI2C"
+	"linux": (("linux_i2c", "LinuxI2C"), ("dev_i2c", "LinuxDevI2C")),
+	"circuitpython": (("circuitpy_i2c", "CircuitPythonI2C"),),
+	"micropython": (("micropython_i2c", "MicroPythonI2C"),),
+	"simulated": (("sim_i2c", "SimulatedI2C"),),
+	"broker": (("broker_i2c", "BrokerI2C"),),
 }
 
-# List of platform drivers found on this system
-_drivers = []
+# Environment variable that selects the simulated bus (see sim_i2c)
+_SIM_ENV_VAR = "QWIIC_I2C_SIMULATED"
+
+# Environment variable that selects a bus broker process (see broker_i2c)
+_BROKER_ENV_VAR = "QWIIC_I2C_BROKER"
+
+# The detected (or overridden) platform name - detected on first use
+_platform = None
+
+# Platform name -> list of driver classes, imported on first use
+_drivers = {}
 
-# Loop through all supported platform drivers, see if they're included, and
-# append them to the driver list if so
-for module_name, class_name in _supported_platforms.items():
+#-------------------------------------------------
+# Platform detection. Only the platform's own driver modules are imported,
+# and only when a driver is first requested.
+def _detectPlatform():
 	try:
-		sub_module = __import__("Qwiic.qwiic_i2c." + module_name, None, None, [None])
-		_drivers.append(getattr(sub_module, class_name))
+		import os
+		if os.environ.get(_SIM_ENV_VAR, "") not in ("", "0"):
+			return "simulated"
+		if os.environ.get(_BROKER_ENV_VAR, "") not in ("", "0"):
+			return "broker"
 	except:
 		pass
 
-_default_driver = None
+	name = sys.implementation.name
+	if name in ("circuitpython", "micropython"):
+		return name
+
+	if sys.platform in ("linux", "linux2"):
+		return "linux"
+
+	return None
+
+def getPlatform():
+	"""
+	.. function:: getPlatform()
+
+		Returns the name of the platform the I2C drivers are selected for -
+		"linux", "circuitpython", "micropython", "simulated" or "broker". The
+		platform is detected on the first call and the result cached.
+
+		:return: The platform name, or None for an unsupported platform
+		:rtype: str
+	"""
+	global _platform
+	if _platform is None:
+		_platform = _detectPlatform()
+	return _platform
+
+def get_platform():
+	return getPlatform()
+
+def setPlatform(name):
+	"""
+	.. function:: setPlatform()
+
+		Overrides the detected platform - mostly for tests.
+
+		:param name: One of the platform names returned by getPlatform(), or
+			None to detect the platform again on the next call
+	"""
+	global _platform
+	if name is not None and name not in _supported_platforms:
+		raise ValueError("Unsupported I2C platform: %s" % name)
+	_platform = name
+
+def set_platform(name):
+	return setPlatform(name)
+
+def _platformDrivers():
+	# The simulated driver can also be selected by SimulatedI2C.enable(),
+	# which requires its module to already be imported
+	sim = sys.modules.get("Qwiic.qwiic_i2c.sim_i2c")
+	if sim is not None and sim.SimulatedI2C._enabled:
+		return [sim.SimulatedI2C]
+
+	platform = getPlatform()
+
+	drivers = _drivers.get(platform)
+	if drivers is None:
+		drivers = []
+		for module_name, class_name in _supported_platforms.get(platform, ()):
+			try:
+				sub_module = __import__("Qwiic.qwiic_i2c." + module_name, None, None, [None])
+			except ImportError:
+				continue
+			driverClass = getattr(sub_module, class_name)
+			drivers.append(driverClass)
+
+			# No need to import the less preferred drivers
+			if driverClass.isPlatform():
+				break
+		_drivers[platform] = drivers
+
+	return drivers
+
+# Pool of the drivers handed out by getI2CDriver() and getSharedI2CDriver() -
+# one driver per bus, so every device on a bus shares its connection and lock.
+#
+#	(driver class, bus key) -> [driver, reference count, shared]
+#
+# A shared driver is in use by callers that hold no reference, and stays open
+# until closeI2CDrivers().
+_driver_pool = {}
+
+# Guards the pool when drivers are requested from several threads
+try:
+	import _thread
+	_pool_lock = _thread.allocate_lock()
+except ImportError:
+	_pool_lock = None
+
+#-------------------------------------------------
+# Looks up (or creates) the pooled driver of a bus. A shared lookup marks the
+# driver shared, otherwise a reference is taken.
+def _poolDriver(shared, args, argk):
+
+	# Loop through the drivers of this platform to find one that can run. The
+	# last driver of a platform is its fallback and is not asked.
+	drivers = _platformDrivers()
+	for driverClass in drivers:
+		if driverClass is drivers[-1] or driverClass.isPlatform():
+			# Found it!
+			try:
+				key = (driverClass, driverClass._busKey(*args, **argk))
+				hash(key)
+			except TypeError:
+				# Arguments that cannot be keyed get a driver of their own
+				return driverClass(*args, **argk)
+
+			if _pool_lock is not None:
+				_pool_lock.acquire()
+			try:
+				entry = _driver_pool.get(key)
+				if entry is None:
+					entry = [driverClass(*args, **argk), 0, False]
+					_driver_pool[key] = entry
+				else:
+					# The clock is not part of the bus key - a clock asked
+					# for explicitly is applied to the pooled driver
+					freq = driverClass._busFrequency(*args, **argk)
+					if freq is not None and freq != entry[0].getFrequency():
+						entry[0].setFrequency(freq)
+				if shared:
+					entry[2] = True
+				else:
+					entry[1] += 1
+
+				# And return it
+				return entry[0]
+			finally:
+				if _pool_lock is not None:
+					_pool_lock.release()
+	
+	# If we get here, we didn't find a driver for this platform
+	return None
 
 #-------------------------------------------------
 # Exported method to get the I2C driver for the execution plaform. 
@@ -96,6 +246,10 @@ def getI2CDriver(*args, **argk):
 
 		Returns the qwiic I2C driver object for current platform.
 
+		Drivers are pooled by bus - calls selecting the same bus (after the
+		platform defaults are filled in) return the same driver object. Each
+		call takes a reference, returned with releaseI2CDriver().
+
 		:return: A qwiic I2C driver object for the current platform.
 		:rtype: object
 
@@ -105,27 +259,7 @@ def getI2CDriver(*args, **argk):
 		>>> i2cDriver = qwiic_i2c.getI2CDriver()
 		>>> myData = i2cDriver.readByte(0x73, 0x34)
 	"""
-
-	# If no parameters are provided, return the default driver if we have it
-	global _default_driver
-	if len(argk) == 0 and _default_driver != None:
-		return _default_driver
-	
-	# Loop through all the drivers to find the one for this platform
-	for driverClass in _drivers:
-		if driverClass.isPlatform():
-			# Found it!
-			driver = driverClass(*args, **argk)
-
-			# If no parameters are provided, set this as the default driver
-			if len(argk) == 0:
-				_default_driver = driver
-			
-			# And return it
-			return driver
-	
-	# If we get here, we didn't find a driver for this platform
-	return None
+	return _poolDriver(False, args, argk)
 
 def get_i2c_driver(*args, **argk):
 	"""
@@ -144,6 +278,90 @@ def get_i2c_driver(*args, **argk):
 	"""
 	return getI2CDriver(*args, **argk)
 
+def getSharedI2CDriver(*args, **argk):
+	"""
+	.. function:: getSharedI2CDriver()
+
+		Returns the pooled qwiic I2C driver object of a bus without taking a
+		reference - the device drivers use this when no I2C driver is given
+		to them. The driver stays open until closeI2CDrivers(), whatever
+		references are released.
+
+		:return: A qwiic I2C driver object for the current platform.
+		:rtype: object
+	"""
+	return _poolDriver(True, args, argk)
+
+def get_shared_i2c_driver(*args, **argk):
+	return getSharedI2CDriver(*args, **argk)
+
+#-------------------------------------------------
+# Exported methods to return pooled drivers
+def _closeDriver(driver):
+	# The worker thread of the driver's async wrapper is stopped with it
+	aio = getattr(driver, "_asyncDriver", None)
+	if aio is not None:
+		aio.close()
+	driver.close()
+
+def releaseI2CDriver(driver):
+	"""
+	.. function:: releaseI2CDriver()
+
+		Returns a reference to a driver obtained from getI2CDriver(). When the
+		last reference is returned, the driver is closed and removed from the
+		pool - unless it is also in use through getSharedI2CDriver().
+
+		:param driver: The I2C driver to release
+
+		:return: True if the driver was closed, otherwise False.
+		:rtype: bool
+	"""
+	if _pool_lock is not None:
+		_pool_lock.acquire()
+	try:
+		for key, entry in _driver_pool.items():
+			if entry[0] is driver:
+				if entry[1] > 0:
+					entry[1] -= 1
+				if entry[1] > 0 or entry[2]:
+					return False
+				del _driver_pool[key]
+				break
+		else:
+			return False
+	finally:
+		if _pool_lock is not None:
+			_pool_lock.release()
+
+	_closeDriver(driver)
+	return True
+
+def release_i2c_driver(driver):
+	return releaseI2CDriver(driver)
+
+def closeI2CDrivers():
+	"""
+	.. function:: closeI2CDrivers()
+
+		Closes every pooled driver, and stops the worker thread of its async
+		wrapper, regardless of outstanding references.
+	"""
+	if _pool_lock is not None:
+		_pool_lock.acquire()
+	try:
+		drivers = [entry[0] for entry in _driver_pool.values()]
+		_driver_pool.clear()
+	finally:
+		if _pool_lock is not None:
+			_pool_lock.release()
+
+	for driver in drivers:
+		_closeDriver(driver)
+
+def close_i2c_drivers():
+	return closeI2CDrivers()
+
 #-------------------------------------------------
 # Method to determine if a particular device (at the provided address)
 # is connected to the bus.
@@ -160,7 +378,8 @@ def isDeviceConnected(devAddress, *args, **argk):
 		:rtype: bool
 
 	"""
-	i2c = getI2CDriver(*args, **argk)
+	# The pooled driver is reused, so polling does not reopen the bus
+	i2c = getSharedI2CDriver(*args, **argk)
 
 	if not i2c:
 		print("Unable to load the I2C driver for this device")
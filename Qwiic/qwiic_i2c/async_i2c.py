@@ -0,0 +1,235 @@
+#-----------------------------------------------------------------------------
+# async_i2c.py
+#
+# asyncio facade over the platform I2C drivers
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+async_i2c
+=========
+Coroutine versions of the I2C driver calls, so one event loop can serve every
+peripheral without a long transfer blocking the other tasks.
+
+On CPython each wrapped driver gets a dedicated worker thread and the calls run
+there. On MicroPython and CircuitPython (no threads) the call runs inline and
+the coroutine yields to the event loop after each transfer.
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.async_i2c import getAsyncI2CDriver
+	>>> aio = getAsyncI2CDriver()
+	>>> data = await aio.read_block(0x17, 0x20, 18)
+"""
+
+try:
+	import asyncio
+except ImportError:
+	import uasyncio as asyncio
+
+# A worker thread is only available on CPython
+try:
+	from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+	ThreadPoolExecutor = None
+
+class AsyncI2CDriver(object):
+	"""
+	AsyncI2CDriver
+
+		Wraps an I2C driver object and exposes its operations as coroutines.
+
+		:param driver: The I2C driver to wrap. If not provided, the default
+			driver for this platform is used.
+	"""
+
+	def __init__(self, driver=None):
+
+		if driver is None:
+			from . import getSharedI2CDriver
+			driver = getSharedI2CDriver()
+
+		self._driver = driver
+
+		# A single worker serialises the transfers of this driver
+		self._executor = None
+		if ThreadPoolExecutor is not None:
+			self._executor = ThreadPoolExecutor(max_workers=1)
+
+	@property
+	def driver(self):
+		""" The wrapped (synchronous) I2C driver """
+		return self._driver
+
+	def close(self):
+		"""
+			Stops the worker thread, if there is one. The wrapped driver is
+			left open, and a later getAsyncI2CDriver() for it creates a new
+			wrapper.
+		"""
+		if self._executor is not None:
+			self._executor.shutdown(wait=True)
+			self._executor = None
+
+		if getattr(self._driver, "_asyncDriver", None) is self:
+			self._driver._asyncDriver = None
+
+	#-------------------------------------------------------------------------
+	# Run any blocking driver call without blocking the event loop
+	#
+	async def run(self, func, *args):
+		"""
+			Runs a blocking call - on the worker thread if there is one,
+			otherwise inline followed by a yield to the event loop.
+
+			:param func: The callable to run
+			:param args: Arguments passed to the callable
+
+			:return: The return value of func
+		"""
+		if self._executor is not None:
+			loop = asyncio.get_running_loop()
+			return await loop.run_in_executor(self._executor, func, *args)
+
+		result = func(*args)
+		await asyncio.sleep(0)
+		return result
+
+	# read commands ----------------------------------------------------------
+	async def readWord(self, address, commandCode):
+		return await self.run(self._driver.readWord, address, commandCode)
+
+	async def read_word(self, address, commandCode):
+		return await self.readWord(address, commandCode)
+
+	async def readByte(self, address, commandCode = None):
+		return await self.run(self._driver.readByte, address, commandCode)
+
+	async def read_byte(self, address, commandCode = None):
+		return await self.readByte(address, commandCode)
+
+	async def readBlock(self, address, commandCode, nBytes):
+		return await self.run(self._driver.readBlock, address, commandCode, nBytes)
+
+	async def read_block(self, address, commandCode, nBytes):
+		return await self.readBlock(address, commandCode, nBytes)
+
+	async def readBlockInto(self, address, commandCode, buf):
+		return await self.run(self._driver.readBlockInto, address, commandCode, buf)
+
+	async def read_block_into(self, address, commandCode, buf):
+		return await self.readBlockInto(address, commandCode, buf)
+
+	async def readStruct(self, address, commandCode, fmt):
+		return await self.run(self._driver.readStruct, address, commandCode, fmt)
+
+	async def read_struct(self, address, commandCode, fmt):
+		return await self.readStruct(address, commandCode, fmt)
+
+	async def readArray(self, address, commandCode, typecode, count):
+		return await self.run(self._driver.readArray, address, commandCode, typecode, count)
+
+	async def read_array(self, address, commandCode, typecode, count):
+		return await self.readArray(address, commandCode, typecode, count)
+
+	# write commands----------------------------------------------------------
+	async def writeCommand(self, address, commandCode):
+		return await self.run(self._driver.writeCommand, address, commandCode)
+
+	async def write_command(self, address, commandCode):
+		return await self.writeCommand(address, commandCode)
+
+	async def writeWord(self, address, commandCode, value):
+		return await self.run(self._driver.writeWord, address, commandCode, value)
+
+	async def write_word(self, address, commandCode, value):
+		return await self.writeWord(address, commandCode, value)
+
+	async def writeByte(self, address, commandCode, value):
+		return await self.run(self._driver.writeByte, address, commandCode, value)
+
+	async def write_byte(self, address, commandCode, value):
+		return await self.writeByte(address, commandCode, value)
+
+	async def writeBlock(self, address, commandCode, value):
+		return await self.run(self._driver.writeBlock, address, commandCode, value)
+
+	async def write_block(self, address, commandCode, value):
+		return await self.writeBlock(address, commandCode, value)
+
+	async def submit(self, batch):
+		"""
+			Submits a batch created with driver.batch()
+
+			:return: The data of each read operation, in the order queued
+			:rtype: list
+		"""
+		return await self.run(batch.submit)
+
+	async def isDeviceConnected(self, devAddress):
+		return await self.run(self._driver.isDeviceConnected, devAddress)
+
+	async def is_device_connected(self, devAddress):
+		return await self.isDeviceConnected(devAddress)
+
+	async def ping(self, devAddress):
+		return await self.isDeviceConnected(devAddress)
+
+	async def scan(self):
+		return await self.run(self._driver.scan)
+
+#-------------------------------------------------
+# Exported method to get the shared async wrapper for a driver object.
+#
+# Device drivers use this so all async calls on one bus share one worker.
+def getAsyncI2CDriver(driver=None):
+	"""
+	.. function:: getAsyncI2CDriver()
+
+		Returns the async wrapper for a driver object, creating it on first use.
+
+		:param driver: The I2C driver to wrap. If not provided, the default
+			driver for this platform is used.
+
+		:return: The async wrapper for the driver
+		:rtype: AsyncI2CDriver
+	"""
+	if driver is None:
+		from . import getSharedI2CDriver
+		driver = getSharedI2CDriver()
+
+	# The wrapper is kept on the driver, so it lives exactly as long
+	aio = getattr(driver, "_asyncDriver", None)
+	if aio is None:
+		aio = AsyncI2CDriver(driver)
+		driver._asyncDriver = aio
+
+	return aio
+
+def get_async_i2c_driver(driver=None):
+	return getAsyncI2CDriver(driver)
@@ -0,0 +1,281 @@
+#-----------------------------------------------------------------------------
+# bench.py
+#
+# Bus throughput characterization - block size sweep
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+bench
+=====
+Measures the throughput of the I2C bus with a real or simulated device: bytes
+per second and time per transaction, for reads and writes, over a sweep of
+block sizes, with each transfer sent on its own (separate) and with the
+transfers queued in one batch (combined - one bus transaction where the
+platform supports it). At the end it prints the block size to use for reads
+and writes on this backend: the smallest block that reaches 95% of the best
+throughput measured.
+
+Reads are taken from register 0 of the first known device found (OTOS,
+Person Sensor or OLED). Writes change the register written, so they are only
+measured when --write-register is given - 0x40 on an OLED, for example,
+which overwrites what is on the display. Without --address they go to the
+OLED.
+
+On the simulated bus the simulated wire time of every transaction is added to
+the measured host time.
+
+:example:
+
+	python -m Qwiic.qwiic_i2c.bench
+	python -m Qwiic.qwiic_i2c.bench --sim
+	python -m Qwiic.qwiic_i2c.bench --address 0x3C --read-register 0x00 --write-register 0x40
+	python -m Qwiic.qwiic_i2c.bench --max 64 --count 50
+"""
+
+import sys
+
+from .transaction_stats import _ticksUs, _elapsedUs
+
+# Block sizes tried, up to the driver's transfer limits
+BLOCK_SIZES = (1, 2, 4, 8, 16, 24, 32, 48, 64, 128, 255)
+
+# Transfers per measurement
+COUNT = 20
+
+# The recommended block is the smallest reaching this fraction of the best
+# throughput - bigger blocks add little and hold the bus longer
+GOOD_ENOUGH = 0.95
+
+# Combined transfers are only recommended when faster than separate ones by
+# more than this factor
+COMBINED_GAIN = 1.05
+
+# Devices read from, in order of preference - address -> register
+READ_TARGETS = (
+	(0x17, 0x00),		# OTOS - product ID and the registers after it
+	(0x62, 0x00),		# Person Sensor - result
+	(0x3C, 0x00),		# OLED - status
+	(0x3D, 0x00),
+)
+
+# Devices written to when --write-register is given without --address. No
+# register of a device can be written without changing it - on the OLED
+# register 0x40, the display data, only changes what is on the display.
+WRITE_ADDRESSES = (0x3C, 0x3D)
+
+def _findTarget(driver, targets):
+	for address, register in targets:
+		if driver.isDeviceConnected(address):
+			return address, register
+	return None, None
+
+def _simTime(driver):
+	# Simulated wire time so far in seconds, or None on real hardware. A
+	# realtime simulation already sleeps for it.
+	bus = getattr(driver, "i2cbus", None)
+	if bus is None or getattr(bus, "realtime", True):
+		return None
+	return getattr(bus, "busTime", None)
+
+def measure(driver, isWrite, combined, address, register, size, count=COUNT):
+	"""
+		Times count transfers of one block size
+
+		:param driver: The I2C driver
+		:param isWrite: True to measure writes, False for reads
+		:param combined: True to queue the transfers in one batch
+		:param address: The I2C address of the device
+		:param register: The register read or written
+		:param size: Bytes per transfer
+		:param count: Number of transfers
+
+		:return: Bytes per second, and microseconds per transfer
+		:rtype: tuple
+	"""
+	data = bytes(size)
+
+	simStart = _simTime(driver)
+	start = _ticksUs()
+
+	if combined:
+		batch = driver.batch()
+		for i in range(count):
+			if isWrite:
+				batch.writeBlock(address, register, data)
+			else:
+				batch.readBlock(address, register, size)
+		batch.submit()
+	elif isWrite:
+		for i in range(count):
+			driver.writeBlock(address, register, data)
+	else:
+		buf = bytearray(size)
+		for i in range(count):
+			driver.readBlockInto(address, register, buf)
+
+	elapsedUs = _elapsedUs(start)
+	if simStart is not None:
+		elapsedUs += int((_simTime(driver) - simStart) * 1000000)
+
+	elapsedUs = max(elapsedUs, 1)
+	return size * count * 1000000.0 / elapsedUs, elapsedUs / float(count)
+
+def sweep(driver, isWrite, address, register, sizes=BLOCK_SIZES, count=COUNT):
+	"""
+		Measures separate and combined transfers over a set of block sizes.
+		Sizes above the driver's transfer limit are skipped.
+
+		:return: list of (size, mode, bytes per second, us per transfer),
+			mode being "separate" or "combined"
+		:rtype: list
+	"""
+	limit = driver.maxWriteBlock if isWrite else driver.maxReadBlock
+
+	results = []
+	for size in sizes:
+		if size > limit:
+			break
+		for combined in (False, True):
+			rate, latency = measure(driver, isWrite, combined, address, register, size, count)
+			results.append((size, "combined" if combined else "separate", rate, latency))
+	return results
+
+def recommend(results):
+	"""
+		Returns the smallest block size reaching GOOD_ENOUGH of the best
+		throughput in the results of sweep(), and whether combined transfers
+		were clearly faster at that size
+
+		:rtype: tuple
+	"""
+	if not results:
+		return None, False
+
+	best = max(result[2] for result in results)
+	for size, mode, rate, latency in results:
+		if rate >= best * GOOD_ENOUGH:
+			combined = [r[2] for r in results if r[0] == size and r[1] == "combined"]
+			separate = [r[2] for r in results if r[0] == size and r[1] == "separate"]
+			return size, bool(combined and separate and combined[0] > separate[0] * COMBINED_GAIN)
+
+	return None, False
+
+def report(title, results):
+	print("")
+	print(title)
+	print("%6s %-9s %12s %12s" % ("bytes", "mode", "bytes/s", "us/transfer"))
+	for size, mode, rate, latency in results:
+		print("%6d %-9s %12.0f %12.1f" % (size, mode, rate, latency))
+
+def _number(text):
+	return int(text, 0)
+
+def main(args):
+	options = {
+		"--address": None,
+		"--read-register": None,
+		"--write-register": None,
+		"--count": str(COUNT),
+		"--max": None,
+	}
+	simulated = False
+
+	i = 0
+	while i < len(args):
+		if args[i] == "--sim":
+			simulated = True
+		elif args[i] in options and i + 1 < len(args):
+			options[args[i]] = args[i + 1]
+			i += 1
+		else:
+			print("Unknown option: %s" % args[i])
+			print(__doc__)
+			return 1
+		i += 1
+
+	if simulated:
+		from .sim_i2c import SimulatedI2C
+		driver = SimulatedI2C()
+	else:
+		from . import getI2CDriver
+		driver = getI2CDriver()
+		if driver is None:
+			print("Unable to load the I2C driver for this platform")
+			return 1
+
+	count = _number(options["--count"])
+	sizes = BLOCK_SIZES
+	if options["--max"] is not None:
+		top = _number(options["--max"])
+		sizes = [size for size in BLOCK_SIZES if size < top] + [top]
+
+	# Targets - an explicit address is used for both reads and writes. Writes
+	# change the device, so they need an explicit register.
+	writeTarget = (None, None)
+	if options["--address"] is not None:
+		address = _number(options["--address"])
+		readTarget = (address, _number(options["--read-register"] or "0"))
+		if options["--write-register"] is not None:
+			writeTarget = (address, _number(options["--write-register"]))
+	else:
+		readTarget = _findTarget(driver, READ_TARGETS)
+		if options["--read-register"] is not None and readTarget[0] is not None:
+			readTarget = (readTarget[0], _number(options["--read-register"]))
+		if options["--write-register"] is not None:
+			register = _number(options["--write-register"])
+			writeTarget = _findTarget(driver, [(address, register) for address in WRITE_ADDRESSES])
+
+	print("Backend: %s, max write %d, max read %d, combined %s" % (driver.name,
+		driver.maxWriteBlock, driver.maxReadBlock, driver.supportsCombined))
+
+	recommended = []
+	for isWrite, (address, register) in ((False, readTarget), (True, writeTarget)):
+		kind = "write" if isWrite else "read"
+		if address is None:
+			print("")
+			if isWrite and options["--write-register"] is None:
+				print("No --write-register given - skipping writes")
+			else:
+				print("No %s target found - skipping %ss" % (kind, kind))
+			continue
+
+		results = sweep(driver, isWrite, address, register, sizes, count)
+		report("%ss of 0x%02X register 0x%02X" % (kind.capitalize(), address, register), results)
+		size, combined = recommend(results)
+		recommended.append((kind, size, combined))
+
+	print("")
+	for kind, size, combined in recommended:
+		print("Recommended %s block size on %s: %s bytes%s" % (kind, driver.name, size,
+			", batched" if combined else ""))
+
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
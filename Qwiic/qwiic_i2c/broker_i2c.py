@@ -0,0 +1,671 @@
+#-----------------------------------------------------------------------------
+# broker_i2c.py
+#
+# I2C bus broker - one process owns the bus, others use it over a Unix socket
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+broker_i2c
+==========
+Lets several processes on a Linux host share an I2C bus safely. A broker
+process owns the bus and serves framed transaction requests over a Unix
+domain socket; the other processes use BrokerI2C, an I2C driver that sends
+each operation to the broker.
+
+The broker works in rounds. Every request that has arrived from any client
+when a round starts is run in that round, in arrival order: the reads and
+writes of a run go to the bus as one batch per device (a single i2c_rdwr
+transaction on Linux), and identical reads in the same run - same device, register and length, with
+no write to the device in between - are answered from one transfer. A client
+whose reads must each reach the device (a FIFO or a read that clears a status
+register) sets mergeReads to False on its BrokerI2C.
+
+If a batch fails, its reads are run again one by one, so each client gets its
+own result. Its writes are not repeated - whether they reached the device is
+not known, so each is answered with the error of the batch. Batches of other
+devices in the round are not affected.
+
+Start the broker, then set QWIIC_I2C_BROKER in the environment of the other
+processes - getI2CDriver() then returns a BrokerI2C. The variable holds the
+socket path, or 1 for the default path of the bus.
+
+:example:
+
+	python -m Qwiic.qwiic_i2c.broker_i2c --bus 1 &
+	QWIIC_I2C_BROKER=1 python my_robot.py
+"""
+
+from .i2c_driver import I2CDriver
+from .trace_i2c import (_OP_READ_BYTE, _OP_READ_WORD, _OP_READ_BLOCK, _OP_WRITE_COMMAND,
+						_OP_WRITE_WORD, _OP_WRITE_BYTE, _OP_WRITE_BLOCK, _OP_PROBE)
+
+import os
+import sys
+import errno
+import socket
+import struct
+
+try:
+	import _thread
+except ImportError:
+	_thread = None
+
+_PLATFORM_NAME = "Broker"
+
+# Environment variable naming the broker socket (or 1 for the default)
+_BROKER_ENV_VAR = "QWIIC_I2C_BROKER"
+
+# Default socket path of a bus
+DEFAULT_SOCKET = "/tmp/qwiic-i2c-%d.sock"
+
+#-----------------------------------------------------------------------------
+# Wire format
+#
+# A request is a _REQUEST header - request id, operation, flags, address,
+# register, length - followed by length data bytes for a write. For a read the
+# length is the number of bytes to read.
+#
+# A response is a _RESPONSE header - request id, status (0, or the errno of
+# the failure), length - followed by length data bytes: the data read, a
+# single 0/1 byte for a probe, the addresses found for a scan.
+#
+_REQUEST = "<IBBBBH"
+_REQUEST_SIZE = struct.calcsize(_REQUEST)
+
+_RESPONSE = "<IBH"
+_RESPONSE_SIZE = struct.calcsize(_RESPONSE)
+
+# Operations beyond the ones shared with the trace format
+_OP_SCAN = 8
+_OP_HELLO = 9
+
+# Flags
+_FLAG_NO_REGISTER = 0x01
+_FLAG_NO_MERGE = 0x02
+
+# Answer to _OP_HELLO - the bus capabilities
+_HELLO = "<HHBB"
+
+_READ_OPS = (_OP_READ_BYTE, _OP_READ_WORD, _OP_READ_BLOCK)
+_WRITE_OPS = (_OP_WRITE_BYTE, _OP_WRITE_WORD, _OP_WRITE_BLOCK)
+
+def _socketPath(value=None, iBus=1):
+	# Socket path from the environment variable value
+	if value in (None, "", "1"):
+		return DEFAULT_SOCKET % iBus
+	return value
+
+#-----------------------------------------------------------------------------
+# I2CBroker
+#
+class I2CBroker(object):
+	"""
+	I2CBroker
+
+		Owns an I2C driver and serves the requests of BrokerI2C clients.
+
+		:param driver: The I2C driver of the bus
+		:param path: Path of the Unix socket to listen on
+	"""
+
+	def __init__(self, driver, path=DEFAULT_SOCKET % 1):
+		import selectors
+
+		self._driver = driver
+		self.path = path
+
+		if os.path.exists(path):
+			os.unlink(path)
+
+		self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self._listener.bind(path)
+		self._listener.listen(16)
+
+		self._events = selectors.EVENT_READ
+		self._selector = selectors.DefaultSelector()
+		self._selector.register(self._listener, self._events)
+
+		# connection -> bytes received and not yet parsed
+		self._buffers = {}
+
+		# Requests served, reads answered from another request's transfer,
+		# and batches sent to the bus
+		self.requests = 0
+		self.merged = 0
+		self.batches = 0
+
+	@property
+	def driver(self):
+		""" The I2C driver of the bus """
+		return self._driver
+
+	def close(self):
+		""" Closes every connection and removes the socket """
+		for conn in list(self._buffers):
+			self._drop(conn)
+		self._selector.close()
+		self._listener.close()
+		try:
+			os.unlink(self.path)
+		except OSError:
+			pass
+
+	def serveForever(self):
+		""" Serves requests until interrupted """
+		while True:
+			self.serveOnce()
+
+	def serve_forever(self):
+		return self.serveForever()
+
+	def serveOnce(self, timeout=None):
+		"""
+			Runs one round - waits for requests, runs every request that has
+			arrived and sends the responses
+
+			:param timeout: Longest wait for a request, in seconds (None waits
+				for ever)
+
+			:return: Number of requests served
+			:rtype: int
+		"""
+		pending = []
+		for key, events in self._selector.select(timeout):
+			if key.fileobj is self._listener:
+				conn, addr = self._listener.accept()
+				self._buffers[conn] = b""
+				self._selector.register(conn, self._events)
+			else:
+				self._receive(key.fileobj, pending)
+
+		if not pending:
+			return 0
+
+		results = self._execute([request[1:] for request in pending])
+
+		for (conn, requestId, op, flags, address, register, length, data), (status, payload) in zip(pending, results):
+			if conn not in self._buffers:
+				continue
+			try:
+				conn.sendall(struct.pack(_RESPONSE, requestId, status, len(payload)) + payload)
+			except OSError:
+				self._drop(conn)
+
+		self.requests += len(pending)
+		return len(pending)
+
+	def serve_once(self, timeout=None):
+		return self.serveOnce(timeout)
+
+	def _drop(self, conn):
+		self._buffers.pop(conn, None)
+		try:
+			self._selector.unregister(conn)
+		except (KeyError, ValueError):
+			pass
+		conn.close()
+
+	def _receive(self, conn, pending):
+		# Reads what the client sent and adds its complete requests to pending
+		try:
+			chunk = conn.recv(65536)
+		except OSError:
+			chunk = b""
+		if not chunk:
+			self._drop(conn)
+			return
+
+		buf = self._buffers[conn] + chunk
+		offset = 0
+		while len(buf) - offset >= _REQUEST_SIZE:
+			requestId, op, flags, address, register, length = struct.unpack_from(_REQUEST, buf, offset)
+			size = _REQUEST_SIZE + (length if op in _WRITE_OPS else 0)
+			if len(buf) - offset < size:
+				break
+			data = buf[offset + _REQUEST_SIZE:offset + size]
+			pending.append((conn, requestId, op, flags, address, register, length, data))
+			offset += size
+
+		self._buffers[conn] = buf[offset:]
+
+	#-------------------------------------------------------------------------
+	# Running the requests of a round
+
+	def _execute(self, requests):
+		# Returns (status, payload) for each (requestId, op, flags, address,
+		# register, length, data) request
+		results = [None] * len(requests)
+
+		# Indices of the run of batchable requests, and of the first of each
+		# set of identical reads in it
+		run = []
+		inflight = {}
+
+		# Index of a merged read -> index of the read whose transfer it shares
+		shared = {}
+
+		for i, (requestId, op, flags, address, register, length, data) in enumerate(requests):
+			if op in _READ_OPS and not (flags & _FLAG_NO_REGISTER) and (flags & _FLAG_NO_MERGE):
+				# A read of its own - batched, but never shared
+				run.append(i)
+
+			elif op in _READ_OPS and not (flags & _FLAG_NO_REGISTER):
+				key = (address, register, length)
+				if key in inflight:
+					shared[i] = inflight[key]
+					self.merged += 1
+					continue
+				inflight[key] = i
+				run.append(i)
+
+			elif op in _WRITE_OPS:
+				# A read after this write must see the new data
+				for key in [key for key in inflight if key[0] == address]:
+					del inflight[key]
+				run.append(i)
+
+			else:
+				self._flush(requests, run, results)
+				run = []
+				inflight = {}
+				results[i] = self._runOne(op, flags, address, register, length, data)
+
+		self._flush(requests, run, results)
+
+		for i in shared:
+			results[i] = results[shared[i]]
+
+		return results
+
+	def _flush(self, requests, run, results):
+		# Sends a run of reads and writes to the bus as one batch per device,
+		# so a failure - a missing device, say - only reaches the requests of
+		# the device that caused it. Each device keeps the order of its own
+		# requests.
+		devices = []
+		runs = {}
+		for i in run:
+			address = requests[i][3]
+			if address not in runs:
+				runs[address] = []
+				devices.append(address)
+			runs[address].append(i)
+
+		for address in devices:
+			self._flushDevice(requests, runs[address], results)
+
+	def _flushDevice(self, requests, run, results):
+		# Sends the run of reads and writes of one device as one batch
+		if len(run) == 1:
+			i = run[0]
+			results[i] = self._runOne(*requests[i][1:])
+			return
+
+		batch = self._driver.batch()
+		for i in run:
+			requestId, op, flags, address, register, length, data = requests[i]
+			if op in _READ_OPS:
+				batch.readBlock(address, register, length)
+			elif op == _OP_WRITE_BYTE:
+				batch.writeByte(address, register, data[0])
+			else:
+				batch.writeBlock(address, register, list(data))
+
+		try:
+			data = batch.submit()
+		except Exception as ee:
+			# Run the reads one by one, so each client gets its own result.
+			# A write may or may not have reached the device, and sending it
+			# again could repeat it, so it is answered with the error of the
+			# batch.
+			status = getattr(ee, "errno", None) or errno.EIO
+			for i in run:
+				if requests[i][1] in _READ_OPS:
+					results[i] = self._runOne(*requests[i][1:])
+				else:
+					results[i] = (status, b"")
+			return
+
+		self.batches += 1
+		reads = iter(data)
+		for i in run:
+			if requests[i][1] in _READ_OPS:
+				results[i] = (0, bytes(next(reads)))
+			else:
+				results[i] = (0, b"")
+
+	def _runOne(self, op, flags, address, register, length, data):
+		# Runs a single request - returns (status, payload)
+		driver = self._driver
+		if flags & _FLAG_NO_REGISTER:
+			register = None
+
+		try:
+			if op == _OP_READ_BYTE:
+				return (0, bytes([driver.readByte(address, register)]))
+			elif op == _OP_READ_WORD:
+				value = driver.readWord(address, register)
+				return (0, bytes([value & 0xFF, (value >> 8) & 0xFF]))
+			elif op == _OP_READ_BLOCK:
+				return (0, bytes(driver.readBlock(address, register, length)))
+			elif op == _OP_WRITE_COMMAND:
+				driver.writeCommand(address, register)
+			elif op == _OP_WRITE_BYTE:
+				driver.writeByte(address, register, data[0])
+			elif op == _OP_WRITE_WORD:
+				driver.writeWord(address, register, data[0] | (data[1] << 8))
+			elif op == _OP_WRITE_BLOCK:
+				driver.writeBlock(address, register, list(data))
+			elif op == _OP_PROBE:
+				return (0, bytes([1 if driver.isDeviceConnected(address) else 0]))
+			elif op == _OP_SCAN:
+				return (0, bytes(driver.scan()))
+			elif op == _OP_HELLO:
+				return (0, struct.pack(_HELLO, min(driver.maxWriteBlock, 0xFFFF), min(driver.maxReadBlock, 0xFFFF),
+									   1 if driver.supportsCombined else 0, 1 if driver.supportsRepeatedStart else 0))
+			else:
+				return (errno.EINVAL, b"")
+		except OSError as ee:
+			return (ee.errno or errno.EIO, b"")
+		except Exception:
+			return (errno.EIO, b"")
+
+		return (0, b"")
+
+#-----------------------------------------------------------------------------
+# BrokerI2C
+#
+class BrokerI2C(I2CDriver):
+	"""
+	BrokerI2C
+
+		I2C driver that runs every operation through a broker process.
+
+		:param iBus: The bus number, used for the default socket path. It
+			comes first, as for LinuxI2C, so code written for the Linux
+			driver runs unchanged against a broker.
+		:param path: Path of the broker socket (keyword only). Defaults to
+			the QWIIC_I2C_BROKER environment variable, or the default socket
+			of the bus.
+	"""
+
+	name = _PLATFORM_NAME
+
+	def __init__(self, iBus=1, *args, path=None, **argk):
+		I2CDriver.__init__(self)
+
+		self.path = self._socketFor(path, iBus)
+
+		self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self._socket.connect(self.path)
+
+		# One request on the socket at a time
+		self._lock = _thread.allocate_lock() if _thread is not None else None
+		self._nextId = 0
+
+		# False to have every read of this client reach the device, rather
+		# than be answered from an identical read of the same round
+		self.mergeReads = True
+
+		# The broker's bus and device state is shared by every client - each
+		# client keeping its own would disagree with it
+		self.healthMonitor = None
+
+		maxWrite, maxRead, combined, repeatedStart = struct.unpack(_HELLO, self._request(_OP_HELLO))
+		self.maxWriteBlock = maxWrite
+		self.maxReadBlock = maxRead
+		self.supportsCombined = bool(combined)
+		self.supportsRepeatedStart = bool(repeatedStart)
+
+	@staticmethod
+	def _socketFor(path, iBus):
+		if path is not None:
+			return path
+		try:
+			value = os.environ.get(_BROKER_ENV_VAR)
+		except AttributeError:
+			value = None
+		return _socketPath(value, iBus)
+
+	@classmethod
+	def isPlatform(cls):
+		try:
+			return os.environ.get(_BROKER_ENV_VAR, "") not in ("", "0")
+		except AttributeError:
+			return False
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	@classmethod
+	def _busKey(cls, iBus=1, *args, path=None, **argk):
+		return (cls._socketFor(path, int(iBus)),)
+
+	def close(self):
+		if self._socket is not None:
+			self._socket.close()
+			self._socket = None
+
+	#-------------------------------------------------------------------------
+	# Requests
+
+	def _send(self, op, address, commandCode, length, data):
+		# Sends one request, returns its id. Called with the lock held.
+		flags = 0
+		if commandCode is None:
+			flags |= _FLAG_NO_REGISTER
+			commandCode = 0
+		if not self.mergeReads:
+			flags |= _FLAG_NO_MERGE
+
+		requestId = self._nextId
+		self._nextId = (self._nextId + 1) & 0xFFFFFFFF
+
+		self._socket.sendall(struct.pack(_REQUEST, requestId, op, flags, address, commandCode, length) + data)
+		return requestId
+
+	def _receiveExactly(self, n):
+		chunks = []
+		while n > 0:
+			chunk = self._socket.recv(n)
+			if not chunk:
+				raise OSError(errno.ECONNRESET, "I2C broker closed the connection")
+			chunks.append(chunk)
+			n -= len(chunk)
+		return b"".join(chunks)
+
+	def _receive(self, requestId):
+		# Returns the payload of the response to requestId, raising on an error
+		responseId, status, length = struct.unpack(_RESPONSE, self._receiveExactly(_RESPONSE_SIZE))
+		payload = self._receiveExactly(length) if length else b""
+
+		if responseId != requestId:
+			raise OSError(errno.EPROTO, "I2C broker response out of order")
+		if status:
+			raise OSError(status, os.strerror(status))
+		return payload
+
+	def _request(self, op, address=0, commandCode=0, length=0, data=b""):
+		if self._lock is not None:
+			self._lock.acquire()
+		try:
+			return self._receive(self._send(op, address, commandCode, length, data))
+		finally:
+			if self._lock is not None:
+				self._lock.release()
+
+	# read commands ----------------------------------------------------------
+	def readWord(self, address, commandCode):
+		data = self._request(_OP_READ_WORD, address, commandCode, 2)
+		return (data[1] << 8) | data[0]
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		return self._request(_OP_READ_BYTE, address, commandCode, 1)[0]
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		return list(self._request(_OP_READ_BLOCK, address, commandCode, nBytes))
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		buf[:] = self._request(_OP_READ_BLOCK, address, commandCode, len(buf))
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# write commands----------------------------------------------------------
+	def writeCommand(self, address, commandCode):
+		self._request(_OP_WRITE_COMMAND, address, commandCode)
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		self._request(_OP_WRITE_WORD, address, commandCode, 2, bytes([value & 0xFF, (value >> 8) & 0xFF]))
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		self._request(_OP_WRITE_BYTE, address, commandCode, 1, bytes([value & 0xFF]))
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		data = bytes(value)
+		self._request(_OP_WRITE_BLOCK, address, commandCode, len(data), data)
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _submitBatch(self, ops):
+		# All requests are sent before any response is read, so the broker
+		# gets them in one round and batches them together
+		from .i2c_driver import _BATCH_WRITE_BYTE, _BATCH_WRITE_BLOCK
+
+		if self._lock is not None:
+			self._lock.acquire()
+		try:
+			sent = []
+			for code, address, commandCode, arg in ops:
+				if code == _BATCH_WRITE_BYTE:
+					sent.append((False, self._send(_OP_WRITE_BYTE, address, commandCode, 1, bytes([arg & 0xFF]))))
+				elif code == _BATCH_WRITE_BLOCK:
+					data = bytes(arg)
+					sent.append((False, self._send(_OP_WRITE_BLOCK, address, commandCode, len(data), data)))
+				else:
+					sent.append((True, self._send(_OP_READ_BLOCK, address, commandCode, arg, b"")))
+
+			# Every response is read, even after an error, to keep the
+			# connection in step
+			results = []
+			error = None
+			for isRead, requestId in sent:
+				try:
+					payload = self._receive(requestId)
+				except OSError as ee:
+					if ee.errno in (errno.ECONNRESET, errno.EPROTO):
+						raise
+					error = error or ee
+					continue
+				if isRead:
+					results.append(list(payload))
+		finally:
+			if self._lock is not None:
+				self._lock.release()
+
+		if error is not None:
+			raise error
+		return results
+
+	def _probeAddress(self, devAddress):
+		return self._request(_OP_PROBE, devAddress)[0] == 1
+
+	def _scanBus(self):
+		return list(self._request(_OP_SCAN))
+
+#-----------------------------------------------------------------------------
+# Running the broker
+
+def main(args):
+	iBus = 1
+	path = None
+	simulated = False
+
+	i = 0
+	while i < len(args):
+		if args[i] == "--bus" and i + 1 < len(args):
+			iBus = int(args[i + 1])
+			i += 1
+		elif args[i] == "--socket" and i + 1 < len(args):
+			path = args[i + 1]
+			i += 1
+		elif args[i] == "--sim":
+			simulated = True
+		else:
+			print("Usage: python -m Qwiic.qwiic_i2c.broker_i2c [--bus N] [--socket PATH] [--sim]")
+			return 1
+		i += 1
+
+	if simulated:
+		from .sim_i2c import SimulatedI2C
+		driver = SimulatedI2C()
+	else:
+		# The broker itself talks to the bus, never to another broker
+		from . import setPlatform, getI2CDriver
+		setPlatform("linux")
+		driver = getI2CDriver(iBus)
+		if driver is None:
+			print("Unable to load the I2C driver for this platform")
+			return 1
+
+	broker = I2CBroker(driver, path if path is not None else DEFAULT_SOCKET % iBus)
+	print("Serving %s on %s" % (driver.name, broker.path))
+	try:
+		broker.serveForever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		broker.close()
+		print("Served %d requests in %d batches, %d reads merged" % (broker.requests, broker.batches, broker.merged))
+
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
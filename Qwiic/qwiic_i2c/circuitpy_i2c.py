@@ -40,6 +40,7 @@ from .i2c_driver import I2CDriver
 
 import sys
 import os
+import time
 
 _PLATFORM_NAME = "CircuitPython"
 
@@ -100,9 +101,18 @@ class CircuitPythonI2C(I2CDriver):
 	# Constructor
 	name = _PLATFORM_NAME
 
+	# writeto and writeto_then_readfrom have no block limit of their own
+	maxWriteBlock = 0xFFFF
+	maxReadBlock = 0xFFFF
+	supportsRepeatedStart = True
+	supportsSetFrequency = True
+
+	# Seconds to keep trying for the bus lock when another user holds it
+	lockTimeout = 0.25
+
 	_i2cbus = None
 
-	def __init__(self, sda=None, scl=None, freq=100000, *args, **argk):
+	def __init__(self, sda=None, scl=None, freq=None, *args, **argk):
 
 		# Call the super class. The super calss will use default values if not 
 		# proviced
@@ -110,6 +120,17 @@ class CircuitPythonI2C(I2CDriver):
 
 		self._sda = sda
 		self._scl = scl
+
+		# Nesting depth of the with blocks holding the bus lock
+		self._lockDepth = 0
+
+		# Register byte sent before a read
+		self._register = bytearray(1)
+
+		# Start at the clock saved by autoTuneFrequency(), if there is one
+		if freq is None:
+			from .clock_tune import savedFrequency
+			freq = savedFrequency(self._tuneKey()) or 100000
 		self._freq = freq
 
 		self._i2cbus = _connectToI2CBus(sda=self._sda, scl=self._scl, freq=self._freq)
@@ -126,6 +147,65 @@ class CircuitPythonI2C(I2CDriver):
 	def is_platform(cls):
 		return cls.isPlatform()
 
+	@classmethod
+	def _busKey(cls, sda=None, scl=None, *args, **argk):
+		# One clock per pin pair - the frequency does not make another bus
+		return (sda, scl)
+
+	@classmethod
+	def _busFrequency(cls, sda=None, scl=None, freq=None, *args, **argk):
+		return freq
+
+	def _tuneKey(self):
+		return "%s %s/%s" % (self.name, self._sda, self._scl)
+
+	def setFrequency(self, freq):
+		"""
+			Changes the bus clock. busio fixes the clock when the bus is
+			created, so the bus is released and created again.
+
+			:param freq: The bus clock frequency in Hz
+
+			:return: True if the clock was changed, False if the bus keeps
+				its current clock
+			:rtype: bool
+		"""
+		if self._sda is None or self._scl is None:
+			import board
+			# board.STEMMA_I2C() always runs at its default clock
+			if hasattr(board, "STEMMA_I2C"):
+				return False
+
+		# The pins are in use until the old bus is released, so it cannot be
+		# kept while the new one is set up. If the new clock fails, the bus
+		# is set up again at the old clock.
+		if self._i2cbus is not None:
+			self._i2cbus.deinit()
+
+		i2cbus = _connectToI2CBus(sda=self._sda, scl=self._scl, freq=freq)
+		if i2cbus is not None:
+			self._freq = freq
+			self._i2cbus = i2cbus
+			return True
+
+		self._i2cbus = _connectToI2CBus(sda=self._sda, scl=self._scl, freq=self._freq)
+		if self._i2cbus is None:
+			raise RuntimeError("Unable to set up the I2C bus again at %d Hz" % self._freq)
+		return False
+
+	def getFrequency(self):
+		""" Returns the bus clock frequency in Hz """
+		return self._freq
+
+	def get_frequency(self):
+		return self.getFrequency()
+
+	def close(self):
+		""" Releases the bus pins """
+		if self._i2cbus is not None:
+			self._i2cbus.deinit()
+			self._i2cbus = None
+
 #-------------------------------------------------------------------------		
 	# General get attribute method
 	#
@@ -152,23 +232,55 @@ class CircuitPythonI2C(I2CDriver):
 		if(name != "i2cbus"):
 			super(I2CDriver, self).__setattr__(name, value)
 
-	#----------------------------------------------------------
-	# read Data Command
+	#-------------------------------------------------------------------------
+	# Python with statement support - holds the bus lock for the whole block,
+	# so a sequence of transactions locks the bus once instead of once per
+	# operation. Blocks nest - the bus is unlocked when the outermost ends.
+	#
+	def __enter__(self):
+		self._acquire()
+		return self
+
+	def __exit__(self, type, value, traceback):
+		self._release()
+
+	def _acquire(self):
+		# busio only offers try_lock(). Another user of the bus (a library
+		# driving a device of its own) holds the lock for a short transfer,
+		# so keep trying for up to lockTimeout seconds before giving up.
+		if self._lockDepth:
+			self._lockDepth += 1
+			return
 
-	def readWord(self, address, commandCode):
 		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
+			deadline = time.monotonic() + self.lockTimeout
+			while not self._i2cbus.try_lock():
+				if time.monotonic() >= deadline:
+					raise Exception("Unable to lock I2C bus")
+				time.sleep(0)
 
-		buffer = bytearray(2)
+		self._lockDepth = 1
 
-		try:
-			self._i2cbus.writeto_then_readfrom(address, bytes([commandCode]), buffer)
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
+	def _release(self):
+		self._lockDepth -= 1
+		if not self._lockDepth:
 			self._i2cbus.unlock()
 
+	#----------------------------------------------------------
+	# read Data Command
+	#
+	# The register byte is sent from a buffer kept for it, and small reads
+	# land in the scratch buffer, so reads allocate nothing but the result.
+
+	def _readInto(self, address, commandCode, buf):
+		self._register[0] = commandCode
+		with self:
+			self._transact(False, address, self._i2cbus.writeto_then_readfrom, address, self._register, buf)
+		return buf
+
+	def readWord(self, address, commandCode):
+		buffer = self._readInto(address, commandCode, self._scratch(2))
+
 		# build and return a word
 		return (buffer[1] << 8 ) | buffer[0]
 
@@ -177,44 +289,25 @@ class CircuitPythonI2C(I2CDriver):
 
 	#----------------------------------------------------------
 	def readByte(self, address, commandCode):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-
-		buffer = bytearray(1)
-
-		try:
-			self._i2cbus.writeto_then_readfrom(address, bytes([commandCode]), buffer)
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
-
-		return buffer[0]
+		return self._readInto(address, commandCode, self._scratch(1))[0]
 
 	def read_byte(self, address, commandCode = None):
 		return self.readByte(address, commandCode)
 
 	#----------------------------------------------------------
 	def readBlock(self, address, commandCode, nBytes):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-
-		buffer = bytearray(nBytes)
-
-		try:
-			self._i2cbus.writeto_then_readfrom(address, bytes([commandCode]), buffer)
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
-
-		return list(buffer)
+		return list(self._readInto(address, commandCode, self._scratch(nBytes)))
 
 	def read_block(self, address, commandCode, nBytes):
 		return self.readBlock(address, commandCode, nBytes)
 
+	#----------------------------------------------------------
+	def readBlockInto(self, address, commandCode, buf):
+		return self._readInto(address, commandCode, buf)
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
 	#--------------------------------------------------------------------------	
 	# write Data Commands 
 	#
@@ -222,90 +315,68 @@ class CircuitPythonI2C(I2CDriver):
 	#
 	# value = 16 bits of valid data..
 	#
+	# busio has no scatter write, so the register byte and the data are
+	# copied in to the scratch buffer and sent from a view of it.
+
+	def _write(self, address, size):
+		# Sends the first size bytes of the scratch buffer
+		with self:
+			self._transact(True, address, self._i2cbus.writeto, address, self._scratch(size))
 
 	def writeCommand(self, address, commandCode):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-		
-		try:
-			self._i2cbus.writeto(address, bytes([commandCode]))
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
+		self._scratch(1)
+		self._scratchBuffer[0] = commandCode
+		self._write(address, 1)
 
 	def write_command(self, address, commandCode):
 		return self.writeCommand(address, commandCode)
 
 	#----------------------------------------------------------
 	def writeWord(self, address, commandCode, value):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-
-		buffer = [0, 0]
-		buffer[0] = value & 0xFF
-		buffer[1] = (value >> 8) & 0xFF
-
-		try:
-			self._i2cbus.writeto(address, bytes([commandCode] + buffer))
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
+		self._scratch(3)
+		buffer = self._scratchBuffer
+		buffer[0] = commandCode
+		buffer[1] = value & 0xFF
+		buffer[2] = (value >> 8) & 0xFF
+		self._write(address, 3)
 
 	def write_word(self, address, commandCode, value):
 		return self.writeWord(address, commandCode, value)
 
 	#----------------------------------------------------------
 	def writeByte(self, address, commandCode, value):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-		
-		try:
-			self._i2cbus.writeto(address, bytes([commandCode] + [value]))
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
+		self._scratch(2)
+		buffer = self._scratchBuffer
+		buffer[0] = commandCode
+		buffer[1] = value
+		self._write(address, 2)
 
 	def write_byte(self, address, commandCode, value):
 		return self.writeByte(address, commandCode, value)
 
 	#----------------------------------------------------------
 	def writeBlock(self, address, commandCode, value):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-		
-		try:
-			self._i2cbus.writeto(address, bytes([commandCode] + value))
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
+		# The data may be a list or any buffer (bytes, bytearray, memoryview)
+		size = self._copyToScratch(1, value)
+		self._scratchBuffer[0] = commandCode
+		self._write(address, size)
 
 	def write_block(self, address, commandCode, value):
 		return self.writeBlock(address, commandCode, value)
 
-	def isDeviceConnected(self, devAddress):
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-		
-		isConnected = False
+	def _probeAddress(self, devAddress):
+		with self:
+			return self._healthProbe(devAddress)
+
+	def _healthProbe(self, devAddress):
+		# Called from _transact() - the bus is already locked
 		try:
 			# Try to write nothing to the device
 			# If it throws an I/O error - the device isn't connected
-			self._i2cbus.writeto(devAddress, bytearray())
-			isConnected = True
+			self._i2cbus.writeto(devAddress, b"")
+			return True
 		except:
-			pass
-		finally:
-			self._i2cbus.unlock()
-
-		return isConnected
+			return False
 
 	def is_device_connected(self, devAddress):
 		return self.isDeviceConnected(devAddress)
@@ -314,21 +385,11 @@ class CircuitPythonI2C(I2CDriver):
 		return self.isDeviceConnected(devAddress)
 
 	#-----------------------------------------------------------------------
-	# scan()
+	# _scanBus()
 	#
 	# Scans the I2C bus and returns a list of addresses that have a devices connected
 	#
-	def scan(self):
+	def _scanBus(self):
 		""" Returns a list of addresses for the devices connected to the I2C bus."""
-		if not self._i2cbus.try_lock():
-			raise Exception("Unable to lock I2C bus")
-		
-		try:
-			devices = self._i2cbus.scan()
-		except Exception as e:
-			self._i2cbus.unlock()
-			raise e
-		else:
-			self._i2cbus.unlock()
-		
-		return devices
+		with self:
+			return self._i2cbus.scan()
@@ -0,0 +1,241 @@
+#-----------------------------------------------------------------------------
+# clock_tune.py
+#
+# Bus clock auto-tuning for the MicroPython and CircuitPython drivers
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+clock_tune
+==========
+Finds the fastest bus clock every attached device works at.
+
+The bus is stepped up through CLOCK_STEPS (100 kHz, 400 kHz, 1 MHz). At each
+step every device still in the running is probed, and read back where a
+readback register is known, comparing against a reference read taken at the
+slowest clock. A device that fails stays at its last good step. The bus
+clock is shared, so the bus runs at the slowest of the per-device results.
+
+The result is saved to TUNE_FILE, in the data directory (see data_dir), and
+used as the starting clock by later drivers on the same pins.
+
+:example:
+
+	>>> i2c = qwiic_i2c.getI2CDriver()
+	>>> freq, perAddress = i2c.autoTuneFrequency()
+"""
+
+from .retry_policy import RetryPolicy
+from .data_dir import dataPath, makeParentDir
+
+try:
+	import json
+except ImportError:
+	import ujson as json
+
+# Clock rates tried, slowest first
+CLOCK_STEPS = (100000, 400000, 1000000)
+
+# File the tuned clock is saved to - a fixed location, so it is found
+# whatever the working directory
+TUNE_FILE = dataPath("qwiic_i2c_clock.json")
+
+# Registers read back to check the data - address -> (register, byte count).
+# Only registers that hold a constant value are usable (the OTOS product ID).
+READBACK_REGISTERS = {
+	0x17: (0x00, 1),
+}
+
+# Probes (and readbacks) of each device at each step
+_CHECKS = 3
+
+def _passes(driver, address, reference, checks):
+	# True if the device answers correctly at the current clock
+	try:
+		for i in range(checks):
+			if not driver._probeAddress(address):
+				return False
+			if reference is not None:
+				register, data = reference
+				if bytes(driver.readBlock(address, register, len(data))) != data:
+					return False
+	except Exception:
+		return False
+
+	return True
+
+def autoTune(driver, addresses=None, steps=CLOCK_STEPS, checks=_CHECKS,
+			 readback=READBACK_REGISTERS, save=True, path=TUNE_FILE):
+	"""
+		Finds and sets the fastest clock of a bus.
+
+		:param driver: An I2C driver that supports setFrequency()
+		:param addresses: Addresses to tune for. Defaults to a scan of the bus
+		:param steps: Clock rates to try, slowest first
+		:param checks: Probes and readbacks of each device at each step
+		:param readback: dict of address -> (register, byte count) read back
+			to check the data
+		:param save: True to save the result to path
+		:param path: Name of the file the result is saved to
+
+		:return: The bus clock, and a dict of address -> fastest clock of
+			that device. The clock is None, and the dict empty, if the
+			driver cannot change the clock.
+		:rtype: tuple
+	"""
+	if not driver.supportsSetFrequency:
+		return None, {}
+
+	# The clock to go back to if tuning does not finish
+	previous = driver.getFrequency()
+	tuned = False
+
+	# Tuning needs to see every failure - no retries, and failures at a
+	# clock that is too fast must not mark the devices down
+	policy = driver.retryPolicy
+	driver.retryPolicy = RetryPolicy(readAttempts=1, writeAttempts=1)
+	driver._pauseHealth()
+
+	try:
+		if not driver.setFrequency(steps[0]):
+			return None, {}
+
+		if addresses is None:
+			addresses = driver._scanBus()
+
+		# Reference readback at the slowest clock
+		references = {}
+		for address in addresses:
+			if address in readback:
+				register, nBytes = readback[address]
+				try:
+					references[address] = (register, bytes(driver.readBlock(address, register, nBytes)))
+				except Exception:
+					pass
+
+		best = {}
+		for address in addresses:
+			best[address] = steps[0]
+
+		running = list(addresses)
+		for freq in steps[1:]:
+			if not running:
+				break
+
+			try:
+				if not driver.setFrequency(freq):
+					break
+			except Exception:
+				break
+
+			for address in list(running):
+				if _passes(driver, address, references.get(address), checks):
+					best[address] = freq
+				else:
+					# Drop back - this device stays at its last good step
+					running.remove(address)
+
+		busFreq = min(best.values()) if best else steps[0]
+		tuned = driver.setFrequency(busFreq)
+	finally:
+		driver.retryPolicy = policy
+		driver._pauseHealth(False)
+
+		# Interrupted part way through the sweep - not left at whatever
+		# clock it had reached
+		if not tuned:
+			try:
+				driver.setFrequency(previous)
+			except Exception:
+				pass
+
+	if save:
+		saveFrequency(driver._tuneKey(), busFreq, best, path)
+
+	return busFreq, best
+
+def auto_tune(driver, addresses=None, steps=CLOCK_STEPS, checks=_CHECKS,
+			  readback=READBACK_REGISTERS, save=True, path=TUNE_FILE):
+	return autoTune(driver, addresses, steps, checks, readback, save, path)
+
+def _load(path):
+	try:
+		with open(path) as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return {}
+
+def savedFrequency(key, path=TUNE_FILE):
+	"""
+		Returns the saved clock of a bus
+
+		:param key: The bus name, as returned by the driver's _tuneKey()
+		:param path: Name of the file the results are saved in
+
+		:return: The clock in Hz, or None if the bus was never tuned
+		:rtype: int
+	"""
+	entry = _load(path).get(key)
+	if entry is None:
+		return None
+	return entry["freq"]
+
+def saved_frequency(key, path=TUNE_FILE):
+	return savedFrequency(key, path)
+
+def saveFrequency(key, freq, perAddress=None, path=TUNE_FILE):
+	"""
+		Saves the tuned clock of a bus
+
+		:param key: The bus name, as returned by the driver's _tuneKey()
+		:param freq: The bus clock in Hz
+		:param perAddress: dict of address -> fastest clock of that device
+		:param path: Name of the file the results are saved in
+
+		:return: True if saved, False if the file could not be written (a
+			read-only CircuitPython filesystem, for example)
+		:rtype: bool
+	"""
+	tuned = _load(path)
+
+	entry = {"freq": freq}
+	if perAddress is not None:
+		entry["addresses"] = dict(("0x%02X" % address, perAddress[address]) for address in perAddress)
+	tuned[key] = entry
+
+	makeParentDir(path)
+	try:
+		with open(path, "w") as f:
+			json.dump(tuned, f)
+	except OSError:
+		return False
+
+	return True
+
+def save_frequency(key, freq, perAddress=None, path=TUNE_FILE):
+	return saveFrequency(key, freq, perAddress, path)
@@ -0,0 +1,129 @@
+#-----------------------------------------------------------------------------
+# data_dir.py
+#
+# Location of the files the qwiic packages save between runs
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+data_dir
+========
+The directory the saved clock tuning (clock_tune) and device index
+(qwiic_devices) are kept in. It does not depend on the working directory, so
+every run finds the same files:
+
+- the directory in the QWIIC_DATA_DIR environment variable, if set
+- on Linux, qwiic in the user's cache directory - $XDG_CACHE_HOME, or
+  ~/.cache
+- on MicroPython and CircuitPython, the root of the board's filesystem
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.data_dir import dataPath
+	>>> dataPath("qwiic_i2c_clock.json")
+	'/home/pi/.cache/qwiic/qwiic_i2c_clock.json'
+"""
+
+try:
+	import os
+except ImportError:
+	import uos as os
+
+# Environment variable naming the directory, overriding the default
+_DATA_DIR_ENV_VAR = "QWIIC_DATA_DIR"
+
+def _getenv(name):
+	# CircuitPython has getenv() (settings.toml) but no environ, MicroPython
+	# has neither
+	environ = getattr(os, "environ", None)
+	if environ is not None:
+		return environ.get(name)
+	getenv = getattr(os, "getenv", None)
+	if getenv is not None:
+		try:
+			return getenv(name)
+		except Exception:
+			pass
+	return None
+
+def dataDir():
+	"""
+		Returns the directory the qwiic packages save their files in
+
+		:return: The directory path
+		:rtype: str
+	"""
+	path = _getenv(_DATA_DIR_ENV_VAR)
+	if path:
+		return path
+
+	if hasattr(os, "path") and hasattr(os.path, "expanduser"):
+		cache = _getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+		return os.path.join(cache, "qwiic")
+
+	return "/"
+
+def data_dir():
+	return dataDir()
+
+def dataPath(name):
+	"""
+		Returns the path of a file in the data directory
+
+		:param name: The file name
+
+		:return: The file path
+		:rtype: str
+	"""
+	path = dataDir()
+	if hasattr(os, "path"):
+		return os.path.join(path, name)
+	return path.rstrip("/") + "/" + name
+
+def data_path(name):
+	return dataPath(name)
+
+def makeParentDir(path):
+	"""
+		Creates the directory a file is to be saved in, if it does not exist.
+		Errors are left for the write that follows to report.
+
+		:param path: The file path
+	"""
+	makedirs = getattr(os, "makedirs", None)
+	if makedirs is None or not hasattr(os, "path"):
+		return
+	parent = os.path.dirname(path)
+	if parent:
+		try:
+			makedirs(parent, exist_ok=True)
+		except OSError:
+			pass
+
+def make_parent_dir(path):
+	return makeParentDir(path)
@@ -0,0 +1,383 @@
+#-----------------------------------------------------------------------------
+# dev_i2c.py
+#
+# Encapsulate the Linux /dev/i2c-N character device interface
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+dev_i2c
+=======
+Linux I2C driver that talks to /dev/i2c-N directly with the I2C_RDWR ioctl. It
+has no dependency on smbus2 and is not bound by the 32 byte SMBus block limit -
+a single block read or write can be up to 8192 bytes.
+
+getI2CDriver() selects this driver on Linux systems where smbus2 is not
+installed. It can also be created directly.
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.dev_i2c import LinuxDevI2C
+	>>> i2c = LinuxDevI2C(iBus=1)
+	>>> data = i2c.readBlock(0x17, 0x20, 36)
+"""
+
+from .i2c_driver import I2CDriver, _BATCH_WRITE_BYTE, _BATCH_WRITE_BLOCK
+from .linux_i2c import _getBusLock
+
+import sys
+import os
+import ctypes
+import fcntl
+
+_PLATFORM_NAME = "Linux /dev/i2c"
+
+# ioctl request and message flag from linux/i2c-dev.h and linux/i2c.h
+_I2C_RDWR = 0x0707
+_I2C_M_RD = 0x0001
+
+# The kernel caps the number of messages in a single I2C_RDWR ioctl, and the
+# length of each message
+_RDWR_MAX_MSGS = 42
+_RDWR_MAX_MSG_LEN = 8192
+
+#-----------------------------------------------------------------------------
+# Kernel structures used by the I2C_RDWR ioctl
+#
+class _I2CMsg(ctypes.Structure):
+	_fields_ = [
+		('addr', ctypes.c_uint16),
+		('flags', ctypes.c_uint16),
+		('len', ctypes.c_uint16),
+		('buf', ctypes.POINTER(ctypes.c_uint8))
+	]
+
+class _I2CRdwrIoctlData(ctypes.Structure):
+	_fields_ = [
+		('msgs', ctypes.POINTER(_I2CMsg)),
+		('nmsgs', ctypes.c_uint32)
+	]
+
+# The length of a message is 16 bits - a longer read or write is refused
+# here rather than silently wrapped
+def _writeMsg(address, data):
+	nBytes = len(data)
+	if nBytes > _RDWR_MAX_MSG_LEN:
+		raise ValueError("I2C write of %d bytes exceeds the %d byte limit" % (nBytes, _RDWR_MAX_MSG_LEN))
+	cBuf = (ctypes.c_uint8 * nBytes).from_buffer_copy(bytes(data)) if nBytes else (ctypes.c_uint8 * 1)()
+	return _I2CMsg(addr=address, flags=0, len=nBytes, buf=ctypes.cast(cBuf, ctypes.POINTER(ctypes.c_uint8)))
+
+def _readMsg(address, buf):
+	# buf must be writable - the kernel reads directly in to it. The length
+	# is in bytes - len() of an array counts its items.
+	nBytes = memoryview(buf).nbytes
+	if nBytes > _RDWR_MAX_MSG_LEN:
+		raise ValueError("I2C read of %d bytes exceeds the %d byte limit" % (nBytes, _RDWR_MAX_MSG_LEN))
+	cBuf = (ctypes.c_uint8 * nBytes).from_buffer(buf)
+	return _I2CMsg(addr=address, flags=_I2C_M_RD, len=nBytes, buf=ctypes.cast(cBuf, ctypes.POINTER(ctypes.c_uint8)))
+
+#-----------------------------------------------------------------------------
+# Internal function to open the I2C character device.
+#
+# Attempts to fail elegantly - often an issue with permissions with the I2C
+# bus. Users of this system should be added to the system i2c group
+#
+def _connectToI2CBus(iBus=1, *args, **argk):
+
+	fd = None
+
+	try:
+		fd = os.open("/dev/i2c-%d" % iBus, os.O_RDWR)
+	except Exception as ee:
+		if(type(ee) is PermissionError or getattr(ee, "errno", None) == 13):
+			print("Error:\tUnable to connect to I2C bus %d: Permission denied.\n\tVerify you have permissoin to access the I2C bus" % (iBus), file=sys.stderr)
+		else:
+			print("Error:\tFailed to connect to I2C bus %d. Error: %s" % (iBus, str(ee)), file=sys.stderr)
+
+	return fd
+
+def _connect_to_i2c_bus(*args, **argk):
+	return _connectToI2CBus(*args, **argk)
+
+class LinuxDevI2C(I2CDriver):
+
+	# Constructor
+	name = _PLATFORM_NAME
+
+	# A write message also carries the register byte
+	maxWriteBlock = _RDWR_MAX_MSG_LEN - 1
+	maxReadBlock = _RDWR_MAX_MSG_LEN
+	supportsCombined = True
+	supportsRepeatedStart = True
+
+	_fd = None
+
+	def __init__(self, iBus=1, *args, **argk):
+
+		# Call the super class. The super calss will use default values if not
+		# proviced
+		I2CDriver.__init__(self)
+
+		self._iBus = iBus
+
+		# Lock shared with every other driver object on this bus, including
+		# LinuxI2C objects
+		self._lock = _getBusLock(self._iBus)
+
+		self._fd = _connectToI2CBus(self._iBus)
+
+	# Okay, are we running on a Linux system?
+	@classmethod
+	def isPlatform(cls):
+
+		return sys.platform in ('linux', 'linux2')
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	#-------------------------------------------------------------------------
+	# General get attribute method
+	#
+	# The "bus" object for this driver is the open file descriptor
+	#
+	def __getattr__(self, name):
+
+		if(name == "i2cbus"):
+			return self._fd
+
+		else:
+			# Note - we call __getattribute__ to the super class (object).
+			return super(I2CDriver, self).__getattribute__(name)
+
+	#-------------------------------------------------------------------------
+	# General set attribute method
+	#
+	# Basically implemented to make the i2cbus attribute readonly to users
+	# of this class.
+	#
+	def __setattr__(self, name, value):
+
+		if(name != "i2cbus"):
+			super(I2CDriver, self).__setattr__(name, value)
+
+	#-------------------------------------------------------------------------
+	# Python with statement support - holds the bus lock for the whole block,
+	# so a sequence of transactions is not interleaved with another thread's.
+	#
+	def __enter__(self):
+		self._lock.acquire()
+		return self
+
+	def __exit__(self, type, value, traceback):
+		self._lock.release()
+
+	@classmethod
+	def _busKey(cls, iBus=1, *args, **argk):
+		return (int(iBus),)
+
+	def close(self):
+		""" Closes the I2C character device """
+		if self._fd is not None:
+			os.close(self._fd)
+			self._fd = None
+
+	#-------------------------------------------------------------------------
+	# Send a list of messages with as few I2C_RDWR ioctls as possible
+	#
+	# The bus lock is held across all the ioctls. Each ioctl runs under the
+	# retry policy - on the read budget if it contains a read message. The
+	# retry policy and health monitor work per device, so an ioctl only
+	# holds messages to one device: a retry never resends writes to another
+	# device, and a failure is charged to the device that failed.
+	#
+	def _transfer(self, msgs):
+		with self._lock:
+			iStart = 0
+			for i in range(1, len(msgs) + 1):
+				if i < len(msgs) and msgs[i].addr == msgs[iStart].addr:
+					continue
+				self._transferDevice(msgs[iStart:i])
+				iStart = i
+
+	def _transferDevice(self, msgs):
+		# Messages to one device, called with the bus lock held
+		for iStart in range(0, len(msgs), _RDWR_MAX_MSGS):
+			chunk = msgs[iStart:iStart + _RDWR_MAX_MSGS]
+
+			msgArray = (_I2CMsg * len(chunk))(*chunk)
+			ioctlData = _I2CRdwrIoctlData(msgs=msgArray, nmsgs=len(chunk))
+
+			isWrite = True
+			for msg in chunk:
+				if msg.flags & _I2C_M_RD:
+					isWrite = False
+
+			self._transact(isWrite, chunk[0].addr, fcntl.ioctl, self._fd, _I2C_RDWR, ioctlData)
+
+	def _read(self, address, commandCode, buf):
+		if commandCode is None:
+			self._transfer([_readMsg(address, buf)])
+		else:
+			self._transfer([_writeMsg(address, [commandCode]), _readMsg(address, buf)])
+		return buf
+
+	def _write(self, address, data):
+		self._transfer([_writeMsg(address, data)])
+
+	#-------------------------------------------------------------------------
+	# read Data Command
+
+	def readWord(self, address, commandCode):
+		buffer = self._read(address, commandCode, bytearray(2))
+		return (buffer[1] << 8 ) | buffer[0]
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		return self._read(address, commandCode, bytearray(1))[0]
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		return list(self._read(address, commandCode, bytearray(nBytes)))
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		return self._read(address, commandCode, buf)
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	#--------------------------------------------------------------------------
+	# write Data Commands
+	#
+	# Send a command to the I2C bus for this device.
+	#
+	# value = 16 bits of valid data..
+	#
+
+	def writeCommand(self, address, commandCode):
+		self._write(address, [commandCode])
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		self._write(address, [commandCode, value & 0xFF, (value >> 8) & 0xFF])
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		self._write(address, [commandCode, value & 0xFF])
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		buffer = bytearray(len(value) + 1)
+		buffer[0] = commandCode
+		buffer[1:] = value
+		self._write(address, buffer)
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _probeAddress(self, devAddress):
+		isConnected = False
+		try:
+			# Try to write nothing to the device
+			# If it throws an I/O error - the device isn't connected
+			with self._lock:
+				fcntl.ioctl(self._fd, _I2C_RDWR, _I2CRdwrIoctlData(
+					msgs=(_I2CMsg * 1)(_writeMsg(devAddress, b"")), nmsgs=1))
+			isConnected = True
+		except:
+			pass
+
+		return isConnected
+
+	def is_device_connected(self, devAddress):
+		return self.isDeviceConnected(devAddress)
+
+	def ping(self, devAddress):
+		return self.isDeviceConnected(devAddress)
+
+	#-----------------------------------------------------------------------
+	# _scanBus()
+	#
+	# Scans the I2C bus and returns a list of addresses that have a devices connected
+	#
+	def _scanBus(self):
+		""" Returns a list of addresses for the devices connected to the I2C bus."""
+		foundDevices = []
+		# Loop over the list of legal addresses (0x08 - 0x77)
+		for currAddress in range(0x08, 0x78):
+			if self._probeAddress(currAddress) == True:
+				foundDevices.append(currAddress)
+		return foundDevices
+
+	#-----------------------------------------------------------------------
+	# Batched operations
+	#
+	# All queued operations become messages of as few I2C_RDWR ioctls as
+	# possible. A read is a register write message followed by a read
+	# message - the pair is never split across two ioctls.
+	#
+	def _submitBatch(self, ops):
+		groups = []
+		reads = []
+		for code, address, commandCode, arg in ops:
+			if code == _BATCH_WRITE_BYTE:
+				groups.append((_writeMsg(address, [commandCode, arg]),))
+			elif code == _BATCH_WRITE_BLOCK:
+				buffer = bytearray(len(arg) + 1)
+				buffer[0] = commandCode
+				buffer[1:] = arg
+				groups.append((_writeMsg(address, buffer),))
+			else:
+				buffer = bytearray(arg)
+				groups.append((_writeMsg(address, [commandCode]), _readMsg(address, buffer)))
+				reads.append(buffer)
+
+		with self._lock:
+			msgs = []
+			for group in groups:
+				if len(msgs) + len(group) > _RDWR_MAX_MSGS:
+					self._transfer(msgs)
+					msgs = []
+				msgs.extend(group)
+			if msgs:
+				self._transfer(msgs)
+
+		return [list(buffer) for buffer in reads]
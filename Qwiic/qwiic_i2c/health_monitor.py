@@ -0,0 +1,233 @@
+#-----------------------------------------------------------------------------
+# health_monitor.py
+#
+# Per device health monitor (circuit breaker) for I2C drivers
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+health_monitor
+==============
+Keeps the presence state of every device a driver talks to, and stops
+talking to a device that has gone away.
+
+After failureThreshold operations in a row fail (each after its retries), the
+device is marked down and its circuit opened: every operation on it fails at
+once with DeviceDownError, without touching the bus. While down, the device
+is probed again on an exponential schedule - baseInterval, then twice that,
+up to maxInterval. The first probe that is answered, or a successful
+isDeviceConnected(), marks the device up again.
+
+Each driver has its own monitor, replaceable through the driver's
+healthMonitor attribute. Set it to None to switch the monitor off.
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.health_monitor import HealthMonitor
+	>>> i2c = qwiic_i2c.getI2CDriver()
+	>>> i2c.healthMonitor = HealthMonitor(failureThreshold=5, maxInterval=1.0)
+	>>> ...
+	>>> if i2c.isDeviceDown(0x17):
+	>>>     ...
+"""
+
+import time
+
+try:
+	import errno
+except ImportError:
+	import uerrno as errno
+
+#-----------------------------------------------------------------------------
+# Monotonic time in seconds. MicroPython has no time.monotonic(), so fall back
+# to the millisecond tick counter.
+if hasattr(time, "monotonic"):
+	_now = time.monotonic
+else:
+	def _now():
+		return time.ticks_ms() / 1000.0
+
+class DeviceDownError(OSError):
+	"""
+	DeviceDownError
+
+		Raised for an operation on a device that is marked down. An OSError,
+		like the bus errors, so existing error handling keeps working.
+
+		:param address: The I2C address of the device
+	"""
+	def __init__(self, address):
+		OSError.__init__(self, errno.ENODEV, "Device at address 0x%02X is down" % address)
+		self.address = address
+
+# Positions in a device entry
+_FAILURES = 0
+_DOWN = 1
+_NEXT_PROBE = 2
+_INTERVAL = 3
+
+class HealthMonitor(object):
+	"""
+	HealthMonitor
+
+		Circuit breaker with exponential re-probing, per device address.
+
+		:param failureThreshold: Failed operations in a row that mark a device
+			down
+		:param baseInterval: Delay before the first re-probe of a device that
+			is down, in seconds. Each failed re-probe doubles it.
+		:param maxInterval: Upper bound of the re-probe delay, in seconds
+		:param failOn: Exception type(s) counted as failures - bus errors
+			raise OSError
+	"""
+
+	def __init__(self, failureThreshold=3, baseInterval=0.1, maxInterval=5.0, failOn=OSError):
+		self.failureThreshold = failureThreshold
+		self.baseInterval = baseInterval
+		self.maxInterval = maxInterval
+		self.failOn = failOn
+
+		# address -> entry list, see the positions above. Only devices that
+		# have failed have an entry.
+		self._devices = {}
+
+	def run(self, address, probe, func, *args):
+		"""
+			Calls func(*args) unless the device is down.
+
+			:param address: The I2C address of the device
+			:param probe: Function of an address returning True if the device
+				answers - used to re-probe a device that is down
+			:param func: The bus operation to call
+			:param args: Arguments for func
+
+			:return: The return value of func
+		"""
+		entry = self._devices.get(address)
+		if entry is not None and entry[_DOWN] and not self._reprobe(address, entry, probe):
+			raise DeviceDownError(address)
+
+		try:
+			result = func(*args)
+		except self.failOn:
+			self.failure(address)
+			raise
+
+		if entry is not None:
+			self.success(address)
+		return result
+
+	def _reprobe(self, address, entry, probe):
+		# True if the device is back. Only probes when the schedule says so.
+		now = _now()
+		if now < entry[_NEXT_PROBE]:
+			return False
+
+		if probe(address):
+			self.success(address)
+			return True
+
+		entry[_INTERVAL] = min(self.maxInterval, entry[_INTERVAL] * 2)
+		entry[_NEXT_PROBE] = now + entry[_INTERVAL]
+		return False
+
+	def success(self, address):
+		"""
+			Records a successful operation - the device is up
+
+			:param address: The I2C address of the device
+		"""
+		self._devices.pop(address, None)
+
+	def failure(self, address):
+		"""
+			Records a failed operation. The device is marked down when
+			failureThreshold operations in a row have failed.
+
+			:param address: The I2C address of the device
+		"""
+		entry = self._devices.get(address)
+		if entry is None:
+			entry = [0, False, 0, self.baseInterval]
+			self._devices[address] = entry
+
+		entry[_FAILURES] += 1
+		if not entry[_DOWN] and entry[_FAILURES] >= self.failureThreshold:
+			entry[_DOWN] = True
+			entry[_INTERVAL] = self.baseInterval
+			entry[_NEXT_PROBE] = _now() + self.baseInterval
+
+	def probed(self, address, isConnected):
+		"""
+			Records the result of a presence probe. An answer marks the device
+			up; no answer is not counted as a failure, since the device may
+			simply not be fitted - scanning for optional devices must not
+			mark them down.
+
+			:param address: The I2C address of the device
+			:param isConnected: True if the device answered
+		"""
+		if isConnected:
+			self.success(address)
+
+	def isDown(self, address):
+		"""
+			Returns True if a device is marked down
+
+			:param address: The I2C address of the device
+
+			:rtype: bool
+		"""
+		entry = self._devices.get(address)
+		return entry is not None and entry[_DOWN]
+
+	def is_down(self, address):
+		return self.isDown(address)
+
+	def downDevices(self):
+		"""
+			Returns the addresses of the devices marked down
+
+			:rtype: list
+		"""
+		return sorted(address for address in self._devices if self._devices[address][_DOWN])
+
+	def down_devices(self):
+		return self.downDevices()
+
+	def reset(self, address=None):
+		"""
+			Forgets the state of the devices - they are all treated as up
+
+			:param address: Only reset this device. If not provided, all
+				devices are reset.
+		"""
+		if address is None:
+			self._devices = {}
+		else:
+			self._devices.pop(address, None)
@@ -59,6 +59,196 @@ New to qwiic? Take a look at the entire [SparkFun qwiic ecosystem](https://www.s
 
 """
 
+import time
+
+try:
+	import struct
+except ImportError:
+	import ustruct as struct
+
+try:
+	import array
+except ImportError:
+	import uarray as array
+
+from .retry_policy import RetryPolicy
+from .health_monitor import HealthMonitor
+from .transaction_stats import TransactionStats, _ticksUs, _elapsedUs
+
+#-----------------------------------------------------------------------------
+# Default addresses of the supported Qwiic device classes (QwiicOTOS,
+# QwiicLEDStick, QwiicOledDisplay, QwiicPersonSensor). Probed first by
+# scanKnown(), so the common devices are found without a full sweep.
+_KNOWN_ADDRESSES = (0x17, 0x23, 0x3C, 0x3D, 0x62)
+
+# How long (seconds) scan results are trusted before the bus is swept again
+_SCAN_CACHE_TTL = 1.0
+
+# How long (seconds) isDeviceConnected() results are trusted. Zero - every
+# call probes, so code polling for a device being plugged in or removed
+# sees it at once.
+_PRESENCE_CACHE_TTL = 0
+
+#-----------------------------------------------------------------------------
+# Internal function returning a monotonic time in seconds. MicroPython has no
+# time.monotonic(), so fall back to the millisecond tick counter.
+#
+def _now():
+	try:
+		return time.monotonic()
+	except AttributeError:
+		return time.ticks_ms() / 1000.0
+
+#-----------------------------------------------------------------------------
+# Compiled struct formats used by readStruct() - format -> (unpack_from, size).
+# MicroPython has no struct.Struct, there the format string is kept and
+# unpack_from() parses it on every call.
+_structs = {}
+
+def _compileStruct(fmt):
+	compiled = _structs.get(fmt)
+	if compiled is None:
+		if hasattr(struct, "Struct"):
+			packed = struct.Struct(fmt)
+			compiled = (packed.unpack_from, packed.size)
+		else:
+			compiled = (lambda buf, fmt=fmt: struct.unpack_from(fmt, buf), struct.calcsize(fmt))
+		_structs[fmt] = compiled
+	return compiled
+
+#-----------------------------------------------------------------------------
+# Batch operation codes - the first element of each queued batch operation
+_BATCH_WRITE_BYTE = 0
+_BATCH_WRITE_BLOCK = 1
+_BATCH_READ_BLOCK = 2
+
+#-----------------------------------------------------------------------------
+# Operations recorded by the transaction statistics. Each maps to
+# (isWrite, data size) - a size of None means the size comes from the
+# argument after the register (a byte count or a buffer).
+_STATS_OPS = {
+	"readWord": (False, 2),
+	"readByte": (False, 1),
+	"readBlock": (False, None),
+	"readBlockInto": (False, None),
+	"writeCommand": (True, 0),
+	"writeWord": (True, 2),
+	"writeByte": (True, 1),
+	"writeBlock": (True, None),
+}
+
+#-----------------------------------------------------------------------------
+# I2CBatch
+#
+# Queues a sequence of bus operations and submits them to the driver in one
+# go. The driver decides how - a platform that can bundle several messages in
+# to a single bus transaction (Linux i2c_rdwr) does so, the others run the
+# queue in one tight loop.
+#
+class I2CBatch(object):
+	"""
+	I2CBatch
+
+		A queue of I2C operations submitted together. Created by I2CDriver.batch().
+		When used in a with statement, the queue is submitted on exit.
+
+		:param driver: The I2C driver the batch is submitted to
+
+		:example:
+
+		>>> with i2cDriver.batch() as batch:
+		>>>     batch.writeByte(0x3C, 0x00, 0x22)
+		>>>     batch.writeByte(0x3C, 0x00, 0x00)
+		>>>     batch.readBlock(0x17, 0x20, 6)
+		>>> pose = batch.results[0]
+	"""
+
+	def __init__(self, driver):
+		self._driver = driver
+		self._ops = []
+
+		# Data returned by the read operations of the last submit, in order
+		self.results = []
+
+	def __len__(self):
+		return len(self._ops)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, type, value, traceback):
+		# Only submit if the block completed cleanly
+		if type is None:
+			self.submit()
+
+	def writeByte(self, address, commandCode, value):
+		""" 
+			Queues a write of a byte (8 bits) to a device. 
+
+			:param address: The I2C address of the device to write to
+			:param commandCode: The "command" or register to write to
+			:param value: The byte (8 bits) to write to the I2C bus
+
+			:return: The batch object
+			:rtype: I2CBatch
+
+		"""
+		self._ops.append((_BATCH_WRITE_BYTE, address, commandCode, value))
+		return self
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		""" 
+			Queues a write of a block of bytes to a device. 
+
+			:param address: The I2C address of the device to write to
+			:param commandCode: The "command" or register to write to
+			:param value: A list of bytes (ints) to write on the I2C bus.
+
+			:return: The batch object
+			:rtype: I2CBatch
+
+		"""
+		self._ops.append((_BATCH_WRITE_BLOCK, address, commandCode, value))
+		return self
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def readBlock(self, address, commandCode, nBytes):
+		""" 
+			Queues a read of a block of bytes from a device. The data is
+			available in the results list after the batch is submitted.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param nBytes: The number of bytes to read from the device
+
+			:return: The batch object
+			:rtype: I2CBatch
+
+		"""
+		self._ops.append((_BATCH_READ_BLOCK, address, commandCode, nBytes))
+		return self
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def submit(self):
+		"""
+			Submits the queued operations to the driver and empties the queue.
+
+			:return: The data of each read operation, in the order queued
+			:rtype: list
+
+		"""
+		ops = self._ops
+		self._ops = []
+		self.results = self._driver._submitBatch(ops) if ops else []
+		return self.results
+
 #-----------------------------------------------------------------------------
 # Platform
 #
@@ -78,8 +268,63 @@ class I2CDriver(object):
 	# stubs
 	name = 'qwiic I2C abstract base class'
 
+	# Capabilities - set by each platform driver, and used by the device
+	# drivers to size their transfers.
+	#
+	# Largest data block (not counting the register byte) writeBlock() and
+	# readBlock() transfer in one transaction
+	maxWriteBlock = 32
+	maxReadBlock = 32
+
+	# Several messages can be sent as one bus transaction (batches are bundled)
+	supportsCombined = False
+
+	# A register write and the following read are joined by a repeated START
+	supportsRepeatedStart = False
+
+	# The bus clock can be changed at run time with setFrequency()
+	supportsSetFrequency = False
+
 	def __init__(self, *args, **argk):
-		pass
+
+		# Presence cache - address -> (connected, time probed)
+		self._presence = {}
+
+		# Result of the last full sweep of the bus and when it finished
+		self._scanResult = None
+		self._scanTime = 0
+
+		self._scanThread = None
+
+		# Lifetime of cached scan and presence results, in seconds
+		self.scanCacheTTL = _SCAN_CACHE_TTL
+		self.presenceCacheTTL = _PRESENCE_CACHE_TTL
+
+		# Retry and backoff policy applied to every bus operation
+		self.retryPolicy = RetryPolicy()
+
+		# Presence state of the devices - operations on a device that is
+		# down fail fast (None switches this off)
+		self.healthMonitor = HealthMonitor()
+
+		# While above zero, operations bypass the health monitor - set by a
+		# multiplexer for the traffic of its channels, which keep their own
+		self._healthPaused = 0
+
+		# Transaction statistics - created on the first enableStats()
+		self._stats = None
+		self._statsEnabled = False
+
+		# Read buffers of readStruct() and readArray(), by size
+		self._structBuffers = {}
+
+		# Scratch buffer of the platform drivers, and the memoryviews of its
+		# first n bytes handed out by _scratch(), by n
+		self._scratchBuffer = bytearray(0)
+		self._scratchViews = {}
+
+		# Async wrapper of this driver - set by getAsyncI2CDriver()
+		self._asyncDriver = None
 
 
 	# A class method is used to determine if the system is executing on the desired platform
@@ -106,6 +351,23 @@ class I2CDriver(object):
 		"""
 		pass
 
+	# snake_case names of the capabilities
+	@property
+	def max_write_block(self):
+		return self.maxWriteBlock
+
+	@property
+	def max_read_block(self):
+		return self.maxReadBlock
+
+	@property
+	def supports_combined(self):
+		return self.supportsCombined
+
+	@property
+	def supports_repeated_start(self):
+		return self.supportsRepeatedStart
+
 	#-------------------------------------------------------------------------	
 	# stubs to support Python with statements. 
 	#
@@ -117,6 +379,40 @@ class I2CDriver(object):
 	def __exit__(self, type, value, traceback):
 		pass
 
+	#-------------------------------------------------------------------------
+	# Bus identity and release - used by the driver pool in getI2CDriver()
+
+	@classmethod
+	def _busFrequency(cls, *args, **argk):
+		"""
+			Returns the bus clock asked for by the constructor arguments, or
+			None if they leave it to the driver. A pooled driver returned for
+			the same bus is set to this clock.
+
+			:return: The clock in Hz, or None
+			:rtype: int
+		"""
+		return None
+
+	@classmethod
+	def _busKey(cls, *args, **argk):
+		"""
+			Returns a hashable key naming the bus selected by the constructor
+			arguments. Platform drivers override this to fill in their defaults,
+			so equivalent arguments give the same key.
+
+			:return: The bus key
+			:rtype: tuple
+		"""
+		return (args, tuple(sorted(argk.items())))
+
+	def close(self):
+		"""
+			Releases the bus handle of this driver. Platform drivers that hold
+			an operating system or hardware resource override this.
+		"""
+		pass
+
 
 	#-------------------------------------------------------------------------		
 	# read Data Command
@@ -200,7 +496,155 @@ class I2CDriver(object):
 
 		"""
 		return None
+
+	def readBlockInto(self, address, commandCode, buf):
+		""" 
+			Called to read a block of bytes from a specific device in to a
+			caller provided buffer. The number of bytes read is the length of
+			the buffer. Platform drivers read directly in to the buffer, this
+			default implementation copies the result of readBlock().
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param buf: A writable buffer (bytearray, memoryview, array)
+
+			:return: The buffer passed in
+			:rtype: bytearray 
+
+		"""
+		data = self.readBlock(address, commandCode, len(buf))
+		for i in range(len(buf)):
+			buf[i] = data[i]
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		""" 
+			Called to read a block of bytes from a specific device in to a
+			caller provided buffer. The number of bytes read is the length of
+			the buffer.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param buf: A writable buffer (bytearray, memoryview, array)
+
+			:return: The buffer passed in
+			:rtype: bytearray 
+
+		"""
+		return self.readBlockInto(address, commandCode, buf)
 	
+	def _readBuffered(self, address, commandCode, size, decode):
+		# Reads in to a buffer kept for this size and decodes it. The buffer
+		# is taken out of the pool while in use, so a concurrent call on
+		# another thread gets its own.
+		buf = self._structBuffers.pop(size, None)
+		if buf is None:
+			buf = bytearray(size)
+		try:
+			self.readBlockInto(address, commandCode, buf)
+			return decode(buf)
+		finally:
+			self._structBuffers[size] = buf
+
+	def _scratch(self, size):
+		# Returns a memoryview of the first size bytes of the scratch buffer.
+		# The views are kept, so asking again for a size seen before
+		# allocates nothing. The platform drivers use it for the register
+		# byte, small reads and write payloads on platforms without threads -
+		# the contents only last until the next call.
+		view = self._scratchViews.get(size)
+		if view is None:
+			if size > len(self._scratchBuffer):
+				# Views of the old buffer are dropped with it
+				self._scratchBuffer = bytearray(max(size, 2 * len(self._scratchBuffer), 32))
+				self._scratchViews = {}
+			view = memoryview(self._scratchBuffer)[:size]
+			self._scratchViews[size] = view
+		return view
+
+	def _copyToScratch(self, offset, value):
+		# Copies value - a list or any buffer - in to the scratch buffer at
+		# offset and returns the end offset. MicroPython and CircuitPython
+		# only take a buffer on the right side of a bytearray slice
+		# assignment, so a list is copied item by item.
+		size = offset + len(value)
+		self._scratch(size)
+		buffer = self._scratchBuffer
+		if isinstance(value, (list, tuple)):
+			for i in range(len(value)):
+				buffer[offset + i] = value[i]
+		else:
+			buffer[offset:size] = value
+		return size
+
+	def readStruct(self, address, commandCode, fmt):
+		""" 
+			Called to read a block of bytes from a specific device and decode
+			it with a struct format. Exactly calcsize(fmt) bytes are read in to
+			a buffer reused between calls, and the compiled format is cached,
+			so repeated reads allocate nothing but the result.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param fmt: A struct format string, for example '<hhh'
+
+			:return: The decoded values
+			:rtype: tuple
+
+		"""
+		unpack, size = _compileStruct(fmt)
+		return self._readBuffered(address, commandCode, size, unpack)
+
+	def read_struct(self, address, commandCode, fmt):
+		""" 
+			Called to read a block of bytes from a specific device and decode
+			it with a struct format.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param fmt: A struct format string, for example '<hhh'
+
+			:return: The decoded values
+			:rtype: tuple
+
+		"""
+		return self.readStruct(address, commandCode, fmt)
+
+	def readArray(self, address, commandCode, typecode, count):
+		""" 
+			Called to read a run of same sized values from a specific device
+			in to an array - the vector form of readStruct() for repeated
+			fields. The values are decoded in the byte order of the host,
+			little-endian on every supported board.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param typecode: The array type code of one value, for example 'h'
+			:param count: The number of values to read
+
+			:return: The decoded values
+			:rtype: array
+
+		"""
+		size = struct.calcsize(typecode) * count
+		return self._readBuffered(address, commandCode, size, lambda buf: array.array(typecode, buf))
+
+	def read_array(self, address, commandCode, typecode, count):
+		""" 
+			Called to read a run of same sized values from a specific device
+			in to an array.
+
+			:param address: The I2C address of the device to read from
+			:param commandCode: The "command" or register to read from
+			:param typecode: The array type code of one value, for example 'h'
+			:param count: The number of values to read
+
+			:return: The decoded values
+			:rtype: array
+
+		"""
+		return self.readArray(address, commandCode, typecode, count)
+
 	#--------------------------------------------------------------------------	
 	# write Data Commands 
 	#
@@ -293,7 +737,8 @@ class I2CDriver(object):
 
 			:param address: The I2C address of the device to read from
 			:param commandCode: The "command" or register to read from
-			:param value: A list of bytes (ints) to write on the I2C bus.
+			:param value: A list of bytes (ints), or any object supporting the
+				buffer protocol (bytes, bytearray, memoryview), to write on the I2C bus.
 
 			:return: None
 
@@ -306,7 +751,8 @@ class I2CDriver(object):
 
 			:param address: The I2C address of the device to read from
 			:param commandCode: The "command" or register to read from
-			:param value: A list of bytes (ints) to write on the I2C bus.
+			:param value: A list of bytes (ints), or any object supporting the
+				buffer protocol (bytes, bytearray, memoryview), to write on the I2C bus.
 
 			:return: None
 
@@ -316,7 +762,9 @@ class I2CDriver(object):
 	def isDeviceConnected(self, devAddress):
 		"""
 			Determines if a particular device (at the provided address)
-			is connected to the bus.
+			is connected to the bus. A result younger than presenceCacheTTL
+			seconds (by default none) is answered from the cache rather than
+			probing the bus again.
 
 			:param devAddress: The I2C address of the device to check
 
@@ -324,7 +772,17 @@ class I2CDriver(object):
 			:rtype: bool
 
 		"""
-		return None
+		cached = self._presence.get(devAddress)
+		if cached is not None and _now() - cached[1] < self.presenceCacheTTL:
+			return cached[0]
+
+		isConnected = self._probeAddress(devAddress)
+		self._presence[devAddress] = (isConnected, _now())
+
+		if self.healthMonitor is not None:
+			self.healthMonitor.probed(devAddress, isConnected)
+
+		return isConnected
 
 	def is_device_connected(self, devAddress):
 		"""
@@ -337,7 +795,7 @@ class I2CDriver(object):
 			:rtype: bool
 
 		"""
-		return None
+		return self.isDeviceConnected(devAddress)
 
 	def ping(self, devAddress):
 		"""
@@ -349,15 +807,464 @@ class I2CDriver(object):
 			:return: True if the device is connected, otherwise False.
 			:rtype: bool
 
+		"""
+		return self.isDeviceConnected(devAddress)
+
+	def _probeAddress(self, devAddress):
+		"""
+			Probes the bus for a device at the provided address. Implemented by
+			the platform drivers.
+
+			:param devAddress: The I2C address of the device to check
+
+			:return: True if the device acknowledged, otherwise False.
+			:rtype: bool
+
 		"""
 		return None
 
+	#-------------------------------------------------------------------------
+	# Bus scanning
+	#
+	# Full sweeps are cached for scanCacheTTL seconds. scanKnown() probes only
+	# the addresses of the supported devices, and startBackgroundScan() runs
+	# the full sweep on a thread (where threads are available) so it is ready
+	# by the time scan() is called.
+
 	def scan(self):
 		"""
 			Used to scan the I2C bus, returning a list of I2C address attached to the computer.
+			A sweep younger than scanCacheTTL seconds is returned from the cache. If a
+			background scan is running, its result is waited for.
 
 			:return: A list of I2C addresses. If no devices are attached, an empty list is returned.
 			:rtype: list
 
 		"""
-		return None
+		thread = self._scanThread
+		if thread is not None:
+			thread.join()
+
+		if self._scanResult is not None and _now() - self._scanTime < self.scanCacheTTL:
+			return list(self._scanResult)
+
+		return list(self._sweep())
+
+	def scanKnown(self, addresses=None):
+		"""
+			Probes only the given addresses - by default the addresses of the
+			supported Qwiic devices - and returns the ones that are connected.
+
+			:param addresses: list of addresses to probe. Defaults to the known device addresses
+
+			:return: The connected addresses, in the order probed
+			:rtype: list
+
+		"""
+		if addresses is None:
+			addresses = _KNOWN_ADDRESSES
+
+		return [address for address in addresses if self.isDeviceConnected(address)]
+
+	def scan_known(self, addresses=None):
+		return self.scanKnown(addresses)
+
+	def startBackgroundScan(self):
+		"""
+			Starts a full sweep of the bus on a background thread. On platforms
+			without threads, the sweep runs before this call returns.
+
+			:return: True if the sweep is running in the background, otherwise False
+			:rtype: bool
+
+		"""
+		if self._scanThread is not None:
+			return True
+
+		try:
+			import threading
+		except ImportError:
+			self._sweep()
+			return False
+
+		def run():
+			try:
+				self._sweep()
+			finally:
+				self._scanThread = None
+
+		thread = threading.Thread(target=run)
+		thread.daemon = True
+		self._scanThread = thread
+		thread.start()
+		return True
+
+	def start_background_scan(self):
+		return self.startBackgroundScan()
+
+	def invalidateScanCache(self, devAddress=None):
+		"""
+			Drops cached scan and presence results, so the next call probes the bus.
+
+			:param devAddress: Only drop the presence result for this address.
+				If not provided, all cached results are dropped.
+
+		"""
+		if devAddress is None:
+			self._presence = {}
+		else:
+			self._presence.pop(devAddress, None)
+
+		self._scanResult = None
+
+	def invalidate_scan_cache(self, devAddress=None):
+		return self.invalidateScanCache(devAddress)
+
+	def _sweep(self):
+		# Run a full sweep and record the result, and the presence of every
+		# address it covered
+		found = self._scanBus()
+		now = _now()
+
+		for address in range(0x08, 0x78):
+			self._presence[address] = (address in found, now)
+
+		self._scanResult = found
+		self._scanTime = now
+		return found
+
+	def _scanBus(self):
+		"""
+			Sweeps the bus for connected devices. Implemented by the platform
+			drivers.
+
+			:return: A list of I2C addresses.
+			:rtype: list
+
+		"""
+		return []
+
+	#-------------------------------------------------------------------------
+	# Every bus operation of the platform drivers is run through _transact(),
+	# which applies the retry policy.
+
+	def _transact(self, isWrite, address, func, *args):
+		"""
+			Runs a bus operation under the retry policy and health monitor of
+			this driver.
+
+			:param isWrite: True if the operation is a write
+			:param address: The I2C address of the device
+			:param func: The bus operation to call
+			:param args: Arguments for func
+
+			:return: The return value of func
+		"""
+		monitor = self.healthMonitor
+		if monitor is None or self._healthPaused:
+			return self.retryPolicy.run(isWrite, address, func, *args)
+
+		return monitor.run(address, self._healthProbe, self.retryPolicy.run, isWrite, address, func, *args)
+
+	def _pauseHealth(self, pause=True):
+		# Stops (or, with pause False, restarts) health monitoring of the
+		# operations that follow. Calls nest. Wrapper drivers pass this on
+		# to the driver that runs the operations.
+		self._healthPaused += 1 if pause else -1
+
+	def _healthProbe(self, devAddress):
+		# Re-probe of a device that is down, called from inside _transact().
+		# Drivers that hold a bus lock there probe without taking it again.
+		return self._probeAddress(devAddress)
+
+	def isDeviceDown(self, devAddress):
+		"""
+			Determines if a device is marked down by the health monitor -
+			operations on it fail at once with DeviceDownError until it
+			answers a re-probe.
+
+			:param devAddress: The I2C address of the device to check
+
+			:return: True if the device is down, otherwise False.
+			:rtype: bool
+		"""
+		return self.healthMonitor is not None and self.healthMonitor.isDown(devAddress)
+
+	def is_device_down(self, devAddress):
+		return self.isDeviceDown(devAddress)
+
+	#-------------------------------------------------------------------------
+	# Bus clock
+
+	def setFrequency(self, freq):
+		"""
+			Changes the bus clock. Implemented by the platform drivers that
+			can change it at run time (supportsSetFrequency) - others keep
+			the current clock.
+
+			:param freq: The bus clock frequency in Hz
+
+			:return: True if the clock was changed, False if the bus keeps
+				its current clock
+			:rtype: bool
+		"""
+		return False
+
+	def set_frequency(self, freq):
+		return self.setFrequency(freq)
+
+	def autoTuneFrequency(self, addresses=None, save=True):
+		"""
+			Steps the bus clock up (100 kHz, 400 kHz, 1 MHz) while every device
+			still answers correctly, and leaves the bus at the fastest clock
+			they all work at. See clock_tune.
+
+			:param addresses: Addresses to tune for. Defaults to a scan of the bus
+			:param save: True to save the result, so later drivers on this bus
+				start at the tuned clock
+
+			:return: The bus clock, and a dict of address -> fastest clock of
+				that device
+			:rtype: tuple
+		"""
+		from .clock_tune import autoTune
+		return autoTune(self, addresses, save=save)
+
+	def auto_tune_frequency(self, addresses=None, save=True):
+		return self.autoTuneFrequency(addresses, save)
+
+	def _tuneKey(self):
+		# Name of this bus in the saved clock tuning results
+		return self.name
+
+	#-------------------------------------------------------------------------
+	# Register cache hints
+	#
+	# Device drivers mark the registers a register cache (RegisterCacheI2C)
+	# may serve. A driver without a cache ignores them.
+
+	def markStaticRegisters(self, address, registers):
+		"""
+			Marks registers whose value never changes - the first read can be
+			kept for good.
+
+			:param address: The I2C address of the device
+			:param registers: list of register addresses
+		"""
+		pass
+
+	def mark_static_registers(self, address, registers):
+		return self.markStaticRegisters(address, registers)
+
+	def markConfigRegisters(self, address, registers):
+		"""
+			Marks registers that only change when written by the host - reads
+			can be answered with the last value, and a write of the same value
+			skipped.
+
+			:param address: The I2C address of the device
+			:param registers: list of register addresses
+		"""
+		pass
+
+	def mark_config_registers(self, address, registers):
+		return self.markConfigRegisters(address, registers)
+
+	def invalidateRegisterCache(self, address=None, registers=None):
+		"""
+			Drops cached register values, so the next access goes to the bus
+
+			:param address: Only drop the values of this device. If not
+				provided, all values are dropped.
+			:param registers: Only drop the values of these registers
+		"""
+		pass
+
+	def invalidate_register_cache(self, address=None, registers=None):
+		return self.invalidateRegisterCache(address, registers)
+
+	#-------------------------------------------------------------------------
+	# Transaction statistics
+	#
+	# Enabling the statistics installs instrumented wrappers of the bus
+	# operations as attributes of this driver object, shadowing the class
+	# methods. Disabling removes them again - a driver without statistics
+	# runs its operations untouched.
+
+	def enableStats(self, enable=True):
+		"""
+			Starts (or stops) collecting transaction statistics
+
+			:param enable: True to collect statistics
+		"""
+		if not enable:
+			self.disableStats()
+			return
+
+		if self._statsEnabled:
+			return
+
+		if self._stats is None:
+			self._stats = TransactionStats()
+
+		cls = type(self)
+		for name in _STATS_OPS:
+			isWrite, size = _STATS_OPS[name]
+			setattr(self, name, self._instrument(getattr(cls, name), isWrite, size))
+
+		# A platform that runs batches itself bypasses the operations above
+		if cls._submitBatch is not I2CDriver._submitBatch:
+			setattr(self, "_submitBatch", self._instrumentBatch(cls._submitBatch))
+
+		self._statsEnabled = True
+
+	def enable_stats(self, enable=True):
+		return self.enableStats(enable)
+
+	def disableStats(self):
+		"""
+			Stops collecting transaction statistics. The statistics collected
+			so far are kept.
+		"""
+		if not self._statsEnabled:
+			return
+
+		for name in _STATS_OPS:
+			delattr(self, name)
+		if type(self)._submitBatch is not I2CDriver._submitBatch:
+			delattr(self, "_submitBatch")
+
+		self._statsEnabled = False
+
+	def disable_stats(self):
+		return self.disableStats()
+
+	def stats(self):
+		"""
+			Returns the transaction statistics collected since the last reset
+
+			:return: dict of (address, register) -> dict with the keys count,
+				bytesOut, bytesIn, errors, totalUs, maxUs and histogram. Entry i
+				of the histogram counts the calls that took less than 2**i
+				microseconds.
+			:rtype: dict
+		"""
+		if self._stats is None:
+			return {}
+		return self._stats.snapshot()
+
+	def resetStats(self):
+		""" Clears the transaction statistics """
+		if self._stats is not None:
+			self._stats.reset()
+
+	def reset_stats(self):
+		return self.resetStats()
+
+	def statsReport(self):
+		"""
+			Returns the transaction statistics as a text table, the most time
+			consuming register first
+
+			:return: The report
+			:rtype: str
+		"""
+		if self._stats is None:
+			return ""
+		return self._stats.report()
+
+	def stats_report(self):
+		return self.statsReport()
+
+	def _instrument(self, func, isWrite, size):
+		# Returns func (an unbound operation) wrapped to record each call
+		stats = self._stats
+
+		def instrumented(address, commandCode=None, *args):
+			n = size
+			if n is None:
+				n = args[0] if isinstance(args[0], int) else len(args[0])
+			nReg = 0 if commandCode is None else 1
+
+			start = _ticksUs()
+			try:
+				result = func(self, address, commandCode, *args)
+			except:
+				stats.record(address, commandCode, nReg, 0, _elapsedUs(start), True)
+				raise
+
+			if isWrite:
+				stats.record(address, commandCode, nReg + n, 0, _elapsedUs(start))
+			else:
+				stats.record(address, commandCode, nReg, n, _elapsedUs(start))
+			return result
+
+		return instrumented
+
+	def _instrumentBatch(self, func):
+		# Returns func (an unbound _submitBatch) wrapped to record each queued
+		# operation. The operations of a batch share its time equally.
+		stats = self._stats
+
+		def instrumented(ops):
+			start = _ticksUs()
+			error = True
+			try:
+				results = func(self, ops)
+				error = False
+				return results
+			finally:
+				share = _elapsedUs(start) // len(ops) if ops else 0
+				for code, address, commandCode, arg in ops:
+					if code == _BATCH_WRITE_BYTE:
+						stats.record(address, commandCode, 2, 0, share, error)
+					elif code == _BATCH_WRITE_BLOCK:
+						stats.record(address, commandCode, 1 + len(arg), 0, share, error)
+					else:
+						stats.record(address, commandCode, 1, arg, share, error)
+
+		return instrumented
+
+	#-------------------------------------------------------------------------
+	# Batched operations
+	#
+	# batch() returns a queue of operations that is submitted in one go. The
+	# default submit runs the queue in a tight loop, platform drivers that can
+	# bundle messages in to one bus transaction override _submitBatch().
+
+	def batch(self):
+		"""
+			Creates a batch used to queue operations and submit them together.
+
+			:return: A new, empty batch for this driver
+			:rtype: I2CBatch
+
+		"""
+		return I2CBatch(self)
+
+	def _submitBatch(self, ops):
+		"""
+			Runs the queued batch operations on the bus.
+
+			:param ops: list of queued operation tuples (code, address, commandCode, arg)
+
+			:return: The data of each read operation, in the order queued
+			:rtype: list
+
+		"""
+		results = []
+
+		writeByte = self.writeByte
+		writeBlock = self.writeBlock
+		readBlock = self.readBlock
+
+		with self:
+			for code, address, commandCode, arg in ops:
+				if code == _BATCH_WRITE_BYTE:
+					writeByte(address, commandCode, arg)
+				elif code == _BATCH_WRITE_BLOCK:
+					writeBlock(address, commandCode, arg)
+				else:
+					results.append(readBlock(address, commandCode, arg))
+
+		return results
@@ -36,14 +36,45 @@
 # SOFTWARE.
 #==================================================================================
 
-from .i2c_driver import I2CDriver
+from .i2c_driver import I2CDriver, _BATCH_WRITE_BYTE, _BATCH_WRITE_BLOCK, _compileStruct
 
+import array
 import sys
-
+import threading
 
 _PLATFORM_NAME = "Linux"
 
-_retry_count = 3
+# The kernel caps the number of messages in a single I2C_RDWR ioctl, and the
+# length of each message
+_RDWR_MAX_MSGS = 42
+_RDWR_MAX_MSG_LEN = 8192
+
+# i2c_msg flag for a read message (linux/i2c.h)
+_I2C_M_RD = 0x0001
+
+# Largest block the SMBus block read/write calls can transfer. Larger blocks
+# are sent as plain I2C messages with i2c_rdwr
+_SMBUS_BLOCK_MAX = 32
+
+# Per-bus locks, keyed by bus number and shared by every driver object on
+# that bus. Created on demand under _bus_locks_lock.
+_bus_locks = {}
+_bus_locks_lock = threading.Lock()
+
+#-----------------------------------------------------------------------------
+# Internal function to get the re-entrant lock for a bus number.
+#
+def _getBusLock(iBus):
+	with _bus_locks_lock:
+		lock = _bus_locks.get(iBus)
+		if lock is None:
+			lock = threading.RLock()
+			_bus_locks[iBus] = lock
+	return lock
+
+def _get_bus_lock(iBus):
+	return _getBusLock(iBus)
+
 #-----------------------------------------------------------------------------
 # Internal function to connect to the systems I2C bus.
 #
@@ -84,6 +115,29 @@ def _connectToI2CBus(iBus=1, *args, **argk):
 def _connect_to_i2c_bus(*args, **argk):
 	return _connectToI2CBus(*args, **argk)
 
+#-----------------------------------------------------------------------------
+# Internal function to build an `i2c_msg` that transfers directly to/from a
+# caller provided buffer, rather than the message's own ctypes buffer.
+#
+# The buffer must be writable (bytearray, memoryview of a bytearray, array)
+#
+def _bufferMsg(address, flags, buf):
+	global _i2c_msg
+	import ctypes
+
+	# Loads i2c_msg if not previously loaded
+	if _i2c_msg == None:
+		from smbus2 import i2c_msg
+		_i2c_msg = i2c_msg
+
+	# The length in bytes - len() of an array counts its items
+	nBytes = memoryview(buf).nbytes
+	cBuf = (ctypes.c_char * nBytes).from_buffer(buf)
+
+	# Note - the cast result holds a reference to cBuf, which holds buf
+	return _i2c_msg(addr=address, flags=flags, len=nBytes,
+					buf=ctypes.cast(cBuf, ctypes.POINTER(ctypes.c_char)))
+
 # notes on determining Linux platform
 #
 # - sys.platform == 'linux' or 'linux2', os.uname ->> res.sysname or res[0]=='Linux'
@@ -99,6 +153,13 @@ class LinuxI2C(I2CDriver):
 	# Constructor
 	name = _PLATFORM_NAME
 
+	# Blocks above the SMBus limit are sent as i2c_rdwr messages. A write
+	# message also carries the register byte.
+	maxWriteBlock = _RDWR_MAX_MSG_LEN - 1
+	maxReadBlock = _RDWR_MAX_MSG_LEN
+	supportsCombined = True
+	supportsRepeatedStart = True
+
 	_i2cbus = None
 	_i2c_msg = None
 
@@ -110,18 +171,41 @@ class LinuxI2C(I2CDriver):
 
 		self._iBus = iBus
 
+		# Lock shared with every other driver object on this bus
+		self._lock = _getBusLock(self._iBus)
+
 		self._i2cbus = _connectToI2CBus(self._iBus)
 
-	# Okay, are we running on a Linux system?
+	# Okay, are we running on a Linux system with smbus2 installed? If not,
+	# the /dev/i2c driver (LinuxDevI2C) is used instead
 	@classmethod
 	def isPlatform(cls):
 
-		return sys.platform in ('linux', 'linux2')
+		if sys.platform not in ('linux', 'linux2'):
+			return False
+
+		try:
+			import smbus2
+		except Exception:
+			return False
+
+		return True
 
 	@classmethod
 	def is_platform(cls):
 		return cls.isPlatform()
 
+	@classmethod
+	def _busKey(cls, iBus=1, *args, **argk):
+		return (int(iBus),)
+
+	def close(self):
+		""" Closes the SMBus connection """
+		with self._lock:
+			if self._i2cbus is not None:
+				self._i2cbus.close()
+				self._i2cbus = None
+
 #-------------------------------------------------------------------------		
 	# General get attribute method
 	#
@@ -148,72 +232,86 @@ class LinuxI2C(I2CDriver):
 		if(name != "i2cbus"):
 			super(I2CDriver, self).__setattr__(name, value)
 
+	#-------------------------------------------------------------------------
+	# Python with statement support - holds the bus lock for the whole block,
+	# so a sequence of transactions is not interleaved with another thread's.
+	#
+	def __enter__(self):
+		self._lock.acquire()
+		return self
+
+	def __exit__(self, type, value, traceback):
+		self._lock.release()
+
 #-------------------------------------------------------------------------	
 	# read Data Command
 
 	def readWord(self, address, commandCode):
-
-		data = 0
-
-		# add some error handling and recovery....
-		for i in range(_retry_count):
-			try:
-				data = self._i2cbus.read_word_data(address, commandCode)
-			
-				break # break if try succeeds
-
-			except IOError as ioErr:
-				# we had an error - let's try again
-				if i == _retry_count-1:
-					raise ioErr
-				pass
-
-		return data
+		with self._lock:
+			return self._transact(False, address, self._i2cbus.read_word_data, address, commandCode)
 
 	def read_word(self, address, commandCode):
 		return self.readWord(address, commandCode)
 
 	def readByte(self, address, commandCode = None):
-		data = 0
-		for i in range(_retry_count):
-			try:
-				if commandCode == None:
-					data = self._i2cbus.read_byte(address)
-				elif commandCode != None:
-					data = self._i2cbus.read_byte_data(address, commandCode)
-			
-				break # break if try succeeds
-
-			except IOError as ioErr:
-				# we had an error - let's try again
-				if i == _retry_count-1:
-					raise ioErr
-				pass
+		with self._lock:
+			if commandCode == None:
+				return self._transact(False, address, self._i2cbus.read_byte, address)
 
-		return data
+			return self._transact(False, address, self._i2cbus.read_byte_data, address, commandCode)
 
 	def read_byte(self, address, commandCode = None):
 		return self.readByte(address, commandCode)
 
 	def readBlock(self, address, commandCode, nBytes):
-		data = 0
-		for i in range(_retry_count):
-			try:
-				data = self._i2cbus.read_i2c_block_data(address, commandCode, nBytes)
-			
-				break # break if try succeeds
-
-			except IOError as ioErr:
-				# we had an error - let's try again
-				if i == _retry_count-1:
-					raise ioErr
-				pass
+		# SMBus block reads are capped - read larger blocks with i2c_rdwr
+		# (called through the class, so the transaction statistics count it once)
+		if nBytes > _SMBUS_BLOCK_MAX:
+			return list(LinuxI2C.readBlockInto(self, address, commandCode, bytearray(nBytes)))
 
-		return data
+		with self._lock:
+			return self._transact(False, address, self._i2cbus.read_i2c_block_data, address, commandCode, nBytes)
 
 	def read_block(self, address, commandCode, nBytes):
 		return self.readBlock(address, commandCode, nBytes)
 
+	def readBlockInto(self, address, commandCode, buf):
+		global _i2c_msg
+
+		# The read message is backed by buf, so the data lands there directly
+		read = _bufferMsg(address, _I2C_M_RD, buf)
+		write = _i2c_msg.write(address, [commandCode])
+
+		self._rdwr((write, read))
+
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# Small structs and arrays are read with the SMBus block read, as readBlock()
+	# does, and decoded from the bytes it returns - building the i2c_msg pair
+	# of readBlockInto() costs several times the read itself
+	def readStruct(self, address, commandCode, fmt):
+		unpack, size = _compileStruct(fmt)
+		if size > _SMBUS_BLOCK_MAX:
+			return I2CDriver.readStruct(self, address, commandCode, fmt)
+
+		return unpack(bytes(self.readBlock(address, commandCode, size)))
+
+	def read_struct(self, address, commandCode, fmt):
+		return self.readStruct(address, commandCode, fmt)
+
+	def readArray(self, address, commandCode, typecode, count):
+		size = array.array(typecode).itemsize * count
+		if size > _SMBUS_BLOCK_MAX:
+			return I2CDriver.readArray(self, address, commandCode, typecode, count)
+
+		return array.array(typecode, bytes(self.readBlock(address, commandCode, size)))
+
+	def read_array(self, address, commandCode, typecode, count):
+		return self.readArray(address, commandCode, typecode, count)
+
 	#--------------------------------------------------------------------------	
 	# write Data Commands 
 	#
@@ -223,47 +321,63 @@ class LinuxI2C(I2CDriver):
 	#
 
 	def writeCommand(self, address, commandCode):
-
-		return self._i2cbus.write_byte(address, commandCode)
+		with self._lock:
+			return self._transact(True, address, self._i2cbus.write_byte, address, commandCode)
 
 	def write_command(self, address, commandCode):
 		return self.writeCommand(address, commandCode)
 
 	def writeWord(self, address, commandCode, value):
-
-		return self._i2cbus.write_word_data(address, commandCode, value)
+		with self._lock:
+			return self._transact(True, address, self._i2cbus.write_word_data, address, commandCode, value)
 
 	def write_word(self, address, commandCode, value):
 		return self.writeWord(address, commandCode, value)
 
 	def writeByte(self, address, commandCode, value):
-
-		return self._i2cbus.write_byte_data(address, commandCode, value)
+		with self._lock:
+			return self._transact(True, address, self._i2cbus.write_byte_data, address, commandCode, value)
 
 	def write_byte(self, address, commandCode, value):
 		return self.writeByte(address, commandCode, value)
 
 	def writeBlock(self, address, commandCode, value):
-
-		# if value is a bytearray - convert to list of ints (it's what 
-		# required by this call)
-		tmpVal = list(value) if type(value) == bytearray else value
-		self._i2cbus.write_i2c_block_data(address, commandCode, tmpVal)
+		with self._lock:
+			# SMBus block writes are capped - write larger blocks with i2c_rdwr
+			if len(value) > _SMBUS_BLOCK_MAX:
+				global _i2c_msg
+
+				# Loads i2c_msg if not previously loaded
+				if _i2c_msg == None:
+					from smbus2 import i2c_msg
+					_i2c_msg = i2c_msg
+
+				buffer = bytearray(len(value) + 1)
+				buffer[0] = commandCode
+				buffer[1:] = value
+				self._rdwr((_i2c_msg.write(address, buffer),))
+				return
+
+			# write_i2c_block_data copies value in to the ioctl buffer with a slice
+			# assignment, which takes a list or any buffer (bytes, bytearray,
+			# memoryview) - no conversion is needed
+			self._transact(True, address, self._i2cbus.write_i2c_block_data, address, commandCode, value)
 
 	def write_block(self, address, commandCode, value):
 		return self.writeBlock(address, commandCode, value)
 
-	def isDeviceConnected(self, devAddress):
-		isConnected = False
-		try:
-			# Try to write nothing to the device
-			# If it throws an I/O error - the device isn't connected
-			self._i2cbus.write_quick(devAddress)
-			isConnected = True
-		except:
-			pass
+	def _probeAddress(self, devAddress):
+		with self._lock:
+			isConnected = False
+			try:
+				# Try to write nothing to the device
+				# If it throws an I/O error - the device isn't connected
+				self._i2cbus.write_quick(devAddress)
+				isConnected = True
+			except:
+				pass
 		
-		return isConnected
+			return isConnected
 
 	def is_device_connected(self, devAddress):
 		return self.isDeviceConnected(devAddress)
@@ -272,16 +386,16 @@ class LinuxI2C(I2CDriver):
 		return self.isDeviceConnected(devAddress)
 
 	#-----------------------------------------------------------------------
-	# scan()
+	# _scanBus()
 	#
 	# Scans the I2C bus and returns a list of addresses that have a devices connected
 	#
-	def scan(self):
+	def _scanBus(self):
 		""" Returns a list of addresses for the devices connected to the I2C bus."""
 		foundDevices = []
 		# Loop over the list of legal addresses (0x08 - 0x77)
 		for currAddress in range(0x08, 0x78):
-			if self.ping(currAddress) == True:
+			if self._probeAddress(currAddress) == True:
 				foundDevices.append(currAddress)
 		return foundDevices
 
@@ -310,18 +424,75 @@ class LinuxI2C(I2CDriver):
 		read = _i2c_msg.read(address, read_nbytes)
 
 		# Read Register
-		for i in range(_retry_count):
-			try:
-				self._i2cbus.i2c_rdwr(write, read)
-			
-				break # break if try succeeds
-
-			except IOError as ioErr:
-				# we had an error - let's try again
-				if i == _retry_count-1:
-					raise ioErr
-				pass
+		self._rdwr((write, read))
 		
 		# Return read transaction (list)
 		# Note - To retreive values, list the return: list(read)
 		return read
+
+	#-----------------------------------------------------------------------
+	# Batched operations
+	#
+	# The queued operations are converted to `i2c_msg` objects and sent with
+	# as few `i2c_rdwr` calls (ioctls) as possible. A read is a register write
+	# message followed by a read message - the pair is never split across
+	# two ioctls.
+	#
+	def _submitBatch(self, ops):
+		global _i2c_msg
+
+		# Loads i2c_msg if not previously loaded
+		if _i2c_msg == None:
+			from smbus2 import i2c_msg
+			_i2c_msg = i2c_msg
+
+		# Build the message groups - one group per queued operation
+		groups = []
+		reads = []
+		for code, address, commandCode, arg in ops:
+			if code == _BATCH_WRITE_BYTE:
+				groups.append((_i2c_msg.write(address, [commandCode, arg]),))
+			elif code == _BATCH_WRITE_BLOCK:
+				groups.append((_i2c_msg.write(address, [commandCode] + list(arg)),))
+			else:
+				read = _i2c_msg.read(address, arg)
+				groups.append((_i2c_msg.write(address, [commandCode]), read))
+				reads.append(read)
+
+		# Pack the groups in to as few ioctls as the kernel allows - _rdwr()
+		# splits them further where the device changes. The bus lock is held
+		# across all of them, so the batch is not interleaved with another
+		# thread's transactions
+		with self._lock:
+			msgs = []
+			for group in groups:
+				if len(msgs) + len(group) > _RDWR_MAX_MSGS:
+					self._rdwr(msgs)
+					msgs = []
+				msgs.extend(group)
+			if msgs:
+				self._rdwr(msgs)
+
+		return [list(read) for read in reads]
+
+	def _rdwr(self, msgs):
+		# The retry policy and health monitor work per device, so each run of
+		# messages to one device is its own ioctl - a retry never resends
+		# writes to another device, and a failure is charged to the device
+		# that failed. A message list containing a read is retried on the
+		# read budget.
+		with self._lock:
+			iStart = 0
+			for i in range(1, len(msgs) + 1):
+				if i < len(msgs) and msgs[i].addr == msgs[iStart].addr:
+					continue
+
+				run = msgs[iStart:i]
+				iStart = i
+
+				isWrite = True
+				for msg in run:
+					if msg.flags & _I2C_M_RD:
+						isWrite = False
+
+				self._transact(isWrite, run[0].addr, self._i2cbus.i2c_rdwr, *run)
@@ -67,13 +67,24 @@ class MicroPythonI2C(I2CDriver):
 
 	# Constructor
 	name = _PLATFORM_NAME
+
+	# writeto_mem and readfrom_mem have no block limit of their own
+	maxWriteBlock = 0xFFFF
+	maxReadBlock = 0xFFFF
+	supportsRepeatedStart = True
+	supportsSetFrequency = True
 	_i2cbus = None
 
-	def __init__(self, sda=18, scl=19, freq=100000, *args, **argk):
+	def __init__(self, sda=18, scl=19, freq=None, *args, **argk):
 		I2CDriver.__init__(self) # init super
 
 		self._sda = sda
 		self._scl = scl
+
+		# Start at the clock saved by autoTuneFrequency(), if there is one
+		if freq is None:
+			from .clock_tune import savedFrequency
+			freq = savedFrequency(self._tuneKey()) or 100000
 		self._freq = freq
 
 		self._i2cbus = _connectToI2CBus(sda=self._sda, scl=self._scl, freq=self._freq)
@@ -89,6 +100,44 @@ class MicroPythonI2C(I2CDriver):
 	def is_platform(cls):
 		return cls.isPlatform()
 
+	@classmethod
+	def _busKey(cls, sda=18, scl=19, *args, **argk):
+		# One clock per pin pair - the frequency does not make another bus
+		return (sda, scl)
+
+	@classmethod
+	def _busFrequency(cls, sda=18, scl=19, freq=None, *args, **argk):
+		return freq
+
+	def _tuneKey(self):
+		return "%s %s/%s" % (self.name, self._sda, self._scl)
+
+	def setFrequency(self, freq):
+		"""
+			Changes the bus clock
+
+			:param freq: The bus clock frequency in Hz
+
+			:return: True if the clock was changed, False if the bus could
+				not be set up at the new clock and keeps the old one
+			:rtype: bool
+		"""
+		# The new bus object is only swapped in once it is set up
+		i2cbus = _connectToI2CBus(sda=self._sda, scl=self._scl, freq=freq)
+		if i2cbus is None:
+			return False
+
+		self._freq = freq
+		self._i2cbus = i2cbus
+		return True
+
+	def getFrequency(self):
+		""" Returns the bus clock frequency in Hz """
+		return self._freq
+
+	def get_frequency(self):
+		return self.getFrequency()
+
 #-------------------------------------------------------------------------		
 	# General get attribute method
 	#
@@ -116,56 +165,82 @@ class MicroPythonI2C(I2CDriver):
 			super(I2CDriver, self).__setattr__(name, value)
 
 	# read commands ----------------------------------------------------------
+	#
+	# Words and bytes are read in to the scratch buffer and decoded, so they
+	# allocate nothing.
 	def readWord(self, address, commandCode):
-		buffer = self._i2cbus.readfrom_mem(address, commandCode, 2)
+		buffer = self._scratch(2)
+		self._transact(False, address, self._i2cbus.readfrom_mem_into, address, commandCode, buffer)
 		return (buffer[1] << 8 ) | buffer[0]
 
 	def read_word(self, address, commandCode):
 		return self.readWord(address, commandCode)
 
 	def readByte(self, address, commandCode):
-		return self._i2cbus.readfrom_mem(address, commandCode, 1)[0]
+		buffer = self._scratch(1)
+		self._transact(False, address, self._i2cbus.readfrom_mem_into, address, commandCode, buffer)
+		return buffer[0]
 
 	def read_byte(self, address, commandCode = None):
 		return self.readByte(address, commandCode)
 
 	def readBlock(self, address, commandCode, nBytes):
-		return self._i2cbus.readfrom_mem(address, commandCode, nBytes)
+		return self._transact(False, address, self._i2cbus.readfrom_mem, address, commandCode, nBytes)
 
 	def read_block(self, address, commandCode, nBytes):
 		return self.readBlock(address, commandCode, nBytes)
 
+	def readBlockInto(self, address, commandCode, buf):
+		self._transact(False, address, self._i2cbus.readfrom_mem_into, address, commandCode, buf)
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
 	# write commands----------------------------------------------------------
+	#
+	# writeto_mem sends the register byte and the data from separate buffers.
+	# Data given as numbers is put in the scratch buffer first.
 	def writeCommand(self, address, commandCode):
-		self._i2cbus.writeto(address, commandCode.to_bytes(1, 'little'))
+		buffer = self._scratch(1)
+		buffer[0] = commandCode
+		self._transact(True, address, self._i2cbus.writeto, address, buffer)
 
 	def write_command(self, address, commandCode):
 		return self.writeCommand(address, commandCode)
 
 	def writeWord(self, address, commandCode, value):
-		self._i2cbus.writeto_mem(address, commandCode, value.to_bytes(2, 'little'))
+		buffer = self._scratch(2)
+		buffer[0] = value & 0xFF
+		buffer[1] = (value >> 8) & 0xFF
+		self._transact(True, address, self._i2cbus.writeto_mem, address, commandCode, buffer)
 
 	def write_word(self, address, commandCode, value):
 		return self.writeWord(address, commandCode, value)
 
 	def writeByte(self, address, commandCode, value):
-		self._i2cbus.writeto_mem(address, commandCode, value.to_bytes(1, 'little'))
+		buffer = self._scratch(1)
+		buffer[0] = value
+		self._transact(True, address, self._i2cbus.writeto_mem, address, commandCode, buffer)
 
 	def write_byte(self, address, commandCode, value):
 		return self.writeByte(address, commandCode, value)
 
 	def writeBlock(self, address, commandCode, value):
-		self._i2cbus.writeto_mem(address, commandCode, bytes(value))
+		# writeto_mem takes any buffer - only a list needs copying
+		if isinstance(value, list):
+			value = self._scratch(self._copyToScratch(0, value))
+		self._transact(True, address, self._i2cbus.writeto_mem, address, commandCode, value)
 
 	def write_block(self, address, commandCode, value):
 		return self.writeBlock(address, commandCode, value)
 
-	def isDeviceConnected(self, devAddress):
+	def _probeAddress(self, devAddress):
 		isConnected = False
 		try:
 			# Try to write nothing to the device
 			# If it throws an I/O error - the device isn't connected
-			self._i2cbus.writeto(devAddress, bytearray())
+			self._i2cbus.writeto(devAddress, b"")
 			isConnected = True
 		except:
 			pass
@@ -179,6 +254,6 @@ class MicroPythonI2C(I2CDriver):
 		return self.isDeviceConnected(devAddress)
 
 	# scan -------------------------------------------------------------------
-	def scan(self):
+	def _scanBus(self):
 		""" Returns a list of addresses for the devices connected to the I2C bus."""
 		return self._i2cbus.scan()
@@ -0,0 +1,304 @@
+#-----------------------------------------------------------------------------
+# mux_i2c.py
+#
+# TCA9548A I2C multiplexer support
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+mux_i2c
+=======
+Support for the TCA9548A eight channel I2C multiplexer (the SparkFun Qwiic
+Mux), so several devices with the same fixed address - OTOS boards at 0x17,
+OLEDs at 0x3C/0x3D - can share one bus.
+
+Each downstream channel is an I2C driver of its own. The mux remembers which
+channel is selected and only writes its control register when a transaction
+targets a different channel, so polling the devices of one channel costs no
+more than it does without a mux.
+
+Devices on the upstream bus stay visible on every channel, and a scan of a
+channel lists them too (the mux itself is left out).
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.mux_i2c import TCA9548A
+	>>> mux = TCA9548A(qwiic_i2c.getI2CDriver())
+	>>> left = QwiicOTOS(i2c_driver=mux.channel(0))
+	>>> right = QwiicOTOS(i2c_driver=mux.channel(1))
+"""
+
+from .i2c_driver import I2CDriver
+
+try:
+	import _thread
+	_allocateLock = _thread.allocate_lock
+except ImportError:
+	_allocateLock = None
+
+_PLATFORM_NAME = "TCA9548A Channel"
+
+# Default address of the mux (0x70 - 0x77 with the address jumpers)
+TCA9548A_ADDRESS = 0x70
+
+# Number of downstream channels
+TCA9548A_CHANNELS = 8
+
+class TCA9548A(object):
+	"""
+	TCA9548A
+
+		A TCA9548A multiplexer on an I2C bus.
+
+		:param driver: The I2C driver of the upstream bus
+		:param address: The I2C address of the mux
+	"""
+
+	def __init__(self, driver, address=TCA9548A_ADDRESS):
+
+		self._driver = driver
+		self.address = address
+
+		# Control register value last written, None when unknown
+		self._selected = None
+
+		# Held from the channel select to the end of the transaction, so
+		# another thread cannot switch the channel in between
+		self._lock = _allocateLock() if _allocateLock is not None else None
+
+		# Channel number -> MuxChannelI2C, created on first use
+		self._channels = {}
+
+		# Number of channel switches written, and of switches skipped because
+		# the channel was already selected
+		self.switches = 0
+		self.hits = 0
+
+	@property
+	def driver(self):
+		""" The driver of the upstream bus """
+		return self._driver
+
+	@property
+	def selected(self):
+		""" The control register value last written, or None if unknown """
+		return self._selected
+
+	def channel(self, channel):
+		"""
+			Returns the I2C driver of a downstream channel
+
+			:param channel: The channel number, 0 - 7
+
+			:return: The channel driver. Every call for the same channel
+				returns the same object.
+			:rtype: MuxChannelI2C
+		"""
+		if channel < 0 or channel >= TCA9548A_CHANNELS:
+			raise ValueError("TCA9548A channel must be 0 - %d, not %s" % (TCA9548A_CHANNELS - 1, channel))
+
+		driver = self._channels.get(channel)
+		if driver is None:
+			driver = MuxChannelI2C(self, channel)
+			self._channels[channel] = driver
+		return driver
+
+	def invalidate(self):
+		"""
+			Forgets the selected channel - call after anything else has
+			written the mux (or it was reset), so the next transaction
+			selects its channel again
+		"""
+		self._selected = None
+
+	def disable(self):
+		""" Deselects every channel """
+		with self._driver:
+			self._acquire()
+			try:
+				self._select(0)
+			finally:
+				self._release()
+
+	def _acquire(self):
+		if self._lock is not None:
+			self._lock.acquire()
+
+	def _release(self):
+		if self._lock is not None:
+			self._lock.release()
+
+	def _select(self, mask):
+		# Writes the control register unless it already holds mask. Called
+		# with the lock held.
+		if self._selected == mask:
+			self.hits += 1
+			return
+
+		# The state of the mux is unknown until the write succeeds
+		self._selected = None
+		self._driver.writeCommand(self.address, mask)
+		self._selected = mask
+		self.switches += 1
+
+	def _run(self, mask, func, *args):
+		# Runs one upstream call with the channel selected.
+		#
+		# Devices on different channels can share an address, so the channel
+		# drivers keep the health state of their devices. The upstream
+		# monitor is paused for the call (the channel select itself stays
+		# monitored), with the upstream bus held so direct traffic from
+		# other threads is not let through unmonitored. The bus is taken
+		# before the mux lock, the same order as a with block on the
+		# upstream driver around channel calls.
+		with self._driver:
+			self._acquire()
+			try:
+				self._select(mask)
+				self._driver._pauseHealth()
+				try:
+					return func(*args)
+				finally:
+					self._driver._pauseHealth(False)
+			finally:
+				self._release()
+
+class MuxChannelI2C(I2CDriver):
+	"""
+	MuxChannelI2C
+
+		One downstream channel of a TCA9548A. Every operation selects the
+		channel (when not already selected) and then runs on the upstream
+		driver.
+
+		:param mux: The TCA9548A object
+		:param channel: The channel number, 0 - 7
+	"""
+
+	name = _PLATFORM_NAME
+
+	def __init__(self, mux, channel):
+		I2CDriver.__init__(self)
+
+		self._mux = mux
+		self._channel = channel
+		self._mask = 1 << channel
+
+		# Same capabilities as the upstream driver
+		driver = mux.driver
+		self.maxWriteBlock = driver.maxWriteBlock
+		self.maxReadBlock = driver.maxReadBlock
+		self.supportsCombined = driver.supportsCombined
+		self.supportsRepeatedStart = driver.supportsRepeatedStart
+
+	@classmethod
+	def isPlatform(cls):
+		return False
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	@property
+	def mux(self):
+		""" The TCA9548A this channel belongs to """
+		return self._mux
+
+	@property
+	def channel(self):
+		""" The channel number """
+		return self._channel
+
+	def _run(self, address, func, *args):
+		# The channel keeps the presence state of its devices - the same
+		# address on another channel is another device
+		monitor = self.healthMonitor
+		if monitor is None or self._healthPaused:
+			return self._mux._run(self._mask, func, *args)
+		return monitor.run(address, self._probeAddress, self._mux._run, self._mask, func, *args)
+
+	# read commands ----------------------------------------------------------
+	def readWord(self, address, commandCode):
+		return self._run(address, self._mux.driver.readWord, address, commandCode)
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		return self._run(address, self._mux.driver.readByte, address, commandCode)
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		return self._run(address, self._mux.driver.readBlock, address, commandCode, nBytes)
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		return self._run(address, self._mux.driver.readBlockInto, address, commandCode, buf)
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# write commands----------------------------------------------------------
+	def writeCommand(self, address, commandCode):
+		return self._run(address, self._mux.driver.writeCommand, address, commandCode)
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		return self._run(address, self._mux.driver.writeWord, address, commandCode, value)
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		return self._run(address, self._mux.driver.writeByte, address, commandCode, value)
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		return self._run(address, self._mux.driver.writeBlock, address, commandCode, value)
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _submitBatch(self, ops):
+		# The whole batch runs with the channel selected once
+		return self._mux._run(self._mask, self._mux.driver._submitBatch, ops)
+
+	def _probeAddress(self, devAddress):
+		return self._mux._run(self._mask, self._mux.driver._probeAddress, devAddress)
+
+	def _scanBus(self):
+		found = self._mux._run(self._mask, self._mux.driver._scanBus)
+		return [address for address in found if address != self._mux.address]
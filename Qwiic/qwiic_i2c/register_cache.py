@@ -0,0 +1,297 @@
+#-----------------------------------------------------------------------------
+# register_cache.py
+#
+# Write-through register cache for I2C drivers
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+register_cache
+==============
+An opt-in register cache in front of an I2C driver.
+
+The device drivers mark the registers that can be cached:
+
+	- static registers never change (product ID, versions). The first read
+	  is kept and every later read is answered from the cache.
+	- config registers only change when written by the host (scalars, modes,
+	  brightness). The last value written or read is kept; reads are answered
+	  from the cache, and a write of the value already held is skipped.
+
+All other registers pass straight through. Marking registers on a driver that
+is not wrapped has no effect, so the device drivers mark them unconditionally.
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.register_cache import RegisterCacheI2C
+	>>> i2c = RegisterCacheI2C(qwiic_i2c.getI2CDriver())
+	>>> stick = QwiicLEDStick(i2c_driver=i2c)
+	>>> stick.set_all_LED_brightness(8)		# written
+	>>> stick.set_all_LED_brightness(8)		# skipped - no change
+"""
+
+from .i2c_driver import I2CDriver, _BATCH_WRITE_BYTE, _BATCH_WRITE_BLOCK
+
+_PLATFORM_NAME = "Register Cache"
+
+# Kinds of cached register
+_STATIC = 1
+_CONFIG = 2
+
+class RegisterCacheI2C(I2CDriver):
+	"""
+	RegisterCacheI2C
+
+		Passes every operation to another I2C driver, answering reads of the
+		marked registers from a cache and skipping writes that do not change a
+		config register.
+
+		:param driver: The I2C driver to cache
+	"""
+
+	name = _PLATFORM_NAME
+
+	def __init__(self, driver):
+		I2CDriver.__init__(self)
+
+		self._driver = driver
+
+		# Same capabilities as the wrapped driver
+		self.maxWriteBlock = driver.maxWriteBlock
+		self.maxReadBlock = driver.maxReadBlock
+		self.supportsCombined = driver.supportsCombined
+		self.supportsRepeatedStart = driver.supportsRepeatedStart
+
+		# (address, register) -> _STATIC or _CONFIG
+		self._kinds = {}
+
+		# (address, register) -> bytes of the last value read or written
+		self._values = {}
+
+		# Number of reads answered and writes skipped by the cache
+		self.hits = 0
+
+	@classmethod
+	def isPlatform(cls):
+		return False
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	@property
+	def driver(self):
+		""" The cached I2C driver """
+		return self._driver
+
+	def __enter__(self):
+		self._driver.__enter__()
+		return self
+
+	def __exit__(self, type, value, traceback):
+		return self._driver.__exit__(type, value, traceback)
+
+	def _pauseHealth(self, pause=True):
+		self._driver._pauseHealth(pause)
+
+	def close(self):
+		self._driver.close()
+
+	#-------------------------------------------------------------------------
+	# Register marking and invalidation
+
+	def markStaticRegisters(self, address, registers):
+		for register in registers:
+			self._kinds[(address, register)] = _STATIC
+
+	def markConfigRegisters(self, address, registers):
+		for register in registers:
+			self._kinds[(address, register)] = _CONFIG
+
+	def invalidateRegisterCache(self, address=None, registers=None):
+		if address is None:
+			self._values = {}
+		elif registers is None:
+			for key in list(self._values):
+				if key[0] == address:
+					del self._values[key]
+		else:
+			for register in registers:
+				self._values.pop((address, register), None)
+
+	#-------------------------------------------------------------------------
+	# Cache lookups
+
+	def _cached(self, address, commandCode, nBytes):
+		# Returns the cached bytes of a register, or None
+		if commandCode is None:
+			return None
+
+		data = self._values.get((address, commandCode))
+		if data is None or len(data) < nBytes:
+			return None
+
+		self.hits += 1
+		return data
+
+	def _store(self, address, commandCode, data):
+		key = (address, commandCode)
+		if key in self._kinds:
+			self._values[key] = data
+
+	def _unchanged(self, address, commandCode, data):
+		# True if the write can be skipped. Otherwise the new value is kept.
+		key = (address, commandCode)
+		if self._kinds.get(key) != _CONFIG:
+			return False
+
+		if self._values.get(key) == data:
+			self.hits += 1
+			return True
+
+		self._values[key] = data
+		return False
+
+	# read commands ----------------------------------------------------------
+	def readWord(self, address, commandCode):
+		data = self._cached(address, commandCode, 2)
+		if data is not None:
+			return (data[1] << 8) | data[0]
+
+		value = self._driver.readWord(address, commandCode)
+		self._store(address, commandCode, bytes([value & 0xFF, (value >> 8) & 0xFF]))
+		return value
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		data = self._cached(address, commandCode, 1)
+		if data is not None:
+			return data[0]
+
+		value = self._driver.readByte(address, commandCode)
+		if commandCode is not None:
+			self._store(address, commandCode, bytes([value]))
+		return value
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		data = self._cached(address, commandCode, nBytes)
+		if data is not None:
+			return list(data[:nBytes])
+
+		data = self._driver.readBlock(address, commandCode, nBytes)
+		self._store(address, commandCode, bytes(data))
+		return data
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		data = self._cached(address, commandCode, len(buf))
+		if data is not None:
+			buf[:] = data[:len(buf)]
+			return buf
+
+		self._driver.readBlockInto(address, commandCode, buf)
+		self._store(address, commandCode, bytes(buf))
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# write commands----------------------------------------------------------
+	def writeCommand(self, address, commandCode):
+		return self._driver.writeCommand(address, commandCode)
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		if self._unchanged(address, commandCode, bytes([value & 0xFF, (value >> 8) & 0xFF])):
+			return None
+		return self._write(self._driver.writeWord, address, commandCode, value)
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		if self._unchanged(address, commandCode, bytes([value & 0xFF])):
+			return None
+		return self._write(self._driver.writeByte, address, commandCode, value)
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		if self._unchanged(address, commandCode, bytes(value)):
+			return None
+		return self._write(self._driver.writeBlock, address, commandCode, value)
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _write(self, func, address, commandCode, value):
+		# A failed write leaves the register in an unknown state
+		try:
+			return func(address, commandCode, value)
+		except:
+			self._values.pop((address, commandCode), None)
+			raise
+
+	def _submitBatch(self, ops):
+		# Unchanged config writes are dropped from the batch before it is sent
+		sent = []
+		for op in ops:
+			code, address, commandCode, arg = op
+			if code == _BATCH_WRITE_BYTE:
+				if self._unchanged(address, commandCode, bytes([arg & 0xFF])):
+					continue
+			elif code == _BATCH_WRITE_BLOCK:
+				if self._unchanged(address, commandCode, bytes(arg)):
+					continue
+			sent.append(op)
+
+		if not sent:
+			return []
+
+		try:
+			return self._driver._submitBatch(sent)
+		except:
+			for code, address, commandCode, arg in sent:
+				self._values.pop((address, commandCode), None)
+			raise
+
+	def _probeAddress(self, devAddress):
+		return self._driver._probeAddress(devAddress)
+
+	def _scanBus(self):
+		return self._driver._scanBus()
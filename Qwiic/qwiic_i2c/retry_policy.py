@@ -0,0 +1,158 @@
+#-----------------------------------------------------------------------------
+# retry_policy.py
+#
+# Retry and backoff policy for I2C operations
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+retry_policy
+============
+The retry policy used by every I2C driver. A failed operation is retried after
+an exponentially growing, jittered delay, with separate attempt budgets for
+reads and writes. Failures are counted per device address.
+
+Each driver has its own policy object, replaceable through the driver's
+retryPolicy attribute.
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.retry_policy import RetryPolicy
+	>>> i2c = qwiic_i2c.getI2CDriver()
+	>>> i2c.retryPolicy = RetryPolicy(readAttempts=5, baseDelay=0.002)
+"""
+
+import time
+
+try:
+	import random
+except ImportError:
+	random = None
+
+class RetryPolicy(object):
+	"""
+	RetryPolicy
+
+		Retry with exponential backoff and jitter.
+
+		:param readAttempts: Total attempts for a read (1 means no retry)
+		:param writeAttempts: Total attempts for a write. Note - a retried write
+			may reach the device twice if the failure happened after the data
+			was accepted.
+		:param baseDelay: Delay before the first retry, in seconds. Each
+			following retry doubles it.
+		:param maxDelay: Upper bound of the delay, in seconds
+		:param jitter: Fraction (0 - 1) of each delay that is randomised
+		:param retryOn: Exception type(s) that are retried - bus errors raise OSError
+	"""
+
+	def __init__(self, readAttempts=3, writeAttempts=2, baseDelay=0.001, maxDelay=0.02,
+				 jitter=0.5, retryOn=OSError):
+		self.readAttempts = readAttempts
+		self.writeAttempts = writeAttempts
+		self.baseDelay = baseDelay
+		self.maxDelay = maxDelay
+		self.jitter = jitter
+		self.retryOn = retryOn
+
+		# address -> number of failed attempts
+		self.failures = {}
+
+	def delay(self, attempt):
+		"""
+			Returns the delay before retry number attempt (0 is the first retry)
+
+			:return: Delay in seconds
+			:rtype: float
+		"""
+		delay = min(self.maxDelay, self.baseDelay * (1 << attempt))
+
+		if self.jitter and random is not None:
+			try:
+				fraction = random.random()
+			except AttributeError:
+				# Minimal MicroPython ports only have getrandbits()
+				fraction = random.getrandbits(16) / 65536.0
+			delay *= 1.0 - self.jitter * fraction
+
+		return delay
+
+	def run(self, isWrite, address, func, *args):
+		"""
+			Calls func(*args), retrying on failure as set by this policy.
+
+			:param isWrite: True if the operation is a write
+			:param address: The I2C address of the device, for the failure counters
+			:param func: The bus operation to call
+			:param args: Arguments for func
+
+			:return: The return value of func
+		"""
+		attempts = self.writeAttempts if isWrite else self.readAttempts
+
+		attempt = 0
+		while True:
+			try:
+				return func(*args)
+			except self.retryOn:
+				self.failures[address] = self.failures.get(address, 0) + 1
+
+				attempt += 1
+				if attempt >= attempts:
+					raise
+
+			time.sleep(self.delay(attempt - 1))
+
+	def failureCount(self, address):
+		"""
+			Returns the number of failed attempts for a device
+
+			:param address: The I2C address of the device
+
+			:return: Number of failed attempts
+			:rtype: int
+		"""
+		return self.failures.get(address, 0)
+
+	def failure_count(self, address):
+		return self.failureCount(address)
+
+	def resetFailures(self, address=None):
+		"""
+			Resets the failure counters
+
+			:param address: Only reset the counter for this address. If not
+				provided, all counters are reset.
+		"""
+		if address is None:
+			self.failures = {}
+		else:
+			self.failures.pop(address, None)
+
+	def reset_failures(self, address=None):
+		return self.resetFailures(address)
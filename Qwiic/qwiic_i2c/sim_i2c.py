@@ -0,0 +1,774 @@
+#-----------------------------------------------------------------------------
+# sim_i2c.py
+#
+# Simulated I2C bus with register level models of the supported Qwiic devices
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+sim_i2c
+=======
+A simulated I2C bus for running and profiling the qwiic device drivers without
+any hardware attached. The bus hosts register-map models of the OTOS, the
+SSD1306 OLED, the LED Stick, the Person Sensor and the TCA9548A mux, and
+charges every transaction the time it would take on the wire at the configured
+bus frequency.
+
+The simulated driver is selected by getI2CDriver() when the environment
+variable QWIIC_I2C_SIMULATED is set, or after calling SimulatedI2C.enable().
+
+:example:
+
+	>>> from Qwiic.qwiic_i2c.sim_i2c import SimulatedI2C
+	>>> i2c = SimulatedI2C(freq=100000)
+	>>> oled = QwiicOledDisplay(i2c_driver=i2c)
+	>>> oled.display()
+	>>> print(i2c.i2cbus.busTime)
+"""
+
+from .i2c_driver import I2CDriver
+
+import sys
+import errno
+import time
+
+_PLATFORM_NAME = "Simulated"
+
+# Environment variable used to select the simulated bus in getI2CDriver()
+_SIM_ENV_VAR = "QWIIC_I2C_SIMULATED"
+
+#-----------------------------------------------------------------------------
+# Bus timing model
+#
+# Every byte on the wire is 8 data bits plus an ACK bit. A transaction starts
+# with a START and the address byte, ends with a STOP, and a combined
+# write-then-read adds a repeated START and a second address byte.
+#
+class SimBusTiming(object):
+	"""
+	SimBusTiming
+
+		Computes the time a transaction occupies the bus at a given frequency.
+
+		:param freq: The bus clock frequency in Hz
+		:param overhead: Fixed per-transaction host overhead in seconds
+	"""
+	def __init__(self, freq=100000, overhead=0.0):
+		self.freq = freq
+		self.overhead = overhead
+
+	def transferTime(self, nWrite, nRead=0):
+		"""
+			Returns the time, in seconds, for a transaction on the bus.
+
+			:param nWrite: Number of bytes written after the address byte
+			:param nRead: Number of bytes read back after a repeated start
+
+			:return: Transaction time in seconds
+			:rtype: float
+		"""
+		# START + address + data + STOP
+		nBits = 1 + 9 * (1 + nWrite) + 1
+		if nRead > 0:
+			# repeated START + address + data
+			nBits += 1 + 9 * (1 + nRead)
+
+		return self.overhead + float(nBits) / self.freq
+
+	def transfer_time(self, nWrite, nRead=0):
+		return self.transferTime(nWrite, nRead)
+
+#-----------------------------------------------------------------------------
+# Device models
+#
+# A device model sees the raw traffic addressed to it: a write of a register
+# pointer followed by data, or a read from a register pointer. The base model
+# is a 256 byte register file with pointer auto-increment.
+#
+class SimDevice(object):
+	"""
+	SimDevice
+
+		Base register-map model of a device on the simulated bus.
+
+		:param address: The I2C address the device responds to
+	"""
+	name = "Simulated device"
+
+	# Fastest bus clock the device works at - above it, it stops answering
+	maxFreq = 1000000
+
+	def __init__(self, address):
+		self.address = address
+		self.regs = bytearray(256)
+
+	def write(self, reg, data):
+		""" Handles a write of data starting at register reg """
+		for i in range(len(data)):
+			self.regs[(reg + i) & 0xFF] = data[i]
+
+	def read(self, reg, nBytes):
+		""" Handles a read of nBytes starting at register reg """
+		return bytes(self.regs[(reg + i) & 0xFF] for i in range(nBytes))
+
+	def downstream(self, address):
+		""" Returns the device at address behind this one (a mux), or None """
+		return None
+
+	def downstreamAddresses(self):
+		""" Returns the addresses of the devices reachable behind this one """
+		return []
+
+	def _setInt16(self, reg, value):
+		value = int(value) & 0xFFFF
+		self.regs[reg] = value & 0xFF
+		self.regs[reg + 1] = (value >> 8) & 0xFF
+
+class SimOTOS(SimDevice):
+	"""
+	SimOTOS
+
+		Model of the SparkFun Optical Tracking Odometry Sensor. Self-test and
+		IMU calibration complete immediately, and tracking reset zeroes the
+		position registers. Pose registers can be driven with setPose().
+	"""
+	name = "Qwiic OTOS"
+
+	kRegProductId = 0x00
+	kRegHwVersion = 0x01
+	kRegFwVersion = 0x02
+	kRegImuCalib = 0x06
+	kRegReset = 0x07
+	kRegSelfTest = 0x0F
+	kRegPosXL = 0x20
+	kRegVelXL = 0x26
+	kRegAccXL = 0x2C
+
+	def __init__(self, address=0x17):
+		SimDevice.__init__(self, address)
+		self.regs[self.kRegProductId] = 0x5F
+		self.regs[self.kRegHwVersion] = 0x10
+		self.regs[self.kRegFwVersion] = 0x10
+
+	def write(self, reg, data):
+		SimDevice.write(self, reg, data)
+
+		if reg == self.kRegSelfTest and len(data) > 0 and data[0] & 0x01:
+			# Done, passed
+			self.regs[self.kRegSelfTest] = 0x04
+		elif reg == self.kRegImuCalib:
+			# Calibration finishes instantly
+			self.regs[self.kRegImuCalib] = 0x00
+		elif reg == self.kRegReset and len(data) > 0 and data[0] & 0x01:
+			for i in range(self.kRegPosXL, self.kRegAccXL + 6):
+				self.regs[i] = 0
+			self.regs[self.kRegReset] = 0x00
+
+	def setPose(self, pos=(0, 0, 0), vel=(0, 0, 0), acc=(0, 0, 0)):
+		""" Sets the raw int16 position, velocity and acceleration registers """
+		for base, values in ((self.kRegPosXL, pos), (self.kRegVelXL, vel), (self.kRegAccXL, acc)):
+			for i in range(3):
+				self._setInt16(base + 2 * i, values[i])
+
+	def set_pose(self, pos=(0, 0, 0), vel=(0, 0, 0), acc=(0, 0, 0)):
+		return self.setPose(pos, vel, acc)
+
+class SimSSD1306(SimDevice):
+	"""
+	SimSSD1306
+
+		Model of the SSD1306 OLED controller. The first byte of every write is
+		the control byte (0x00 command stream, 0x40 data stream). Commands are
+		decoded far enough to track the page/column pointers, and data bytes
+		land in the 128x64 GDRAM.
+	"""
+	name = "SSD1306 OLED"
+
+	# The SSD1306 I2C interface is rated for fast mode (400 kHz)
+	maxFreq = 400000
+
+	# number of argument bytes taken by each multi-byte command
+	_COMMAND_ARGS = {
+		0x20: 1, 0x21: 2, 0x22: 2, 0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5,
+		0x81: 1, 0x8D: 1, 0xA3: 2, 0xA8: 1, 0xD3: 1, 0xD5: 1, 0xD9: 1,
+		0xDA: 1, 0xDB: 1
+	}
+
+	def __init__(self, address=0x3C, width=128, pages=8):
+		SimDevice.__init__(self, address)
+		self.width = width
+		self.pages = pages
+		self.gdram = bytearray(width * pages)
+
+		self.displayOn = False
+		self.memoryMode = 0x02	# page addressing
+		self.colStart = 0
+		self.colEnd = width - 1
+		self.pageStart = 0
+		self.pageEnd = pages - 1
+		self.column = 0
+		self.page = 0
+
+		self._command = None
+		self._args = []
+
+	def write(self, reg, data):
+		if reg & 0x40:
+			for value in data:
+				self._data(value)
+		else:
+			for value in data:
+				self._commandByte(value)
+
+	def read(self, reg, nBytes):
+		# Reads return the status byte - bit 6 is set when the display is off
+		status = 0x00 if self.displayOn else 0x40
+		return bytes([status] * nBytes)
+
+	def _commandByte(self, value):
+		if self._command is not None:
+			self._args.append(value)
+			if len(self._args) == self._COMMAND_ARGS[self._command]:
+				self._execute(self._command, self._args)
+				self._command = None
+				self._args = []
+			return
+
+		if value in self._COMMAND_ARGS:
+			self._command = value
+			self._args = []
+		else:
+			self._execute(value, [])
+
+	def _execute(self, cmd, args):
+		if cmd == 0xAE:
+			self.displayOn = False
+		elif cmd == 0xAF:
+			self.displayOn = True
+		elif cmd == 0x20:
+			self.memoryMode = args[0] & 0x03
+		elif cmd == 0x21:
+			self.colStart = args[0] % self.width
+			self.colEnd = args[1] % self.width
+			self.column = self.colStart
+		elif cmd == 0x22:
+			self.pageStart = args[0] % self.pages
+			self.pageEnd = args[1] % self.pages
+			self.page = self.pageStart
+		elif 0xB0 <= cmd <= 0xB7:
+			self.page = (cmd & 0x07) % self.pages
+		elif cmd <= 0x0F:
+			self.column = (self.column & 0xF0) | cmd
+		elif cmd <= 0x1F:
+			self.column = ((cmd & 0x0F) << 4) | (self.column & 0x0F)
+
+	def _data(self, value):
+		self.gdram[self.page * self.width + (self.column % self.width)] = value
+
+		if self.column < self.colEnd:
+			self.column += 1
+			return
+
+		self.column = self.colStart
+		if self.memoryMode == 0x00:
+			# horizontal addressing wraps on to the next page
+			self.page = self.pageStart if self.page >= self.pageEnd else self.page + 1
+
+class SimLEDStick(SimDevice):
+	"""
+	SimLEDStick
+
+		Model of the Qwiic LED Stick (ATtiny85 + APA102C). Commands are decoded
+		in to per-LED red, green, blue and brightness arrays.
+	"""
+	name = "Qwiic LED Stick"
+
+	COMMAND_CHANGE_ADDRESS = 0xC7
+	COMMAND_CHANGE_LED_LENGTH = 0x70
+	COMMAND_WRITE_SINGLE_LED_COLOR = 0x71
+	COMMAND_WRITE_ALL_LED_COLOR = 0x72
+	COMMAND_WRITE_RED_ARRAY = 0x73
+	COMMAND_WRITE_GREEN_ARRAY = 0x74
+	COMMAND_WRITE_BLUE_ARRAY = 0x75
+	COMMAND_WRITE_SINGLE_LED_BRIGHTNESS = 0x76
+	COMMAND_WRITE_ALL_LED_BRIGHTNESS = 0x77
+	COMMAND_WRITE_ALL_LED_OFF = 0x78
+
+	def __init__(self, address=0x23, length=10):
+		SimDevice.__init__(self, address)
+		self._setLength(length)
+
+	def _setLength(self, length):
+		self.length = length
+		self.red = [0] * length
+		self.green = [0] * length
+		self.blue = [0] * length
+		self.brightness = [31] * length
+
+	def write(self, cmd, data):
+		data = list(data)
+
+		if cmd == self.COMMAND_CHANGE_ADDRESS and len(data) == 1:
+			self.address = data[0]
+		elif cmd == self.COMMAND_CHANGE_LED_LENGTH and len(data) == 1:
+			self._setLength(data[0])
+		elif cmd == self.COMMAND_WRITE_SINGLE_LED_COLOR and len(data) == 4:
+			i = data[0] - 1
+			if 0 <= i < self.length:
+				self.red[i], self.green[i], self.blue[i] = data[1], data[2], data[3]
+		elif cmd == self.COMMAND_WRITE_ALL_LED_COLOR and len(data) == 3:
+			self.red = [data[0]] * self.length
+			self.green = [data[1]] * self.length
+			self.blue = [data[2]] * self.length
+		elif cmd in (self.COMMAND_WRITE_RED_ARRAY, self.COMMAND_WRITE_GREEN_ARRAY, self.COMMAND_WRITE_BLUE_ARRAY) and len(data) >= 2:
+			target = {self.COMMAND_WRITE_RED_ARRAY: self.red,
+					  self.COMMAND_WRITE_GREEN_ARRAY: self.green,
+					  self.COMMAND_WRITE_BLUE_ARRAY: self.blue}[cmd]
+			count, offset = data[0], data[1]
+			for i in range(min(count, len(data) - 2)):
+				if offset + i < self.length:
+					target[offset + i] = data[2 + i]
+		elif cmd == self.COMMAND_WRITE_SINGLE_LED_BRIGHTNESS and len(data) == 2:
+			i = data[0] - 1
+			if 0 <= i < self.length:
+				self.brightness[i] = data[1]
+		elif cmd == self.COMMAND_WRITE_ALL_LED_BRIGHTNESS and len(data) == 1:
+			self.brightness = [data[0]] * self.length
+		elif cmd == self.COMMAND_WRITE_ALL_LED_OFF:
+			self.red = [0] * self.length
+			self.green = [0] * self.length
+			self.blue = [0] * self.length
+
+	def read(self, reg, nBytes):
+		# The LED Stick has no readable registers
+		return bytes(nBytes)
+
+class SimPersonSensor(SimDevice):
+	"""
+	SimPersonSensor
+
+		Model of the Useful Sensors Person Sensor. Every read returns the
+		current result packet, regardless of the register pointer. Faces are
+		set with setFaces().
+	"""
+	name = "Qwiic Person Sensor"
+
+	_FACE_MAX = 4
+	_FACE_BYTES = 8
+	_RESULT_BYTES = 4 + 1 + _FACE_MAX * _FACE_BYTES + 2
+
+	def __init__(self, address=0x62):
+		SimDevice.__init__(self, address)
+		self.faces = []
+
+	def setFaces(self, faces):
+		"""
+			Sets the faces reported by the sensor
+
+			:param faces: list of tuples - (box_confidence, box_left, box_top,
+				box_right, box_bottom, id_confidence, id, is_facing)
+		"""
+		self.faces = list(faces)[:self._FACE_MAX]
+
+	def set_faces(self, faces):
+		return self.setFaces(faces)
+
+	def _result(self):
+		packet = bytearray(self._RESULT_BYTES)
+		payload = self._RESULT_BYTES - 4
+		packet[2] = payload & 0xFF
+		packet[3] = (payload >> 8) & 0xFF
+		packet[4] = len(self.faces)
+		for i, face in enumerate(self.faces):
+			offset = 5 + i * self._FACE_BYTES
+			for j in range(self._FACE_BYTES):
+				packet[offset + j] = face[j] & 0xFF
+		return packet
+
+	def read(self, reg, nBytes):
+		packet = self._result()
+		return bytes(packet[i] if i < len(packet) else 0 for i in range(nBytes))
+
+class SimTCA9548A(SimDevice):
+	"""
+	SimTCA9548A
+
+		Model of the TCA9548A eight channel multiplexer. Writing a byte sets
+		the channel mask, and the devices on the selected channels answer on
+		the bus as if attached to it. Counts the channel writes in switches.
+
+		:param address: The I2C address of the mux
+		:param channels: dict of channel number -> list of SimDevice objects
+	"""
+	name = "Simulated TCA9548A"
+
+	maxFreq = 400000
+
+	def __init__(self, address=0x70, channels=None):
+		SimDevice.__init__(self, address)
+		self.mask = 0
+		self.switches = 0
+		self.channels = {}
+		for channel in range(8):
+			self.channels[channel] = {}
+		if channels is not None:
+			for channel in channels:
+				for device in channels[channel]:
+					self.attach(channel, device)
+
+	def attach(self, channel, device):
+		""" Attach a device model to a channel """
+		self.channels[channel][device.address] = device
+
+	def write(self, reg, data):
+		# The control register is the only register - the first byte written
+		self.mask = reg
+		self.switches += 1
+
+	def read(self, reg, nBytes):
+		return bytes([self.mask] * nBytes)
+
+	def downstream(self, address):
+		for channel in range(8):
+			if self.mask & (1 << channel):
+				device = self.channels[channel].get(address)
+				if device is not None:
+					return device
+		return None
+
+	def downstreamAddresses(self):
+		found = []
+		for channel in range(8):
+			if self.mask & (1 << channel):
+				found.extend(self.channels[channel].keys())
+		return found
+
+#-----------------------------------------------------------------------------
+# The simulated bus object - plays the role of the smbus/busio/machine.I2C
+# object held by the other platform drivers.
+#
+class SimBus(object):
+	"""
+	SimBus
+
+		A set of device models and a timing model. Each transaction advances the
+		simulated bus clock (busTime) by the time it would take on the wire.
+
+		:param freq: The bus clock frequency in Hz
+		:param devices: list of SimDevice objects attached to the bus
+		:param realtime: If True, each transaction also sleeps for its bus time
+	"""
+	def __init__(self, freq=100000, devices=None, realtime=False):
+		self.timing = SimBusTiming(freq)
+		self.realtime = realtime
+		self.devices = {}
+		for device in (devices if devices is not None else defaultDevices()):
+			self.attach(device)
+		self.resetCounters()
+
+	def attach(self, device):
+		""" Attach a device model to the bus """
+		self.devices[device.address] = device
+
+	def detach(self, address):
+		""" Remove the device at address from the bus """
+		self.devices.pop(address, None)
+
+	def resetCounters(self):
+		""" Resets the bus time and transaction counters """
+		self.busTime = 0.0
+		self.transactions = 0
+		self.bytesWritten = 0
+		self.bytesRead = 0
+
+	def _device(self, address):
+		device = self.devices.get(address)
+		if device is None:
+			# Devices behind a mux answer when their channel is selected
+			for mux in list(self.devices.values()):
+				device = mux.downstream(address)
+				if device is not None:
+					break
+		if device is None or self.timing.freq > device.maxFreq:
+			raise OSError(errno.EIO, "No ACK from device at address 0x%02X" % address)
+		return device
+
+	def _account(self, nWrite, nRead=0):
+		t = self.timing.transferTime(nWrite, nRead)
+		self.busTime += t
+		self.transactions += 1
+		self.bytesWritten += nWrite
+		self.bytesRead += nRead
+		if self.realtime:
+			time.sleep(t)
+
+	def _rekey(self, address, device):
+		# some devices (LED Stick) can change address on command
+		if device.address != address and self.devices.get(address) is device:
+			self.devices.pop(address, None)
+			self.devices[device.address] = device
+
+	def writeto(self, address, data):
+		""" Plain write. An empty write is an address probe """
+		device = self._device(address)
+		self._account(len(data))
+		if len(data) > 0:
+			device.write(data[0], bytes(data[1:]))
+			self._rekey(address, device)
+
+	def writeto_mem(self, address, reg, data):
+		""" Write of data starting at register reg """
+		device = self._device(address)
+		self._account(1 + len(data))
+		device.write(reg, bytes(data))
+		self._rekey(address, device)
+
+	def readfrom(self, address, nBytes):
+		""" Plain read without a register pointer write """
+		device = self._device(address)
+		self._account(0, nBytes)
+		return device.read(0, nBytes)
+
+	def readfrom_mem(self, address, reg, nBytes):
+		""" Combined register pointer write and read """
+		device = self._device(address)
+		self._account(1, nBytes)
+		return device.read(reg, nBytes)
+
+	def readfrom_mem_into(self, address, reg, buf):
+		""" Combined register pointer write and read in to buf """
+		data = self.readfrom_mem(address, reg, len(buf))
+		for i in range(len(buf)):
+			buf[i] = data[i]
+
+	def scan(self):
+		""" Returns the sorted addresses of the attached devices """
+		self._account(0)
+		found = set(self.devices.keys())
+		for device in list(self.devices.values()):
+			found.update(device.downstreamAddresses())
+		return sorted(found)
+
+def defaultDevices():
+	"""
+		Returns a new set of device models at their default addresses
+
+		:return: OTOS (0x17), OLED (0x3C), LED Stick (0x23) and Person Sensor (0x62)
+		:rtype: list
+	"""
+	return [SimOTOS(0x17), SimSSD1306(0x3C), SimLEDStick(0x23), SimPersonSensor(0x62)]
+
+def default_devices():
+	return defaultDevices()
+
+class SimulatedI2C(I2CDriver):
+	"""
+	SimulatedI2C
+
+		I2C driver backed by a SimBus. Accepts (and ignores) the bus arguments of
+		the other platform drivers, so it can be dropped in for any of them.
+
+		:param freq: The simulated bus clock frequency in Hz
+		:param devices: list of SimDevice models. Defaults to defaultDevices()
+		:param realtime: If True, transactions sleep for their simulated bus time
+	"""
+
+	# Constructor
+	name = _PLATFORM_NAME
+
+	# The simulated bus has no block limit
+	maxWriteBlock = 0xFFFF
+	maxReadBlock = 0xFFFF
+	supportsRepeatedStart = True
+	supportsSetFrequency = True
+
+	_i2cbus = None
+
+	# Set by enable() to select this driver without the environment variable
+	_enabled = False
+
+	def __init__(self, freq=100000, devices=None, realtime=False, *args, **argk):
+		I2CDriver.__init__(self)
+
+		self._freq = freq
+
+		self._i2cbus = SimBus(freq=freq, devices=devices, realtime=realtime)
+
+	# Selected when explicitly enabled or requested by the environment
+	@classmethod
+	def isPlatform(cls):
+		if cls._enabled:
+			return True
+		try:
+			import os
+			return os.environ.get(_SIM_ENV_VAR, "") not in ("", "0")
+		except:
+			return False
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	@classmethod
+	def _busKey(cls, freq=100000, devices=None, realtime=False, *args, **argk):
+		# A caller provided device list makes a bus of its own
+		return (freq, None if devices is None else id(devices), realtime)
+
+	def setFrequency(self, freq):
+		"""
+			Changes the simulated bus clock
+
+			:param freq: The bus clock frequency in Hz
+
+			:return: True
+			:rtype: bool
+		"""
+		self._freq = freq
+		self._i2cbus.timing.freq = freq
+		return True
+
+	def getFrequency(self):
+		""" Returns the bus clock frequency in Hz """
+		return self._freq
+
+	def get_frequency(self):
+		return self.getFrequency()
+
+	@classmethod
+	def enable(cls, enabled=True):
+		"""
+			Select (or de-select) the simulated bus in getI2CDriver()
+
+			:param enabled: True to select the simulated driver
+		"""
+		cls._enabled = enabled
+
+	@classmethod
+	def disable(cls):
+		cls.enable(False)
+
+#-------------------------------------------------------------------------
+	# General get attribute method
+	#
+	# Used to intercept getting the I2C bus object - so we can perform a lazy
+	# connect ....
+	#
+	def __getattr__(self, name):
+
+		if(name == "i2cbus"):
+			return self._i2cbus
+
+		else:
+			# Note - we call __getattribute__ to the super class (object).
+			return super(I2CDriver, self).__getattribute__(name)
+
+	#-------------------------------------------------------------------------
+	# General set attribute method
+	#
+	# Basically implemented to make the i2cbus attribute readonly to users
+	# of this class.
+	#
+	def __setattr__(self, name, value):
+
+		if(name != "i2cbus"):
+			super(I2CDriver, self).__setattr__(name, value)
+
+	# read commands ----------------------------------------------------------
+	def readWord(self, address, commandCode):
+		buffer = self._transact(False, address, self._i2cbus.readfrom_mem, address, commandCode, 2)
+		return (buffer[1] << 8 ) | buffer[0]
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		if commandCode == None:
+			return self._transact(False, address, self._i2cbus.readfrom, address, 1)[0]
+		return self._transact(False, address, self._i2cbus.readfrom_mem, address, commandCode, 1)[0]
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		return list(self._transact(False, address, self._i2cbus.readfrom_mem, address, commandCode, nBytes))
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		self._transact(False, address, self._i2cbus.readfrom_mem_into, address, commandCode, buf)
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# write commands----------------------------------------------------------
+	def writeCommand(self, address, commandCode):
+		self._transact(True, address, self._i2cbus.writeto, address, bytes([commandCode]))
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		self._transact(True, address, self._i2cbus.writeto_mem, address, commandCode, bytes([value & 0xFF, (value >> 8) & 0xFF]))
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		self._transact(True, address, self._i2cbus.writeto_mem, address, commandCode, bytes([value & 0xFF]))
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		self._transact(True, address, self._i2cbus.writeto_mem, address, commandCode, bytes(value))
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _probeAddress(self, devAddress):
+		isConnected = False
+		try:
+			# Try to write nothing to the device
+			# If it throws an I/O error - the device isn't connected
+			self._i2cbus.writeto(devAddress, bytearray())
+			isConnected = True
+		except:
+			pass
+
+		return isConnected
+
+	def is_device_connected(self, devAddress):
+		return self.isDeviceConnected(devAddress)
+
+	def ping(self, devAddress):
+		return self.isDeviceConnected(devAddress)
+
+	# scan -------------------------------------------------------------------
+	def _scanBus(self):
+		""" Returns a list of addresses for the devices connected to the I2C bus."""
+		return self._i2cbus.scan()
@@ -0,0 +1,516 @@
+#-----------------------------------------------------------------------------
+# trace_i2c.py
+#
+# Transaction trace recorder and replay driver
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+trace_i2c
+=========
+Records the I2C transactions of a running system to a compact binary file, and
+replays a recorded file through the I2CDriver interface.
+
+TraceRecorderI2C wraps any I2C driver and writes one record per operation -
+time, address, register, operation and the bytes written or read. ReplayI2C
+loads a trace and answers the reads with the recorded data, at full speed, so
+a field capture can be used to profile the device drivers and the control
+code on a workstation. Failed operations are recorded too, and fail again on
+replay.
+
+:example:
+
+	>>> # On the robot
+	>>> from Qwiic.qwiic_i2c.trace_i2c import TraceRecorderI2C
+	>>> i2c = TraceRecorderI2C(qwiic_i2c.getI2CDriver(), "otos.trace")
+	>>> otos = QwiicOTOS(i2c_driver=i2c)
+	>>> ...
+	>>> i2c.close()
+
+	>>> # On the workstation
+	>>> from Qwiic.qwiic_i2c.trace_i2c import ReplayI2C
+	>>> otos = QwiicOTOS(i2c_driver=ReplayI2C("otos.trace"))
+"""
+
+from .i2c_driver import I2CDriver, _BATCH_WRITE_BYTE, _BATCH_WRITE_BLOCK
+from .transaction_stats import _ticksUs, _elapsedUs
+
+import errno
+import struct
+
+try:
+	import _thread
+	_allocateLock = _thread.allocate_lock
+except ImportError:
+	_allocateLock = None
+
+_RECORDER_NAME = "Trace Recorder"
+_REPLAY_NAME = "Trace Replay"
+
+#-----------------------------------------------------------------------------
+# File format
+#
+# The file starts with _TRACE_MAGIC, followed by the records. Each record is
+# a _RECORD header - time in microseconds since the recording started,
+# operation, flags, address, register, payload length - and the payload: the
+# bytes read for a read, the data bytes written for a write, and a single
+# 0/1 byte for a probe.
+#
+_TRACE_MAGIC = b"QI2CTRC\x01"
+
+_RECORD = "<QBBBBH"
+_RECORD_SIZE = struct.calcsize(_RECORD)
+
+# Operations
+_OP_READ_BYTE = 0
+_OP_READ_WORD = 1
+_OP_READ_BLOCK = 2
+_OP_WRITE_COMMAND = 3
+_OP_WRITE_WORD = 4
+_OP_WRITE_BYTE = 5
+_OP_WRITE_BLOCK = 6
+_OP_PROBE = 7
+
+_READ_OPS = (_OP_READ_BYTE, _OP_READ_WORD, _OP_READ_BLOCK)
+
+# Flags
+_FLAG_NO_REGISTER = 0x01
+_FLAG_ERROR = 0x02
+
+#-----------------------------------------------------------------------------
+# TraceRecorderI2C
+#
+class TraceRecorderI2C(I2CDriver):
+	"""
+	TraceRecorderI2C
+
+		Passes every operation to another I2C driver and records it to a
+		trace file.
+
+		:param driver: The I2C driver to record
+		:param path: Name of the trace file to write
+	"""
+
+	name = _RECORDER_NAME
+
+	def __init__(self, driver, path):
+		I2CDriver.__init__(self)
+
+		self._driver = driver
+
+		# Same capabilities as the wrapped driver
+		self.maxWriteBlock = driver.maxWriteBlock
+		self.maxReadBlock = driver.maxReadBlock
+		self.supportsCombined = driver.supportsCombined
+		self.supportsRepeatedStart = driver.supportsRepeatedStart
+		self._file = open(path, "wb")
+		self._file.write(_TRACE_MAGIC)
+		self._start = _ticksUs()
+
+		# Each record is written whole under this lock, so records of
+		# threads sharing the recorder do not interleave
+		self._lock = _allocateLock() if _allocateLock is not None else None
+
+	@classmethod
+	def isPlatform(cls):
+		return False
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	@property
+	def driver(self):
+		""" The recorded I2C driver """
+		return self._driver
+
+	def close(self):
+		""" Flushes and closes the trace file """
+		if self._file is not None:
+			self._file.close()
+			self._file = None
+
+	def _record(self, op, address, commandCode, payload, error=False):
+		flags = 0
+		if commandCode is None:
+			flags |= _FLAG_NO_REGISTER
+			commandCode = 0
+		if error:
+			flags |= _FLAG_ERROR
+			payload = b""
+
+		record = struct.pack(_RECORD, _elapsedUs(self._start), op, flags,
+						address, commandCode, len(payload)) + payload
+
+		if self._lock is None:
+			self._file.write(record)
+			return
+
+		with self._lock:
+			self._file.write(record)
+
+	def _call(self, op, address, commandCode, func, *args):
+		# Runs func on the wrapped driver, recording a failure before raising
+		try:
+			return func(*args)
+		except:
+			self._record(op, address, commandCode, b"", True)
+			raise
+
+	def __enter__(self):
+		self._driver.__enter__()
+		return self
+
+	def __exit__(self, type, value, traceback):
+		return self._driver.__exit__(type, value, traceback)
+
+	def _pauseHealth(self, pause=True):
+		self._driver._pauseHealth(pause)
+
+	# read commands ----------------------------------------------------------
+	def readWord(self, address, commandCode):
+		value = self._call(_OP_READ_WORD, address, commandCode,
+						self._driver.readWord, address, commandCode)
+		self._record(_OP_READ_WORD, address, commandCode, bytes([value & 0xFF, (value >> 8) & 0xFF]))
+		return value
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		value = self._call(_OP_READ_BYTE, address, commandCode,
+						self._driver.readByte, address, commandCode)
+		self._record(_OP_READ_BYTE, address, commandCode, bytes([value]))
+		return value
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		data = self._call(_OP_READ_BLOCK, address, commandCode,
+						self._driver.readBlock, address, commandCode, nBytes)
+		self._record(_OP_READ_BLOCK, address, commandCode, bytes(data))
+		return data
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		self._call(_OP_READ_BLOCK, address, commandCode,
+						self._driver.readBlockInto, address, commandCode, buf)
+		self._record(_OP_READ_BLOCK, address, commandCode, bytes(buf))
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# write commands----------------------------------------------------------
+	def writeCommand(self, address, commandCode):
+		self._call(_OP_WRITE_COMMAND, address, commandCode,
+						self._driver.writeCommand, address, commandCode)
+		self._record(_OP_WRITE_COMMAND, address, commandCode, b"")
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		self._call(_OP_WRITE_WORD, address, commandCode,
+						self._driver.writeWord, address, commandCode, value)
+		self._record(_OP_WRITE_WORD, address, commandCode, bytes([value & 0xFF, (value >> 8) & 0xFF]))
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		self._call(_OP_WRITE_BYTE, address, commandCode,
+						self._driver.writeByte, address, commandCode, value)
+		self._record(_OP_WRITE_BYTE, address, commandCode, bytes([value & 0xFF]))
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		self._call(_OP_WRITE_BLOCK, address, commandCode,
+						self._driver.writeBlock, address, commandCode, value)
+		self._record(_OP_WRITE_BLOCK, address, commandCode, bytes(value))
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _submitBatch(self, ops):
+		# The wrapped driver runs the batch its own way, the queued
+		# operations are recorded afterwards. Which operation of a failed
+		# batch failed is not known, so all of them are recorded as failed.
+		try:
+			results = self._driver._submitBatch(ops)
+		except:
+			for code, address, commandCode, arg in ops:
+				if code == _BATCH_WRITE_BYTE:
+					self._record(_OP_WRITE_BYTE, address, commandCode, b"", True)
+				elif code == _BATCH_WRITE_BLOCK:
+					self._record(_OP_WRITE_BLOCK, address, commandCode, b"", True)
+				else:
+					self._record(_OP_READ_BLOCK, address, commandCode, b"", True)
+			raise
+
+		reads = iter(results)
+		for code, address, commandCode, arg in ops:
+			if code == _BATCH_WRITE_BYTE:
+				self._record(_OP_WRITE_BYTE, address, commandCode, bytes([arg & 0xFF]))
+			elif code == _BATCH_WRITE_BLOCK:
+				self._record(_OP_WRITE_BLOCK, address, commandCode, bytes(arg))
+			else:
+				self._record(_OP_READ_BLOCK, address, commandCode, bytes(next(reads)))
+
+		return results
+
+	def _probeAddress(self, devAddress):
+		isConnected = self._driver._probeAddress(devAddress)
+		self._record(_OP_PROBE, devAddress, None, bytes([1 if isConnected else 0]))
+		return isConnected
+
+	def _scanBus(self):
+		return self._driver._scanBus()
+
+#-----------------------------------------------------------------------------
+# ReplayI2C
+#
+class ReplayI2C(I2CDriver):
+	"""
+	ReplayI2C
+
+		I2C driver that answers reads with the data of a recorded trace.
+
+		Reads are served in the recorded order of each (address, register),
+		so the replayed code may interleave its devices differently from the
+		recording. Writes are accepted and not checked. With strict set, the
+		operations must instead follow the trace exactly, one record at a
+		time, and a mismatch raises ValueError.
+
+		:param path: Name of the trace file to replay
+		:param strict: True to require the recorded order of operations
+		:param loop: True to start a (address, register) over from its first
+			record when its records run out, instead of raising EOFError
+	"""
+
+	name = _REPLAY_NAME
+
+	def __init__(self, path, strict=False, loop=False):
+		I2CDriver.__init__(self)
+
+		self._strict = strict
+		self._loop = loop
+
+		self._records = _loadTrace(path)
+		self._position = 0
+
+		# (address, register) -> [indexes of the read records, next position]
+		self._reads = {}
+		# address -> result of the last recorded probe
+		self._probes = {}
+
+		for index, (timeUs, op, flags, address, register, payload) in enumerate(self._records):
+			if op in _READ_OPS:
+				key = (address, register)
+				if key not in self._reads:
+					self._reads[key] = [[], 0]
+				self._reads[key][0].append(index)
+			elif op == _OP_PROBE and address not in self._probes:
+				self._probes[address] = payload[0] == 1
+
+	@classmethod
+	def isPlatform(cls):
+		return False
+
+	@classmethod
+	def is_platform(cls):
+		return cls.isPlatform()
+
+	@property
+	def records(self):
+		""" The records of the trace - (time us, op, flags, address, register, payload) """
+		return self._records
+
+	def rewind(self):
+		""" Starts the replay over from the beginning of the trace """
+		self._position = 0
+		for key in self._reads:
+			self._reads[key][1] = 0
+
+	def _next(self, op, address, commandCode):
+		# Returns the record answering this operation
+		register = 0 if commandCode is None else commandCode
+
+		if self._strict:
+			# Probes are skipped - their results are cached by the drivers,
+			# so they do not repeat in step with the trace
+			record = None
+			wrapped = False
+			while record is None or record[1] == _OP_PROBE:
+				if self._position >= len(self._records):
+					if not self._loop or wrapped:
+						raise EOFError("End of the I2C trace")
+					self._position = 0
+					wrapped = True
+				record = self._records[self._position]
+				self._position += 1
+
+			if record[1] != op or record[3] != address or record[4] != register:
+				raise ValueError("I2C trace mismatch at record %d: expected op %d at 0x%02X/0x%02X"
+								% (self._position - 1, record[1], record[3], record[4]))
+		else:
+			if op not in _READ_OPS:
+				return None
+
+			reads = self._reads.get((address, register))
+			if reads is None:
+				raise EOFError("No records for 0x%02X/0x%02X in the I2C trace" % (address, register))
+			if reads[1] >= len(reads[0]):
+				if not self._loop:
+					raise EOFError("End of the I2C trace for 0x%02X/0x%02X" % (address, register))
+				reads[1] = 0
+			record = self._records[reads[0][reads[1]]]
+			reads[1] += 1
+
+		if record[2] & _FLAG_ERROR:
+			raise OSError(errno.EIO, "Recorded I2C error")
+
+		return record
+
+	# read commands ----------------------------------------------------------
+	def readWord(self, address, commandCode):
+		payload = self._next(_OP_READ_WORD, address, commandCode)[5]
+		return (payload[1] << 8) | payload[0]
+
+	def read_word(self, address, commandCode):
+		return self.readWord(address, commandCode)
+
+	def readByte(self, address, commandCode = None):
+		return self._next(_OP_READ_BYTE, address, commandCode)[5][0]
+
+	def read_byte(self, address, commandCode = None):
+		return self.readByte(address, commandCode)
+
+	def readBlock(self, address, commandCode, nBytes):
+		payload = self._next(_OP_READ_BLOCK, address, commandCode)[5]
+		data = list(payload[:nBytes])
+		if len(data) < nBytes:
+			data.extend([0] * (nBytes - len(data)))
+		return data
+
+	def read_block(self, address, commandCode, nBytes):
+		return self.readBlock(address, commandCode, nBytes)
+
+	def readBlockInto(self, address, commandCode, buf):
+		payload = self._next(_OP_READ_BLOCK, address, commandCode)[5]
+		n = min(len(buf), len(payload))
+		buf[:n] = payload[:n]
+		return buf
+
+	def read_block_into(self, address, commandCode, buf):
+		return self.readBlockInto(address, commandCode, buf)
+
+	# write commands----------------------------------------------------------
+	def writeCommand(self, address, commandCode):
+		self._next(_OP_WRITE_COMMAND, address, commandCode)
+
+	def write_command(self, address, commandCode):
+		return self.writeCommand(address, commandCode)
+
+	def writeWord(self, address, commandCode, value):
+		self._next(_OP_WRITE_WORD, address, commandCode)
+
+	def write_word(self, address, commandCode, value):
+		return self.writeWord(address, commandCode, value)
+
+	def writeByte(self, address, commandCode, value):
+		self._next(_OP_WRITE_BYTE, address, commandCode)
+
+	def write_byte(self, address, commandCode, value):
+		return self.writeByte(address, commandCode, value)
+
+	def writeBlock(self, address, commandCode, value):
+		self._next(_OP_WRITE_BLOCK, address, commandCode)
+
+	def write_block(self, address, commandCode, value):
+		return self.writeBlock(address, commandCode, value)
+
+	def _submitBatch(self, ops):
+		# Every operation of the batch takes its record, also after a
+		# recorded failure, so a failed batch leaves the replay in step
+		results = []
+		error = None
+		for code, address, commandCode, arg in ops:
+			try:
+				if code == _BATCH_WRITE_BYTE:
+					self.writeByte(address, commandCode, arg)
+				elif code == _BATCH_WRITE_BLOCK:
+					self.writeBlock(address, commandCode, arg)
+				else:
+					results.append(self.readBlock(address, commandCode, arg))
+			except OSError as e:
+				if error is None:
+					error = e
+
+		if error is not None:
+			raise error
+		return results
+
+	def _probeAddress(self, devAddress):
+		if devAddress in self._probes:
+			return self._probes[devAddress]
+		return devAddress in self._scanBus()
+
+	def _scanBus(self):
+		""" Returns the addresses that answered in the trace """
+		found = set()
+		for timeUs, op, flags, address, register, payload in self._records:
+			if flags & _FLAG_ERROR:
+				continue
+			if op != _OP_PROBE or payload[0] == 1:
+				found.add(address)
+		return sorted(found)
+
+#-----------------------------------------------------------------------------
+# Loads the records of a trace file
+def _loadTrace(path):
+	with open(path, "rb") as f:
+		data = f.read()
+
+	if data[:len(_TRACE_MAGIC)] != _TRACE_MAGIC:
+		raise ValueError("Not an I2C trace file: %s" % path)
+
+	records = []
+	offset = len(_TRACE_MAGIC)
+	while offset + _RECORD_SIZE <= len(data):
+		timeUs, op, flags, address, register, length = struct.unpack_from(_RECORD, data, offset)
+		offset += _RECORD_SIZE
+		records.append((timeUs, op, flags, address, register, bytes(data[offset:offset + length])))
+		offset += length
+
+	return records
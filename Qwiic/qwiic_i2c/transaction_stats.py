@@ -0,0 +1,174 @@
+#-----------------------------------------------------------------------------
+# transaction_stats.py
+#
+# Per device/register statistics of I2C transactions
+#------------------------------------------------------------------------
+#
+# More information on qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#
+#==================================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#==================================================================================
+
+"""
+transaction_stats
+=================
+Statistics of the I2C transactions of a driver, kept per (address, register):
+call count, bytes written and read, errors, total and longest time, and a
+latency histogram with power of two buckets.
+
+Collection is switched on per driver with enableStats(). While disabled the
+driver runs its operations with no instrumentation at all.
+
+:example:
+
+	>>> i2c = qwiic_i2c.getI2CDriver()
+	>>> i2c.enableStats()
+	>>> ...
+	>>> print(i2c.statsReport())
+"""
+
+import time
+
+# Number of histogram buckets. Bucket i counts the calls that took less than
+# 2**i microseconds (and at least 2**(i-1)); the last bucket also holds
+# everything longer.
+HISTOGRAM_BUCKETS = 20
+
+#-----------------------------------------------------------------------------
+# Microsecond timer - ticks_us on MicroPython, the ns clocks elsewhere
+if hasattr(time, "ticks_us"):
+	_ticksUs = time.ticks_us
+
+	def _elapsedUs(start):
+		return time.ticks_diff(time.ticks_us(), start)
+
+elif hasattr(time, "perf_counter_ns"):
+	def _ticksUs():
+		return time.perf_counter_ns() // 1000
+
+	def _elapsedUs(start):
+		return time.perf_counter_ns() // 1000 - start
+
+else:
+	def _ticksUs():
+		return time.monotonic_ns() // 1000
+
+	def _elapsedUs(start):
+		return time.monotonic_ns() // 1000 - start
+
+# Positions in a statistics entry
+_COUNT = 0
+_BYTES_OUT = 1
+_BYTES_IN = 2
+_ERRORS = 3
+_TOTAL_US = 4
+_MAX_US = 5
+_HISTOGRAM = 6
+
+class TransactionStats(object):
+	"""
+	TransactionStats
+
+		Collects the statistics of the transactions of one driver.
+	"""
+
+	def __init__(self):
+		# (address, register) -> entry list, see the positions above
+		self._entries = {}
+
+	def record(self, address, register, bytesOut, bytesIn, elapsedUs, error=False):
+		"""
+			Adds one transaction to the statistics
+
+			:param address: The I2C address of the device
+			:param register: The register (command code), or None
+			:param bytesOut: Number of bytes written
+			:param bytesIn: Number of bytes read
+			:param elapsedUs: Duration of the transaction in microseconds
+			:param error: True if the transaction failed
+		"""
+		key = (address, register)
+		entry = self._entries.get(key)
+		if entry is None:
+			entry = [0, 0, 0, 0, 0, 0, [0] * HISTOGRAM_BUCKETS]
+			self._entries[key] = entry
+
+		entry[_COUNT] += 1
+		entry[_BYTES_OUT] += bytesOut
+		entry[_BYTES_IN] += bytesIn
+		if error:
+			entry[_ERRORS] += 1
+		entry[_TOTAL_US] += elapsedUs
+		if elapsedUs > entry[_MAX_US]:
+			entry[_MAX_US] = elapsedUs
+
+		bucket = 0
+		while elapsedUs > 0 and bucket < HISTOGRAM_BUCKETS - 1:
+			elapsedUs >>= 1
+			bucket += 1
+		entry[_HISTOGRAM][bucket] += 1
+
+	def snapshot(self):
+		"""
+			Returns a copy of the statistics
+
+			:return: dict of (address, register) -> dict with the keys count,
+				bytesOut, bytesIn, errors, totalUs, maxUs and histogram
+			:rtype: dict
+		"""
+		result = {}
+		for key, entry in self._entries.items():
+			result[key] = {
+				"count": entry[_COUNT],
+				"bytesOut": entry[_BYTES_OUT],
+				"bytesIn": entry[_BYTES_IN],
+				"errors": entry[_ERRORS],
+				"totalUs": entry[_TOTAL_US],
+				"maxUs": entry[_MAX_US],
+				"histogram": list(entry[_HISTOGRAM]),
+			}
+		return result
+
+	def reset(self):
+		""" Clears all statistics """
+		self._entries = {}
+
+	def report(self):
+		"""
+			Returns the statistics as a text table, the most time consuming
+			register first
+
+			:return: The report
+			:rtype: str
+		"""
+		lines = ["addr  reg    count    out     in  err   total ms  max us"]
+
+		entries = sorted(self._entries.items(), key=lambda item: -item[1][_TOTAL_US])
+		for (address, register), entry in entries:
+			reg = "  -" if register is None else "0x%02X" % register
+			lines.append("0x%02X  %s %8d %6d %6d %4d %10.2f %7d" % (
+				address, reg, entry[_COUNT], entry[_BYTES_OUT], entry[_BYTES_IN],
+				entry[_ERRORS], entry[_TOTAL_US] / 1000.0, entry[_MAX_US]))
+
+		return "\n".join(lines)
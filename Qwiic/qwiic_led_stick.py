@@ -95,12 +95,25 @@ class QwiicLEDStick(object):
 
         # Load the I2C driver if one isn't provided
         if i2c_driver == None:
-            self._i2c = qwiic_i2c.getI2CDriver()
+            self._i2c = qwiic_i2c.getSharedI2CDriver()
             if self._i2c == None:
                 print("Unable to load I2C driver for this platform.")
                 return
         else:
             self._i2c = i2c_driver
+
+        self._mark_cached_registers()
+
+    # ------------------------------------------------------------------------------
+    # _mark_cached_registers()
+    #
+    # The "all LEDs" settings only change when we write them, so a register
+    # cache on the I2C driver may skip repeating them. The single LED and array
+    # commands below invalidate them.
+    def _mark_cached_registers(self):
+        self._i2c.markConfigRegisters(self.address, [self.COMMAND_WRITE_ALL_LED_COLOR,
+                                                     self.COMMAND_WRITE_ALL_LED_BRIGHTNESS,
+                                                     self.COMMAND_CHANGE_LED_LENGTH])
     
     # ------------------------------------------------------------------------------
     # is_connected()
@@ -113,7 +126,7 @@ class QwiicLEDStick(object):
             :return: True if the device is connected, false otherwise.
             :rtype: bool
         """
-        return qwiic_i2c.isDeviceConnected(self.address)
+        return self._i2c.isDeviceConnected(self.address)
 
     # ------------------------------------------------------------------------------
     # begin()
@@ -160,6 +173,9 @@ class QwiicLEDStick(object):
             blue = 0
         
 
+        # The LEDs no longer all share one color
+        self._i2c.invalidateRegisterCache(self.address, [self.COMMAND_WRITE_ALL_LED_COLOR])
+
         data = [number, red, green, blue]
         return self._i2c.writeBlock(self.address, self.COMMAND_WRITE_SINGLE_LED_COLOR, data)
 
@@ -227,10 +243,14 @@ class QwiicLEDStick(object):
             if blue_list[i] < 0:
                 blue_list[i] = 0
 
+        # The LEDs no longer all share one color
+        self._i2c.invalidateRegisterCache(self.address, [self.COMMAND_WRITE_ALL_LED_COLOR])
+
         # ATtiny has a 16 byte limit on an I2C transmission, so we need to chop up 
-        # our color lists into chunks of 12 values
-        # Use list comprehension to break list into a list of lists of length 12
-        n = 12
+        # our color lists into chunks of 12 values - or fewer if the I2C driver can't
+        # write a block of 12 values plus the length and offset bytes
+        # Use list comprehension to break list into a list of lists of length n
+        n = min(12, self._i2c.max_write_block - 2)
         red_2dim_list = [red_list[i * n:(i + 1) * n] for i in range((len(red_list) + n - 1) // n)]
         green_2dim_list = [green_list[i * n:(i +1) * n] for i in range((len(green_list) + n - 1) // n)]
         blue_2dim_list = [blue_list[i * n:(i + 1) * n] for i in range((len(blue_list) + n - 1) // n)]
@@ -276,6 +296,9 @@ class QwiicLEDStick(object):
         if brightness < 0:
             brightness = 0
         
+        # The LEDs no longer all share one brightness
+        self._i2c.invalidateRegisterCache(self.address, [self.COMMAND_WRITE_ALL_LED_BRIGHTNESS])
+
         data = [number, brightness]
         return self._i2c.writeBlock(self.address, self.COMMAND_WRITE_SINGLE_LED_BRIGHTNESS, data)
     
@@ -311,6 +334,8 @@ class QwiicLEDStick(object):
             :return: true if the command was sent successfully, false otherwise.
             :rtype: bool
         """
+        self._i2c.invalidateRegisterCache(self.address, [self.COMMAND_WRITE_ALL_LED_COLOR])
+
         return self._i2c.writeByte(self.address, self.COMMAND_WRITE_ALL_LED_OFF, 0)
     
     # ---------------------------------------------------------------------------
@@ -330,9 +355,11 @@ class QwiicLEDStick(object):
             return False
         
         self._i2c.writeByte(self.address, self.COMMAND_CHANGE_ADDRESS, new_address)
+        self._i2c.invalidateRegisterCache(self.address)
         
         # Update address variable
         self.address = new_address
+        self._mark_cached_registers()
     
     # --------------------------------------------------------------------------
     # change_length(new_length)
@@ -165,7 +165,7 @@ class QwiicOledBase(object):
         # Load the I2C driver if one isn't provided
 
         if i2c_driver is None:
-            self._i2c = qwiic_i2c.getI2CDriver()
+            self._i2c = qwiic_i2c.getSharedI2CDriver()
             if self._i2c is None:
                 print("Unable to load I2C driver for this platform.")
                 return
@@ -213,7 +213,7 @@ class QwiicOledBase(object):
             :rtype: bool
 
         """
-        return qwiic_i2c.isDeviceConnected(self.address)
+        return self._i2c.isDeviceConnected(self.address)
 
     connected = property(is_connected)
 
@@ -232,46 +232,49 @@ class QwiicOledBase(object):
         self.set_draw_modee(self.NORM)
         self.set_cursor(0,0)
 
-        #  Display Init sequence
-        self._i2c.writeByte(self.address, I2C_COMMAND, DISPLAYOFF)          #  0xAE
+        # The whole init sequence runs with the bus held, instead of taking it
+        # again for each write
+        with self._i2c:
+            #  Display Init sequence
+            self._i2c.writeByte(self.address, I2C_COMMAND, DISPLAYOFF)          #  0xAE
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETDISPLAYCLOCKDIV)  #  0xD5
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x80)                    #  the suggested ratio 0x80
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETDISPLAYCLOCKDIV)  #  0xD5
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x80)                    #  the suggested ratio 0x80
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETMULTIPLEX)            #  0xA8
-        self._i2c.writeByte(self.address, I2C_COMMAND, self.LCDHEIGHT - 1)
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETMULTIPLEX)            #  0xA8
+            self._i2c.writeByte(self.address, I2C_COMMAND, self.LCDHEIGHT - 1)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETDISPLAYOFFSET)        #  0xD3
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x0)                 #  no offset
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETDISPLAYOFFSET)        #  0xD3
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x0)                 #  no offset
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETSTARTLINE | 0x0)  #  line #0
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETSTARTLINE | 0x0)  #  line #0
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, CHARGEPUMP)          #  enable charge pump
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x14)
+            self._i2c.writeByte(self.address, I2C_COMMAND, CHARGEPUMP)          #  enable charge pump
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x14)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, NORMALDISPLAY)           #  0xA6
-        self._i2c.writeByte(self.address, I2C_COMMAND, DISPLAYALLONRESUME)  #  0xA4
+            self._i2c.writeByte(self.address, I2C_COMMAND, NORMALDISPLAY)           #  0xA6
+            self._i2c.writeByte(self.address, I2C_COMMAND, DISPLAYALLONRESUME)  #  0xA4
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SEGREMAP | 0x1)
-        self._i2c.writeByte(self.address, I2C_COMMAND, COMSCANDEC)
+            self._i2c.writeByte(self.address, I2C_COMMAND, SEGREMAP | 0x1)
+            self._i2c.writeByte(self.address, I2C_COMMAND, COMSCANDEC)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETCOMPINS)          #  0xDA
-        if len(self._screenbuffer) == 512:
-            self._i2c.writeByte(self.address, I2C_COMMAND, 0x02)                # rect (128x32 OLED modules)
-        else:
-            self._i2c.writeByte(self.address, I2C_COMMAND, 0x12)                # square and large (64x48 or 128x64 OLED modules)
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETCOMPINS)          #  0xDA
+            if len(self._screenbuffer) == 512:
+                self._i2c.writeByte(self.address, I2C_COMMAND, 0x02)                # rect (128x32 OLED modules)
+            else:
+                self._i2c.writeByte(self.address, I2C_COMMAND, 0x12)                # square and large (64x48 or 128x64 OLED modules)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETCONTRAST)         #  0x81
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x8F)
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETCONTRAST)         #  0x81
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x8F)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETPRECHARGE)            #  0xd9
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x22)
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETPRECHARGE)            #  0xd9
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x22)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETVCOMDESELECT)         #  0xDB
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x30)
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETVCOMDESELECT)         #  0xDB
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x30)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, DISPLAYON)               # --turn on oled panel
-        self.clear(self.ALL)                        #  Erase hardware memory inside the OLED controller to aself random data in memory.
+            self._i2c.writeByte(self.address, I2C_COMMAND, DISPLAYON)               # --turn on oled panel
+            self.clear(self.ALL)                        #  Erase hardware memory inside the OLED controller to aself random data in memory.
 
     #----------------------------------------------------
     # brief Set SSD1306 page address.
@@ -289,9 +292,14 @@ class QwiicOledBase(object):
 
         # self._i2c.writeByte(self.address, I2C_COMMAND, 0xb0|pageAddress)
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x22)
-        self._i2c.writeByte(self.address, I2C_COMMAND, (pageAddress& (self.LCDHEIGHT - 1)))
-        self._i2c.writeByte(self.address, I2C_COMMAND, self.LCDHEIGHT - 1)
+        with self._i2c.batch() as batch:
+            self._queue_page_address(batch, pageAddress)
+
+    def _queue_page_address(self, batch, pageAddress):
+        # Queue the page address command sequence on a batch
+        batch.writeByte(self.address, I2C_COMMAND, 0x22)
+        batch.writeByte(self.address, I2C_COMMAND, (pageAddress& (self.LCDHEIGHT - 1)))
+        batch.writeByte(self.address, I2C_COMMAND, self.LCDHEIGHT - 1)
 
     #----------------------------------------------------
     # Send column address command and address to the SSD1306 OLED controller.
@@ -304,14 +312,19 @@ class QwiicOledBase(object):
             :return: No return value
 
         """
-        
+
+        with self._i2c.batch() as batch:
+            self._queue_column_address(batch, colAddress)
+
+    def _queue_column_address(self, batch, colAddress):
+        # Queue the column address command sequence on a batch
         if len(self._screenbuffer) == 384:
-            self._i2c.writeByte(self.address, I2C_COMMAND, (0x10|(colAddress>>4))+0x02)
-            self._i2c.writeByte(self.address, I2C_COMMAND, (0x0f&colAddress))
+            batch.writeByte(self.address, I2C_COMMAND, (0x10|(colAddress>>4))+0x02)
+            batch.writeByte(self.address, I2C_COMMAND, (0x0f&colAddress))
         else:
-            self._i2c.writeByte(self.address, I2C_COMMAND, 0x21)
-            self._i2c.writeByte(self.address, I2C_COMMAND, (colAddress& (self.LCDWIDTH - 1)))
-            self._i2c.writeByte(self.address, I2C_COMMAND, self.LCDWIDTH -1)
+            batch.writeByte(self.address, I2C_COMMAND, 0x21)
+            batch.writeByte(self.address, I2C_COMMAND, (colAddress& (self.LCDWIDTH - 1)))
+            batch.writeByte(self.address, I2C_COMMAND, self.LCDWIDTH -1)
 
     #----------------------------------------------------
     #  To clear GDRAM inside the LCD controller, pass in the variable mode = ALL and to clear screen page buffer pass in the variable mode = PAGE.
@@ -329,13 +342,14 @@ class QwiicOledBase(object):
         """
 
         if mode == self.ALL:
-            for i in range(8):
-                self.set_page_address(i)
-                self.set_column_address(0)
-                #pylint: disable=unused-variable
-                for j in range(0x80):
-                    self._i2c.writeByte(self.address, I2C_DATA, value)
-                #pylint: enable=unused-variable
+            with self._i2c:
+                for i in range(8):
+                    self.set_page_address(i)
+                    self.set_column_address(0)
+                    #pylint: disable=unused-variable
+                    for j in range(0x80):
+                        self._i2c.writeByte(self.address, I2C_DATA, value)
+                    #pylint: enable=unused-variable
         else:
             self._screenbuffer[:] = [value]*len(self._screenbuffer)
 
@@ -368,8 +382,9 @@ class QwiicOledBase(object):
             :return: No return value
 
         """
-        self._i2c.writeByte(self.address, I2C_COMMAND, SETCONTRAST)     #  0x81
-        self._i2c.writeByte(self.address, I2C_COMMAND, contrast)
+        with self._i2c:
+            self._i2c.writeByte(self.address, I2C_COMMAND, SETCONTRAST)     #  0x81
+            self._i2c.writeByte(self.address, I2C_COMMAND, contrast)
 
     #--------------------------------------------------------------------------
     # Bulk move the screen buffer to the SSD1306 controller's memory so that images/graphics drawn on the screen buffer will be displayed on the OLED.
@@ -382,30 +397,59 @@ class QwiicOledBase(object):
             :return: No return value
 
         """
-        # the I2C library being used allows blocks upto 32 ints to be sent at a time.
+        lenHieght = self.get_lcd_height()
+        mBlocks = int(math.ceil(lenHieght/8))
+
+        # The address commands and data blocks for the whole screen are queued
+        # on one batch, so the driver can bundle them in to as few bus
+        # transactions as the platform allows.
+        with self._i2c.batch() as batch:
+
+            for i in range(mBlocks):
+                self._queue_display_page(batch, i)
+
+    async def display_async(self):
+        """
+            Coroutine version of display(). Each page of the screen buffer is sent as
+            its own batch, and the event loop runs other tasks between pages.
+
+            :return: No return value
+
+        """
+        from Qwiic.qwiic_i2c.async_i2c import getAsyncI2CDriver
+        aio = getAsyncI2CDriver(self._i2c)
+
+        for i in range(int(math.ceil(self.get_lcd_height()/8))):
+            batch = self._i2c.batch()
+            self._queue_display_page(batch, i)
+            await aio.submit(batch)
+
+    def _queue_display_page(self, batch, page):
+        # Queue the address commands and data blocks for one page (8 pixel rows)
+        # of the screen buffer on a batch
+        #
+        # The I2C driver reports the largest block it can write at a time (32 ints
+        # for SMBus, no practical limit for the MicroPython writeto_mem).
         #
-        # The screenbuffer is sliced into 32 int blocks and set. This results in a faster
-        # refresh than the ported method (Good god, it was updating a pixel at a time ... )
+        # Each line of the screenbuffer is sliced into blocks of that size, up to a whole
+        # line, and set. This results in a faster refresh than the ported method
+        # (Good god, it was updating a pixel at a time ... )
         #
-        lenBlock = 32
         lenLine = self.get_lcd_width()
-        lenHieght = self.get_lcd_height()
+        lenBlock = min(self._i2c.max_write_block, lenLine)
         nBlocks = int(math.ceil(lenLine/lenBlock))
-        mBlocks = int(math.ceil(lenHieght/8))
-
-        for i in range(mBlocks):
 
-            self.set_page_address(i)
-            lineStart = i * lenLine  # offset in the screen buffer for the current line/row
+        self._queue_page_address(batch, page)
+        lineStart = page * lenLine  # offset in the screen buffer for the current line/row
 
-            for iBlock in range(nBlocks):
+        for iBlock in range(nBlocks):
 
-                iStart = iBlock * lenBlock
-                self.set_column_address(iStart)
-                iEnd = iStart  + min(lenLine - iStart, lenBlock) # what's left - not > 32 in len
+            iStart = iBlock * lenBlock
+            self._queue_column_address(batch, iStart)
+            iEnd = iStart  + min(lenLine - iStart, lenBlock) # what's left - not > lenBlock in len
 
-                # Send the block - take into account the current line/row offset
-                self._i2c.writeBlock(self.address, I2C_DATA, self._screenbuffer[lineStart+iStart:lineStart+iEnd])
+            # Send the block - take into account the current line/row offset
+            batch.writeBlock(self.address, I2C_DATA, self._screenbuffer[lineStart+iStart:lineStart+iEnd])
 
     #     Leftover from port -> Arduino's print overridden so that we can use uView.print().
     #--------------------------------------------------------------------------
@@ -979,14 +1023,15 @@ class QwiicOledBase(object):
 
         self.scroll_stop()       # need to disable scrolling before starting to avoid memory corrupt
 
-        self._i2c.writeByte(self.address, I2C_COMMAND, RIGHTHORIZONTALSCROLL)
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x00)
-        self._i2c.writeByte(self.address, I2C_COMMAND, start)
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x7)     # scroll speed frames , TODO
-        self._i2c.writeByte(self.address, I2C_COMMAND, stop)
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0x00)
-        self._i2c.writeByte(self.address, I2C_COMMAND, 0xFF)
-        self._i2c.writeByte(self.address, I2C_COMMAND, ACTIVATESCROLL)
+        with self._i2c:
+            self._i2c.writeByte(self.address, I2C_COMMAND, RIGHTHORIZONTALSCROLL)
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x00)
+            self._i2c.writeByte(self.address, I2C_COMMAND, start)
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x7)     # scroll speed frames , TODO
+            self._i2c.writeByte(self.address, I2C_COMMAND, stop)
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0x00)
+            self._i2c.writeByte(self.address, I2C_COMMAND, 0xFF)
+            self._i2c.writeByte(self.address, I2C_COMMAND, ACTIVATESCROLL)
 
 
     # Flip the graphics on the OLED vertically.
@@ -228,13 +228,23 @@ class QwiicOTOS(object):
 
         # Load the I2C driver if one isn't provided
         if i2c_driver is None:
-            self._i2c = qwiic_i2c.getI2CDriver()
+            self._i2c = qwiic_i2c.getSharedI2CDriver()
             if self._i2c is None:
                 print("Unable to load I2C driver for this platform.")
                 return
         else:
             self._i2c = i2c_driver
 
+        # Registers a register cache on the I2C driver may serve. The IDs never
+        # change, and the configuration only changes when we write it
+        self._i2c.markStaticRegisters(self.address, [self.kRegProductId,
+                                                     self.kRegHwVersion,
+                                                     self.kRegFwVersion])
+        self._i2c.markConfigRegisters(self.address, [self.kRegScalarLinear,
+                                                     self.kRegScalarAngular,
+                                                     self.kRegSignalProcess,
+                                                     self.kRegOffXL])
+
         # Units to be used by the public pose functions. Everything uses meters and
         # radians internally, so this just determines what conversion factor is
         # applied to the public functions
@@ -498,6 +508,9 @@ class QwiicOTOS(object):
         # Set tracking reset bit
         self._i2c.write_byte(self.address, self.kRegReset, 0x01)
 
+        # Drop any cached register values of the device
+        self._i2c.invalidateRegisterCache(self.address)
+
     def getSignalProcessConfig(self):
         """
         Gets the signal processing configuration from the OTOS
@@ -635,12 +648,12 @@ class QwiicOTOS(object):
         :rtype: tuple of Pose2D
         """
         # Read all pose registers
-        rawData = self._i2c.read_block(self.address, self.kRegPosXL, 18)
+        rawData = self._i2c.read_array(self.address, self.kRegPosXL, 'h', 9)
         
         # Convert raw data to pose units
-        pos = self._regsToPose(rawData[0:6], self.kInt16ToMeter, self.kInt16ToRad)
-        vel = self._regsToPose(rawData[6:12], self.kInt16ToMps, self.kInt16ToRps)
-        acc = self._regsToPose(rawData[12:18], self.kInt16ToMpss, self.kInt16ToRpss)
+        pos = self._regsToPose(rawData, self.kInt16ToMeter, self.kInt16ToRad)
+        vel = self._regsToPose(rawData, self.kInt16ToMps, self.kInt16ToRps, 3)
+        acc = self._regsToPose(rawData, self.kInt16ToMpss, self.kInt16ToRpss, 6)
 
         return (pos, vel, acc)
 
@@ -654,12 +667,12 @@ class QwiicOTOS(object):
         :rtype: tuple of Pose2D
         """
         # Read all pose registers
-        rawData = self._i2c.read_block(self.address, self.kRegPosStdXL, 18)
+        rawData = self._i2c.read_array(self.address, self.kRegPosStdXL, 'h', 9)
         
         # Convert raw data to pose units
-        pos = self._regsToPose(rawData[0:6], self.kInt16ToMeter, self.kInt16ToRad)
-        vel = self._regsToPose(rawData[6:12], self.kInt16ToMps, self.kInt16ToRps)
-        acc = self._regsToPose(rawData[12:18], self.kInt16ToMpss, self.kInt16ToRpss)
+        pos = self._regsToPose(rawData, self.kInt16ToMeter, self.kInt16ToRad)
+        vel = self._regsToPose(rawData, self.kInt16ToMps, self.kInt16ToRps, 3)
+        acc = self._regsToPose(rawData, self.kInt16ToMpss, self.kInt16ToRpss, 6)
 
         return (pos, vel, acc)
 
@@ -673,18 +686,91 @@ class QwiicOTOS(object):
         :rtype: tuple of Pose2D
         """
         # Read all pose registers
-        rawData = self._i2c.read_block(self.address, self.kRegPosXL, 36)
+        rawData = self._i2c.read_array(self.address, self.kRegPosXL, 'h', 18)
         
         # Convert raw data to pose units
-        pos = self._regsToPose(rawData[0:6], self.kInt16ToMeter, self.kInt16ToRad)
-        vel = self._regsToPose(rawData[6:12], self.kInt16ToMps, self.kInt16ToRps)
-        acc = self._regsToPose(rawData[12:18], self.kInt16ToMpss, self.kInt16ToRpss)
-        posStdDev = self._regsToPose(rawData[18:24], self.kInt16ToMeter, self.kInt16ToRad)
-        velStdDev = self._regsToPose(rawData[24:30], self.kInt16ToMps, self.kInt16ToRps)
-        accStdDev = self._regsToPose(rawData[30:36], self.kInt16ToMpss, self.kInt16ToRpss)
+        pos = self._regsToPose(rawData, self.kInt16ToMeter, self.kInt16ToRad)
+        vel = self._regsToPose(rawData, self.kInt16ToMps, self.kInt16ToRps, 3)
+        acc = self._regsToPose(rawData, self.kInt16ToMpss, self.kInt16ToRpss, 6)
+        posStdDev = self._regsToPose(rawData, self.kInt16ToMeter, self.kInt16ToRad, 9)
+        velStdDev = self._regsToPose(rawData, self.kInt16ToMps, self.kInt16ToRps, 12)
+        accStdDev = self._regsToPose(rawData, self.kInt16ToMpss, self.kInt16ToRpss, 15)
 
         return (pos, vel, acc, posStdDev, velStdDev, accStdDev)
 
+    async def getPositionAsync(self):
+        """
+        Coroutine version of getPosition(). The bus transfer does not block
+        the event loop, see Qwiic.qwiic_i2c.async_i2c
+
+        :return: Position measured by the OTOS
+        :rtype: Pose2D
+        """
+        return await self._readPoseRegsAsync(self.kRegPosXL, self.kInt16ToMeter, self.kInt16ToRad)
+
+    async def getVelocityAsync(self):
+        """
+        Coroutine version of getVelocity()
+
+        :return: Velocity measured by the OTOS
+        :rtype: Pose2D
+        """
+        return await self._readPoseRegsAsync(self.kRegVelXL, self.kInt16ToMps, self.kInt16ToRps)
+
+    async def getAccelerationAsync(self):
+        """
+        Coroutine version of getAcceleration()
+
+        :return: Acceleration measured by the OTOS
+        :rtype: Pose2D
+        """
+        return await self._readPoseRegsAsync(self.kRegAccXL, self.kInt16ToMpss, self.kInt16ToRpss)
+
+    async def getPosVelAccAsync(self):
+        """
+        Coroutine version of getPosVelAcc()
+
+        :return: Position, velocity, and acceleration measured by the OTOS
+        :rtype: tuple of Pose2D
+        """
+        # Read all pose registers
+        rawData = await self._asyncI2C().read_array(self.address, self.kRegPosXL, 'h', 9)
+
+        # Convert raw data to pose units
+        pos = self._regsToPose(rawData, self.kInt16ToMeter, self.kInt16ToRad)
+        vel = self._regsToPose(rawData, self.kInt16ToMps, self.kInt16ToRps, 3)
+        acc = self._regsToPose(rawData, self.kInt16ToMpss, self.kInt16ToRpss, 6)
+
+        return (pos, vel, acc)
+
+    def _asyncI2C(self):
+        """
+        Gets the async wrapper shared by all users of this I2C driver
+
+        :return: Async I2C driver
+        :rtype: AsyncI2CDriver
+        """
+        from Qwiic.qwiic_i2c.async_i2c import getAsyncI2CDriver
+        return getAsyncI2CDriver(self._i2c)
+
+    async def _readPoseRegsAsync(self, reg, rawToXY, rawToH):
+        """
+        Coroutine version of _readPoseRegs()
+
+        :param reg: Register to read from
+        :type reg: int
+        :param rawToXY: Conversion factor from raw units to XY units
+        :type rawToXY: float
+        :param rawToH: Conversion factor from raw units to heading units
+        :type rawToH: float
+        :return: Pose structure containing the pose read from the registers
+        :rtype: Pose2D
+        """
+        # Read the raw pose data
+        rawData = await self._asyncI2C().read_struct(self.address, reg, '<hhh')
+
+        return self._regsToPose(rawData, rawToXY, rawToH)
+
     def _readPoseRegs(self, reg, rawToXY, rawToH):
         """
         Function to read raw pose registers and convert to specified units
@@ -699,7 +785,7 @@ class QwiicOTOS(object):
         :rtype: Pose2D
         """
         # Read the raw pose data
-        rawData = self._i2c.read_block(self.address, reg, 6)
+        rawData = self._i2c.read_struct(self.address, reg, '<hhh')
         
         return self._regsToPose(rawData, rawToXY, rawToH)
 
@@ -722,36 +808,26 @@ class QwiicOTOS(object):
         # Write the raw data to the device
         self._i2c.write_block(self.address, reg, rawData)
 
-    def _regsToPose(self, rawData, rawToXY, rawToH):
+    def _regsToPose(self, rawData, rawToXY, rawToH, offset=0):
         """
         Function to convert raw pose registers to a pose structure
 
-        :param rawData: Raw data from the pose registers
-        :type rawData: list of int
+        :param rawData: Signed 16-bit X, Y and heading values read from the
+        pose registers
+        :type rawData: sequence of int
         :param rawToXY: Conversion factor from raw units to XY units
         :type rawToXY: float
         :param rawToH: Conversion factor from raw units to heading units
         :type rawToH: float
+        :param offset: Index of the X value in rawData
+        :type offset: int, optional
         :return: Pose structure containing the pose read from the registers
         :rtype: Pose2D
         """
-        # Store raw data
-        rawX = (rawData[1] << 8) | rawData[0]
-        rawY = (rawData[3] << 8) | rawData[2]
-        rawH = (rawData[5] << 8) | rawData[4]
-
-        # Convert raw data to signed 16-bit integers
-        if rawX > 32767:
-            rawX = rawX - 65536
-        if rawY > 32767:
-            rawY = rawY - 65536
-        if rawH > 32767:
-            rawH = rawH - 65536
-
         # Store in pose and convert to units
-        x = rawX * rawToXY * self._meterToUnit
-        y = rawY * rawToXY * self._meterToUnit
-        h = rawH * rawToH * self._radToUnit
+        x = rawData[offset] * rawToXY * self._meterToUnit
+        y = rawData[offset + 1] * rawToXY * self._meterToUnit
+        h = rawData[offset + 2] * rawToH * self._radToUnit
 
         return Pose2D(x, y, h)
 
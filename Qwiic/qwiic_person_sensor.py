@@ -2,7 +2,10 @@
 # The Qwiic_I2C_Py platform driver is designed to work on almost any Python
 # platform, check it out here: https://github.com/sparkfun/Qwiic_I2C_Py
 import Qwiic.qwiic_i2c as qwiic_i2c
-import ustruct as struct
+try:
+    import struct
+except ImportError:
+    import ustruct as struct
 import time
 
 # Define the device name and I2C addresses. These are set in the class defintion
@@ -31,6 +34,14 @@ PERSON_SENSOR_RESULT_FORMAT = PERSON_SENSOR_I2C_HEADER_FORMAT + \
     'B' + PERSON_SENSOR_FACE_FORMAT * PERSON_SENSOR_FACE_MAX + 'H'
 PERSON_SENSOR_RESULT_BYTE_COUNT = struct.calcsize(PERSON_SENSOR_RESULT_FORMAT)
 
+# The whole result decoded in one go - packed, little-endian
+PERSON_SENSOR_RESULT_STRUCT = '<' + PERSON_SENSOR_RESULT_FORMAT
+
+# Position of the face count and of the first face in the decoded result
+_RESULT_NUM_FACES = 3
+_RESULT_FACES = 4
+_FACE_FIELDS = len(PERSON_SENSOR_FACE_FORMAT)
+
 PERSON_SENSOR_REG_MODE          = 0x01
 PERSON_SENSOR_REG_ENABLE_ID     = 0x02
 PERSON_SENSOR_REG_SINGLE_SHOT   = 0x03
@@ -73,7 +84,7 @@ class QwiicPersonSensor(object):
 
         # Load the I2C driver if one isn't provided
         if i2c_driver is None:
-            self._i2c = qwiic_i2c.getI2CDriver()
+            self._i2c = qwiic_i2c.getSharedI2CDriver()
             if self._i2c is None:
                 print('Unable to load I2C driver for this platform.')
                 return
@@ -93,22 +104,17 @@ class QwiicPersonSensor(object):
 
     def read(self):
 
-        read_data = self._i2c.read_block(self.address, 0, PERSON_SENSOR_RESULT_BYTE_COUNT)
-
-        offset = 0
-        (pad1, pad2, payload_bytes) = struct.unpack_from(
-            PERSON_SENSOR_I2C_HEADER_FORMAT, read_data, offset)
-        offset = offset + PERSON_SENSOR_I2C_HEADER_BYTE_COUNT
+        # Header, face count, every face slot and the checksum in one read
+        result = self._i2c.read_struct(self.address, 0, PERSON_SENSOR_RESULT_STRUCT)
 
-        (num_faces) = struct.unpack_from('B', read_data, offset)
-        num_faces = int(num_faces[0])
-        offset = offset + 1
+        num_faces = min(result[_RESULT_NUM_FACES], PERSON_SENSOR_FACE_MAX)
 
         faces = []
+        offset = _RESULT_FACES
         for i in range(num_faces):
             (box_confidence, box_left, box_top, box_right, box_bottom, id_confidence, id,
-            is_facing) = struct.unpack_from(PERSON_SENSOR_FACE_FORMAT, read_data, offset)
-            offset = offset + PERSON_SENSOR_FACE_BYTE_COUNT
+            is_facing) = result[offset:offset + _FACE_FIELDS]
+            offset = offset + _FACE_FIELDS
             face = {
                 'box_confidence': box_confidence,
                 'box_left': box_left,
@@ -120,7 +126,6 @@ class QwiicPersonSensor(object):
                 'is_facing': is_facing,
             }
             faces.append(face)
-        checksum = struct.unpack_from('H', read_data, offset)
         return faces
 
     def set_mode(self, mode):
@@ -0,0 +1,407 @@
+#-------------------------------------------------------------------------------
+# qwiic_sample_share.py
+#
+# Shares the latest sample of a Qwiic sensor between local processes through
+# shared memory
+#-------------------------------------------------------------------------------
+#
+# More information on Qwiic is at https://www.sparkfun.com/qwiic
+#
+# Do you like this library? Help support SparkFun. Buy a board!
+#===============================================================================
+# Copyright (c) 2024 SparkFun Electronics
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#===============================================================================
+
+"""
+qwiic_sample_share
+==================
+One process polls a sensor and publishes each decoded sample to a small
+memory mapped file; any number of other processes read the latest sample
+from it without touching the bus. Bus load stays that of a single reader,
+however many consumers there are.
+
+The sample is a struct-packed tuple, stored with a sequence number and a
+timestamp under a seqlock: the publisher makes the sequence odd while it
+writes and even again when done, and a reader retries until it sees the same
+even sequence before and after copying the sample. Readers never block the
+publisher.
+
+Ready-made publishers and readers are provided for the OTOS (position,
+velocity and acceleration) and the Person Sensor (faces). Linux hosts only -
+it needs mmap.
+
+:example:
+
+    >>> # Publisher process
+    >>> publisher = otosPublisher(QwiicOTOS())
+    >>> publisher.run(interval=0.01)
+
+    >>> # Any number of consumer processes
+    >>> reader = otosReader()
+    >>> seq, timestamp, (pos, vel, acc) = reader.read()
+"""
+
+import os
+import sys
+import time
+import mmap
+import struct
+
+# File layout: header, sequence, timestamp, struct format of the sample, and
+# the sample. The sequence and timestamp are 8 byte aligned.
+_MAGIC = b"QSMP"
+_VERSION = 1
+_HEADER = "<4sHH"           # magic, version, format length
+_SEQ_OFFSET = 8
+_SEQ = "<Q"
+_TIME_OFFSET = 16
+_TIME = "<d"
+_FORMAT_OFFSET = 24
+_FORMAT_SIZE = 64
+_DATA_OFFSET = _FORMAT_OFFSET + _FORMAT_SIZE
+
+# Time a reader waits for a publisher that is mid-write before giving up on
+# it (a publisher killed while writing), in seconds
+_READ_TIMEOUT = 1.0
+
+def defaultPath(name):
+    """
+    Returns the default file of a shared sample - in /dev/shm (memory
+    backed) where there is one
+
+    :param name: Name of the sample, for example "otos"
+    :type name: str
+    :return: The file path
+    :rtype: str
+    """
+    directory = "/dev/shm"
+    if not os.path.isdir(directory):
+        import tempfile
+        directory = tempfile.gettempdir()
+    return os.path.join(directory, "qwiic-%s.sample" % name)
+
+def default_path(name):
+    return defaultPath(name)
+
+class SamplePublisher(object):
+    """
+    Publishes the latest sample of a sensor
+
+    :param path: The shared sample file, created or replaced
+    :type path: str
+    :param fmt: struct format of the sample, for example '<9d'
+    :type fmt: str
+    :param poll: Function returning a new sample from the sensor
+    :type poll: function, optional
+    :param encode: Function turning a sample in to the tuple packed with fmt.
+        If not provided, the sample is the tuple.
+    :type encode: function, optional
+    """
+
+    def __init__(self, path, fmt, poll=None, encode=None):
+        if len(fmt) > _FORMAT_SIZE:
+            raise ValueError("Sample format longer than %d characters" % _FORMAT_SIZE)
+
+        self.path = path
+        self._struct = struct.Struct(fmt)
+        self._poll = poll
+        self._encode = encode
+        self._seq = 0
+
+        size = _DATA_OFFSET + self._struct.size
+
+        # The file is built under another name and renamed in to place, so a
+        # reader never sees a half written header
+        temp = "%s.%d.tmp" % (path, os.getpid())
+        with open(temp, "wb") as f:
+            header = bytearray(size)
+            struct.pack_into(_HEADER, header, 0, _MAGIC, _VERSION, len(fmt))
+            header[_FORMAT_OFFSET:_FORMAT_OFFSET + len(fmt)] = fmt.encode()
+            f.write(header)
+        os.rename(temp, path)
+
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def publish(self, sample, timestamp=None):
+        """
+        Writes a sample
+
+        :param sample: The sample - encoded with the encode function, if any
+        :param timestamp: Time the sample was taken, defaults to now
+        :type timestamp: float, optional
+        :return: The sequence number of the sample
+        :rtype: int
+        """
+        values = self._encode(sample) if self._encode is not None else sample
+        if timestamp is None:
+            timestamp = time.time()
+
+        # Odd while writing
+        self._seq += 1
+        struct.pack_into(_SEQ, self._map, _SEQ_OFFSET, self._seq)
+
+        struct.pack_into(_TIME, self._map, _TIME_OFFSET, timestamp)
+        self._struct.pack_into(self._map, _DATA_OFFSET, *values)
+
+        self._seq += 1
+        struct.pack_into(_SEQ, self._map, _SEQ_OFFSET, self._seq)
+
+        return self._seq
+
+    def pollOnce(self):
+        """
+        Polls the sensor and publishes the sample
+
+        :return: The sequence number of the sample, or None if the poll failed
+            - the last good sample stays published, its timestamp shows its age
+        :rtype: int
+        """
+        try:
+            sample = self._poll()
+        except OSError:
+            return None
+        return self.publish(sample)
+
+    def poll_once(self):
+        return self.pollOnce()
+
+    def run(self, interval=0.01, count=None):
+        """
+        Polls and publishes on a fixed schedule
+
+        :param interval: Time between polls, in seconds
+        :type interval: float, optional
+        :param count: Number of polls, or None to poll until interrupted
+        :type count: int, optional
+        """
+        deadline = time.monotonic()
+        n = 0
+        while count is None or n < count:
+            self.pollOnce()
+            n += 1
+
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Running late - start the schedule again from now
+                deadline = time.monotonic()
+
+    def close(self):
+        """ Unmaps the shared sample. The file is left for the readers. """
+        self._map.close()
+        self._file.close()
+
+class SampleReader(object):
+    """
+    Reads the latest sample published by a SamplePublisher. A publisher
+    started again replaces the file - readers opened before keep the old one
+    and need opening again.
+
+    :param path: The shared sample file
+    :type path: str
+    :param decode: Function turning the unpacked tuple in to the sample. If
+        not provided, the sample is the tuple.
+    :type decode: function, optional
+    """
+
+    def __init__(self, path, decode=None):
+        self.path = path
+        self._decode = decode
+
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, fmtLength = struct.unpack_from(_HEADER, self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("%s is not a shared sample file" % path)
+
+        fmt = self._map[_FORMAT_OFFSET:_FORMAT_OFFSET + fmtLength].decode()
+        self._struct = struct.Struct(fmt)
+
+    @property
+    def sequence(self):
+        """ Sequence number of the latest sample - even, 0 before the first """
+        return struct.unpack_from(_SEQ, self._map, _SEQ_OFFSET)[0] & ~1
+
+    def read(self):
+        """
+        Returns the latest sample
+
+        :return: Sequence number, timestamp and sample, or None if nothing
+            was published yet
+        :rtype: tuple
+        """
+        deadline = None
+        while True:
+            seq = struct.unpack_from(_SEQ, self._map, _SEQ_OFFSET)[0]
+            if seq == 0:
+                return None
+
+            if not seq & 1:
+                timestamp = struct.unpack_from(_TIME, self._map, _TIME_OFFSET)[0]
+                values = self._struct.unpack_from(self._map, _DATA_OFFSET)
+
+                if struct.unpack_from(_SEQ, self._map, _SEQ_OFFSET)[0] == seq:
+                    sample = self._decode(values) if self._decode is not None else values
+                    return seq, timestamp, sample
+
+            # Publisher mid-write - let it run, then try again
+            if deadline is None:
+                deadline = time.monotonic() + _READ_TIMEOUT
+            elif time.monotonic() > deadline:
+                break
+            time.sleep(0)
+
+        raise RuntimeError("Shared sample %s is not settling - publisher stopped mid-write?" % self.path)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+#-------------------------------------------------------------------------------
+# OTOS - position, velocity and acceleration as nine doubles
+
+OTOS_FORMAT = "<9d"
+
+def _encodePoses(poses):
+    values = []
+    for pose in poses:
+        values.extend((pose.x, pose.y, pose.h))
+    return values
+
+def _decodePoses(values):
+    from Qwiic.qwiic_otos import Pose2D
+    return tuple(Pose2D(values[i], values[i + 1], values[i + 2]) for i in range(0, len(values), 3))
+
+def otosPublisher(otos, path=None):
+    """
+    Returns a publisher of the OTOS position, velocity and acceleration,
+    read with one burst read (getPosVelAcc) per poll
+
+    :param otos: The QwiicOTOS object
+    :type otos: QwiicOTOS
+    :param path: The shared sample file, defaults to defaultPath("otos")
+    :type path: str, optional
+    :rtype: SamplePublisher
+    """
+    return SamplePublisher(path or defaultPath("otos"), OTOS_FORMAT, otos.getPosVelAcc, _encodePoses)
+
+def otosReader(path=None):
+    """
+    Returns a reader of the samples of otosPublisher(). The sample is the
+    (position, velocity, acceleration) tuple of Pose2D.
+
+    :param path: The shared sample file, defaults to defaultPath("otos")
+    :type path: str, optional
+    :rtype: SampleReader
+    """
+    return SampleReader(path or defaultPath("otos"), _decodePoses)
+
+#-------------------------------------------------------------------------------
+# Person Sensor - the face count and every face slot
+
+_FACE_FIELDS = ('box_confidence', 'box_left', 'box_top', 'box_right', 'box_bottom',
+                'id_confidence', 'id', 'is_facing')
+_FACE_MAX = 4
+
+PERSON_SENSOR_FORMAT = "<B" + "BBBBBBbB" * _FACE_MAX
+
+def _encodeFaces(faces):
+    values = [min(len(faces), _FACE_MAX)]
+    for i in range(_FACE_MAX):
+        if i < len(faces):
+            values.extend(faces[i][field] for field in _FACE_FIELDS)
+        else:
+            values.extend([0] * len(_FACE_FIELDS))
+    return values
+
+def _decodeFaces(values):
+    faces = []
+    for i in range(values[0]):
+        offset = 1 + i * len(_FACE_FIELDS)
+        faces.append(dict(zip(_FACE_FIELDS, values[offset:offset + len(_FACE_FIELDS)])))
+    return faces
+
+def personSensorPublisher(sensor, path=None):
+    """
+    Returns a publisher of the faces seen by the Person Sensor
+
+    :param sensor: The QwiicPersonSensor object
+    :type sensor: QwiicPersonSensor
+    :param path: The shared sample file, defaults to defaultPath("person")
+    :type path: str, optional
+    :rtype: SamplePublisher
+    """
+    return SamplePublisher(path or defaultPath("person"), PERSON_SENSOR_FORMAT, sensor.read, _encodeFaces)
+
+def personSensorReader(path=None):
+    """
+    Returns a reader of the samples of personSensorPublisher(). The sample is
+    the list of face dicts returned by QwiicPersonSensor.read().
+
+    :param path: The shared sample file, defaults to defaultPath("person")
+    :type path: str, optional
+    :rtype: SampleReader
+    """
+    return SampleReader(path or defaultPath("person"), _decodeFaces)
+
+#-------------------------------------------------------------------------------
+# snake_case names
+def otos_publisher(otos, path=None):
+    return otosPublisher(otos, path)
+
+def otos_reader(path=None):
+    return otosReader(path)
+
+def person_sensor_publisher(sensor, path=None):
+    return personSensorPublisher(sensor, path)
+
+def person_sensor_reader(path=None):
+    return personSensorReader(path)
+
+if __name__ == '__main__':
+
+    # python -m Qwiic.qwiic_sample_share otos|person [interval]
+    if len(sys.argv) < 2 or sys.argv[1] not in ("otos", "person"):
+        print("Usage: python -m Qwiic.qwiic_sample_share otos|person [interval]")
+        sys.exit(1)
+
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+
+    if sys.argv[1] == "otos":
+        from Qwiic.qwiic_otos import QwiicOTOS
+        device = QwiicOTOS()
+        device.begin()
+        publisher = otosPublisher(device)
+    else:
+        from Qwiic.qwiic_person_sensor import QwiicPersonSensor
+        publisher = personSensorPublisher(QwiicPersonSensor())
+
+    print("Publishing to %s every %.3f s" % (publisher.path, interval))
+    try:
+        publisher.run(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
@@ -0,0 +1,296 @@
+#
+#-----------------------------------------------------------------------------
+# bench_driver_overhead.py
+#
+# Per-call overhead of the qwiic I2C driver layer.
+#
+# Every I2CDriver method is run against an in-process fake bus object, so the
+# numbers are the cost of the Python driver code alone - no bus time. For each
+# backend and method the script reports the time per call and the bytes
+# allocated per call.
+#
+# Run from the top of the repository. Runs on CPython and on MicroPython or
+# CircuitPython boards (copy the Qwiic package and this file to the board).
+# Backends whose modules cannot be imported on the interpreter are skipped.
+#
+#   python -m benchmarks.bench_driver_overhead
+#   python -m benchmarks.bench_driver_overhead --save baseline.json
+#   python -m benchmarks.bench_driver_overhead --compare baseline.json
+#
+# Allocations: on MicroPython/CircuitPython the garbage collector is disabled
+# around the call and gc.mem_alloc() gives the exact bytes allocated. CPython
+# frees most temporaries immediately, so there the figure is the tracemalloc
+# peak during the call - the largest amount of transient memory it held.
+#
+
+import sys
+import gc
+
+try:
+    import json
+except ImportError:
+    import ujson as json
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from Qwiic.qwiic_i2c.transaction_stats import _ticksUs, _elapsedUs
+
+# Calls per measurement, and measurements per call - the fastest is reported
+ITERATIONS = 5000
+REPEATS = 3
+
+# Device used for every call
+ADDRESS = 0x17
+REGISTER = 0x20
+
+BLOCK = list(range(16))
+READ_SIZE = 32
+
+#-----------------------------------------------------------------------------
+# Fake bus objects - each implements the calls its backend makes, with the
+# least work possible
+#
+class FakeSMBus(object):
+    """ smbus2.SMBus stand-in for LinuxI2C """
+    _block = [0] * 32
+
+    def read_byte(self, address):
+        return 0
+
+    def read_byte_data(self, address, register):
+        return 0
+
+    def read_word_data(self, address, register):
+        return 0
+
+    def read_i2c_block_data(self, address, register, length):
+        return self._block[:length]
+
+    def write_byte(self, address, value):
+        pass
+
+    def write_byte_data(self, address, register, value):
+        pass
+
+    def write_word_data(self, address, register, value):
+        pass
+
+    def write_i2c_block_data(self, address, register, data):
+        pass
+
+    def write_quick(self, address):
+        pass
+
+    def i2c_rdwr(self, *msgs):
+        pass
+
+    def close(self):
+        pass
+
+class FakeBusio(object):
+    """ busio.I2C stand-in for CircuitPythonI2C """
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto(self, address, buffer):
+        pass
+
+    def writeto_then_readfrom(self, address, outBuffer, inBuffer):
+        pass
+
+    def scan(self):
+        return [ADDRESS]
+
+    def deinit(self):
+        pass
+
+class FakeMachineI2C(object):
+    """ machine.I2C stand-in for MicroPythonI2C """
+    def readfrom(self, address, n):
+        return bytes(n)
+
+    def readfrom_mem(self, address, register, n):
+        return bytes(n)
+
+    def readfrom_mem_into(self, address, register, buf):
+        pass
+
+    def writeto(self, address, buffer):
+        return len(buffer)
+
+    def writeto_mem(self, address, register, buffer):
+        pass
+
+    def scan(self):
+        return [ADDRESS]
+
+class FakeFcntl(object):
+    """ fcntl module stand-in for LinuxDevI2C """
+    @staticmethod
+    def ioctl(fd, request, arg=0):
+        return 0
+
+#-----------------------------------------------------------------------------
+# Backend construction - the module's bus connect function is replaced so the
+# driver is built on a fake bus
+#
+def makeLinux():
+    from Qwiic.qwiic_i2c import linux_i2c
+    linux_i2c._connectToI2CBus = lambda *args, **argk: FakeSMBus()
+    return linux_i2c.LinuxI2C(iBus=99)
+
+def makeLinuxDev():
+    from Qwiic.qwiic_i2c import dev_i2c
+    dev_i2c._connectToI2CBus = lambda *args, **argk: -1
+    dev_i2c.fcntl = FakeFcntl
+    return dev_i2c.LinuxDevI2C(iBus=98)
+
+def makeCircuitPython():
+    from Qwiic.qwiic_i2c import circuitpy_i2c
+    circuitpy_i2c._connectToI2CBus = lambda *args, **argk: FakeBusio()
+    return circuitpy_i2c.CircuitPythonI2C()
+
+def makeMicroPython():
+    from Qwiic.qwiic_i2c import micropython_i2c
+    micropython_i2c._connectToI2CBus = lambda *args, **argk: FakeMachineI2C()
+    return micropython_i2c.MicroPythonI2C()
+
+BACKENDS = (
+    ("linux", makeLinux),
+    ("linux-dev", makeLinuxDev),
+    ("circuitpython", makeCircuitPython),
+    ("micropython", makeMicroPython),
+)
+
+#-----------------------------------------------------------------------------
+# The calls measured - name and a function running one call on a driver
+#
+def setAttribute(driver):
+    driver.scanCacheTTL = 1.0
+
+CALLS = (
+    ("readByte", lambda d: d.readByte(ADDRESS, REGISTER)),
+    ("read_byte", lambda d: d.read_byte(ADDRESS, REGISTER)),
+    ("readWord", lambda d: d.readWord(ADDRESS, REGISTER)),
+    ("read_word", lambda d: d.read_word(ADDRESS, REGISTER)),
+    ("readBlock", lambda d: d.readBlock(ADDRESS, REGISTER, READ_SIZE)),
+    ("read_block", lambda d: d.read_block(ADDRESS, REGISTER, READ_SIZE)),
+    ("readBlockInto", lambda d: d.readBlockInto(ADDRESS, REGISTER, d._benchBuffer)),
+    ("readStruct", lambda d: d.readStruct(ADDRESS, REGISTER, "<hhh")),
+    ("readArray", lambda d: d.readArray(ADDRESS, REGISTER, "h", 9)),
+    ("writeCommand", lambda d: d.writeCommand(ADDRESS, REGISTER)),
+    ("writeByte", lambda d: d.writeByte(ADDRESS, REGISTER, 0x55)),
+    ("write_byte", lambda d: d.write_byte(ADDRESS, REGISTER, 0x55)),
+    ("writeWord", lambda d: d.writeWord(ADDRESS, REGISTER, 0x1234)),
+    ("writeBlock", lambda d: d.writeBlock(ADDRESS, REGISTER, BLOCK)),
+    ("write_block", lambda d: d.write_block(ADDRESS, REGISTER, BLOCK)),
+    ("isDeviceConnected", lambda d: d.isDeviceConnected(ADDRESS)),
+    ("is_device_connected", lambda d: d.is_device_connected(ADDRESS)),
+    ("ping", lambda d: d.ping(ADDRESS)),
+    ("_probeAddress", lambda d: d._probeAddress(ADDRESS)),
+    ("get i2cbus", lambda d: d.i2cbus),
+    ("set attribute", setAttribute),
+)
+
+#-----------------------------------------------------------------------------
+# Measurement
+#
+def timeCall(func, driver, n):
+    """ Returns the time of one call in ns - the best of REPEATS runs """
+    best = None
+    for repeat in range(REPEATS):
+        start = _ticksUs()
+        for i in range(n):
+            func(driver)
+        elapsed = _elapsedUs(start)
+        if best is None or elapsed < best:
+            best = elapsed
+    return best * 1000 // n
+
+def allocCall(func, driver):
+    """ Returns the bytes allocated by one call """
+    if hasattr(gc, "mem_alloc"):
+        gc.collect()
+        gc.disable()
+        try:
+            before = gc.mem_alloc()
+            func(driver)
+            return gc.mem_alloc() - before
+        finally:
+            gc.enable()
+
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func(driver)
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+def run(n=ITERATIONS):
+    """
+        Runs every call on every backend that loads
+
+        :return: dict of "backend.call" -> [ns per call, bytes per call]
+    """
+    results = {}
+
+    # Reference - a bare function call through the same loop
+    noop = lambda d: None
+    results["reference.noop"] = [timeCall(noop, None, n), allocCall(noop, None)]
+
+    for backendName, make in BACKENDS:
+        try:
+            driver = make()
+        except Exception as ee:
+            print("%-14s skipped - %s" % (backendName, ee))
+            continue
+
+        driver._benchBuffer = bytearray(READ_SIZE)
+
+        for callName, func in CALLS:
+            # Warm up caches before measuring
+            func(driver)
+            results[backendName + "." + callName] = [timeCall(func, driver, n), allocCall(func, driver)]
+
+    return results
+
+def report(results, baseline=None):
+    if baseline is None:
+        print("%-36s %10s %10s" % ("call", "ns/call", "bytes/call"))
+    else:
+        print("%-36s %10s %10s %9s" % ("call", "ns/call", "bytes/call", "vs base"))
+
+    for key in sorted(results):
+        ns, nBytes = results[key]
+        line = "%-36s %10d %10s" % (key, ns, "-" if nBytes is None else nBytes)
+        if baseline is not None and key in baseline and baseline[key][0]:
+            line += " %+8.1f%%" % ((ns - baseline[key][0]) * 100.0 / baseline[key][0])
+        print(line)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+
+    results = run()
+
+    baseline = None
+    if len(args) == 2 and args[0] == "--compare":
+        with open(args[1]) as f:
+            baseline = json.load(f)
+
+    report(results, baseline)
+
+    if len(args) == 2 and args[0] == "--save":
+        with open(args[1], "w") as f:
+            json.dump(results, f)
+        print("Saved the results to %s" % args[1])